@@ -8,6 +8,8 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import HistGradientBoostingRegressor
 
+from core.utils import replace_atomically
+
 warnings.filterwarnings("ignore")
 
 logger = logging.getLogger("foresee.agents.data")
@@ -110,7 +112,9 @@ def retrain_model_on_live_data(df):
     model = HistGradientBoostingRegressor(max_iter=200, learning_rate=0.1, max_depth=10, random_state=42)
     model.fit(X_scaled, y_scaled)
 
-    joblib.dump(model, os.path.join(BASE_DIR, 'models', 'outbreak_forecaster.pkl'))
+    # Rename into place: workers may be serving (and memory-mapping) the old file
+    replace_atomically(os.path.join(BASE_DIR, 'models', 'outbreak_forecaster.pkl'),
+                       lambda tmp: joblib.dump(model, tmp))
     logger.info("ML Engine: model upgraded and saved — ready for live 2026 predictions")
 
 if __name__ == "__main__":
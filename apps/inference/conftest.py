@@ -21,6 +21,11 @@ sys.path.insert(0, os.path.dirname(__file__))
 # ---------------------------------------------------------------------------
 # Environment variables (set before any app import)
 # ---------------------------------------------------------------------------
+# Read once by core.config at import time, so it can't go in _test_env
+os.environ.setdefault("SIGNAL_REFRESH_ENABLED", "false")
+os.environ.setdefault("MODEL_LOADING", "eager")
+os.environ.setdefault("MODEL_WATCH_SECONDS", "0")
+
 @pytest.fixture(autouse=True)
 def _test_env(monkeypatch):
     """Provide safe env vars so app startup doesn't hit real services."""
@@ -32,6 +37,27 @@ def _test_env(monkeypatch):
     monkeypatch.setenv("TF_CPP_MIN_LOG_LEVEL", "3")
 
 
+@pytest.fixture(autouse=True)
+def _isolated_feature_cache(monkeypatch, tmp_path):
+    """Keep live-signal cache writes out of the repo's data/cache directory."""
+    from core import feature_store
+    from core.feature_cache import FeatureCache
+
+    monkeypatch.setattr(feature_store, "feature_cache",
+                        FeatureCache(str(tmp_path / "feature_cache.sqlite3"), legacy_json_paths=()))
+
+
+@pytest.fixture(autouse=True)
+def _clear_identity_caches():
+    """Tests patch user/role lookups per test; don't serve a previous test's answer."""
+    yield
+    from core.auth import role_cache, verified_tokens
+    from core.user_cache import user_cache
+    user_cache.clear()
+    role_cache.clear()
+    verified_tokens.clear()
+
+
 # ---------------------------------------------------------------------------
 # Patch heavy imports BEFORE the flask app is ever imported
 # ---------------------------------------------------------------------------
@@ -58,6 +84,7 @@ sys.modules.setdefault("xhtml2pdf.pisa", _pisa_mock)
 # Patch database module to prevent real DB connections
 # ---------------------------------------------------------------------------
 _db_mock = MagicMock()
+_db_mock.pool_stats.return_value = None
 sys.modules["db"] = _db_mock
 sys.modules["db.database"] = _db_mock
 
@@ -120,3 +147,38 @@ def auth_headers():
     signature = base64.urlsafe_b64encode(b"fakesignature").decode().rstrip("=")
     token = f"{header}.{payload}.{signature}"
     return {"Authorization": f"Bearer {token}"}
+
+
+# ---------------------------------------------------------------------------
+# Small adaptive ensemble (real sklearn models, trained in well under a second)
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def small_ensemble():
+    """An ``adaptive_ensemble.pkl``-shaped dict trained on synthetic features."""
+    import numpy as np
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    from core.feature_store import get_feature_names
+
+    feature_names = get_feature_names()
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(400, len(feature_names)))
+    y = np.log1p(np.abs(200 + 80 * X[:, 0] + 30 * X[:, 1] + rng.normal(scale=10, size=400)))
+
+    def _fit(**params):
+        model = HistGradientBoostingRegressor(max_iter=30, max_depth=5, random_state=0, **params)
+        return model.fit(X, y)
+
+    return {
+        "primary": _fit(),
+        "alt": _fit(learning_rate=0.05),
+        "quantile": {
+            "q10": _fit(loss="quantile", quantile=0.1),
+            "q50": _fit(loss="quantile", quantile=0.5),
+            "q90": _fit(loss="quantile", quantile=0.9),
+        },
+        "feature_names": feature_names,
+        "feature_importances": {name: 1.0 / len(feature_names) for name in feature_names},
+        "training_samples": len(X),
+        "version": "v2_test",
+    }
@@ -37,18 +37,47 @@ DRIFT_RESIDUAL_THRESHOLD = 2.0      # z-score threshold for residual drift
 DRIFT_FEATURE_THRESHOLD = 2.0       # z-score threshold for feature drift
 DRIFT_MIN_SAMPLES = 16              # minimum samples before drift check
 DRIFT_PROMOTION_THRESHOLD = 0.05    # challenger must beat current MAE by 5%
+DRIFT_STATE_FLUSH_SECONDS = 5       # write-behind batching window for drift state
 
 # ── Ensemble ─────────────────────────────────────────────────────────────
 QUANTILES = [0.10, 0.50, 0.90]      # P10, P50, P90
 ENSEMBLE_MODELS = ["histgbr", "lgbm", "quantile_histgbr"]
+TRAINING_WORKERS = None             # fit processes; None = cpu_count // threads per job
+TRAINING_THREADS_PER_JOB = 2        # OpenMP threads per fit (same in serial runs)
+
+# ── Outbreak Data ────────────────────────────────────────────────────────
+OUTBREAK_DATA_PATH = "data/realtime_india_outbreaks.csv"
 
 # ── Feature Store ────────────────────────────────────────────────────────
 WEATHER_CACHE_TTL_HOURS = 6
 NEWS_CACHE_TTL_HOURS = 3
 FEATURE_STORE_PATH = "data/feature_store.csv"
+FEATURE_CACHE_DB_PATH = "data/cache/feature_cache.sqlite3"
+FEATURE_CACHE_RETENTION_DAYS = 30   # last-good fallback values kept this long
+FEATURE_CACHE_COMPACT_INTERVAL_HOURS = 24
+FEATURE_CACHE_COMPACT_CHECK_WRITES = 200   # each process re-checks compaction every N writes
+# Pre-SQLite JSON caches, imported once to seed a new feature cache
 WEATHER_CACHE_PATH = "data/cache/weather_cache.json"
 NEWS_CACHE_PATH = "data/cache/news_cache.json"
 
+# Live signal sources and the shared HTTP pool used to reach them
+OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search"
+HTTP_POOL_SIZE = 16                 # keep-alive connections per host
+HTTP_CONNECT_TIMEOUT = 3.05         # seconds
+HTTP_READ_TIMEOUT = 5               # seconds (archive queries get 2x)
+EXOGENOUS_FETCH_WORKERS = 8         # parallel weather/news lookups
+
+# Background refresh (core/signal_refresher.py) and stale-while-revalidate
+SIGNAL_MAX_STALE_HOURS = 24         # older cached signals are refetched inline
+SIGNAL_REFRESH_AHEAD_FRACTION = 0.8 # refresh once 80% of the TTL has elapsed
+SIGNAL_REFRESH_JITTER_FRACTION = 0.05
+SIGNAL_REFRESH_TICK_SECONDS = 60
+SIGNAL_REFRESH_BACKOFF_BASE_SECONDS = 60
+SIGNAL_REFRESH_BACKOFF_MAX_SECONDS = 1800
+SIGNAL_REFRESH_LOCK_PATH = "data/cache/signal_refresher.lock"
+
 # ── Intervention Simulation ──────────────────────────────────────────────
 INTERVENTION_DEFAULTS = {
     "vector_control_delta": 0.0,     # -1.0 to +1.0 (negative = more control)
@@ -15,7 +15,11 @@ Outputs:
 
 import json
 import logging
+import multiprocessing
 import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 import joblib
@@ -23,15 +27,20 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
+from threadpoolctl import threadpool_limits
 
 from core.adaptive_config import (
     DEFAULT_HORIZON,
     DRIFT_PROMOTION_THRESHOLD,
     PROMOTION_METRIC,
     QUANTILES,
+    TRAINING_THREADS_PER_JOB,
+    TRAINING_WORKERS,
     WINDOW_SIZE,
 )
-from core.feature_store import build_feature_row, get_feature_names
+from core.feature_store import build_feature_matrix, get_feature_names
+from core.tree_scorer import compile_ensemble
+from core.utils import replace_atomically
 
 logger = logging.getLogger("foresee.trainer")
 
@@ -44,28 +53,22 @@ def _build_training_data(df):
     Returns X (feature matrix), y (target), and feature names.
     """
     feature_names = get_feature_names()
-    X_rows = []
-    y_values = []
+    X_parts = []
+    y_parts = []
 
     for region, group in df.groupby("Region"):
         group = group.sort_values("Date")
         cases = group["New_Cases"].values
-        dates = group["Date"].values
 
         if len(cases) <= WINDOW_SIZE:
             continue
 
-        for i in range(WINDOW_SIZE, len(cases)):
-            case_history = cases[max(0, i - WINDOW_SIZE): i]
-            sample_date = pd.Timestamp(dates[i])
+        X_parts.append(build_feature_matrix(region, cases, group["Date"].values))
+        y_parts.append(cases[WINDOW_SIZE:].astype(float))
 
-            features, _ = build_feature_row(region, case_history, date=sample_date)
-
-            row = [features.get(f, 0.0) for f in feature_names]
-            X_rows.append(row)
-            y_values.append(float(cases[i]))
-
-    return np.array(X_rows), np.array(y_values), feature_names
+    if not X_parts:
+        return np.empty((0, len(feature_names))), np.empty(0), feature_names
+    return np.concatenate(X_parts), np.concatenate(y_parts), feature_names
 
 
 def _train_histgbr(X, y, random_state=42):
@@ -92,19 +95,59 @@ def _train_histgbr_alt(X, y, random_state=99):
     return model
 
 
+def _train_quantile_model(X, y, q):
+    """Train one quantile regressor (log-space target)."""
+    model = HistGradientBoostingRegressor(
+        loss="quantile", quantile=q,
+        max_iter=250, learning_rate=0.08, max_depth=7,
+        min_samples_leaf=15, random_state=42,
+    )
+    model.fit(X, np.log1p(y))
+    return model
+
+
 def _train_quantile_models(X, y):
     """Train quantile regressors for P10, P50, P90 uncertainty bands."""
-    y_log = np.log1p(y)
-    models = {}
-    for q in QUANTILES:
-        model = HistGradientBoostingRegressor(
-            loss="quantile", quantile=q,
-            max_iter=250, learning_rate=0.08, max_depth=7,
-            min_samples_leaf=15, random_state=42,
-        )
-        model.fit(X, y_log)
-        models[f"q{int(q*100)}"] = model
-    return models
+    return {f"q{int(q*100)}": _train_quantile_model(X, y, q) for q in QUANTILES}
+
+
+def _backtest_fold_bounds(n_rows, n_folds=5):
+    """(train_end, test_end) per rolling-origin fold, or [] if folds would be too small."""
+    fold_size = n_rows // (n_folds + 1)
+    if fold_size < 10:
+        return []
+    bounds = []
+    for fold in range(1, n_folds + 1):
+        train_end = fold * fold_size
+        test_end = min(train_end + fold_size, n_rows)
+        if test_end > train_end:
+            bounds.append((train_end, test_end))
+    return bounds
+
+
+def _backtest_fold(X, y, train_end, test_end):
+    """Fit the backtest model on rows [:train_end] and predict [train_end:test_end]."""
+    # Use primary model for backtest
+    temp_model = HistGradientBoostingRegressor(
+        max_iter=200, learning_rate=0.1, max_depth=8,
+        min_samples_leaf=10, random_state=42,
+    )
+    temp_model.fit(X[:train_end], np.log1p(y[:train_end]))
+    preds = np.expm1(temp_model.predict(X[train_end:test_end]))
+    return np.maximum(preds, 0), y[train_end:test_end]
+
+
+def _backtest_metrics(fold_results):
+    """Pool (preds, actuals) pairs from every fold into MAE / RMSE."""
+    if not fold_results:
+        return {"mae": float("inf"), "rmse": float("inf")}
+
+    all_preds = np.concatenate([preds for preds, _ in fold_results])
+    all_actuals = np.concatenate([actuals for _, actuals in fold_results])
+
+    mae = mean_absolute_error(all_actuals, all_preds)
+    rmse = np.sqrt(mean_squared_error(all_actuals, all_preds))
+    return {"mae": round(float(mae), 2), "rmse": round(float(rmse), 2)}
 
 
 def _rolling_origin_backtest(models, X, y, n_folds=5):
@@ -112,41 +155,120 @@ def _rolling_origin_backtest(models, X, y, n_folds=5):
     Rolling-origin evaluation: train on first k folds, test on next.
     Returns dict of metric name -> value.
     """
-    fold_size = len(X) // (n_folds + 1)
-    if fold_size < 10:
-        return {"mae": float("inf"), "rmse": float("inf")}
+    return _backtest_metrics([
+        _backtest_fold(X, y, train_end, test_end)
+        for train_end, test_end in _backtest_fold_bounds(len(X), n_folds)
+    ])
 
-    all_preds = []
-    all_actuals = []
 
-    for fold in range(1, n_folds + 1):
-        train_end = fold * fold_size
-        test_end = min(train_end + fold_size, len(X))
+# ── Training orchestration ───────────────────────────────────────────────
+# Every fit above is independent of the others, so they run as jobs on a
+# process pool. Each job is pinned to threads_per_job OpenMP threads (in the
+# serial path too): HistGBR sums gradients with an OpenMP reduction, so the
+# thread count has to match for the two paths to produce identical models,
+# and pinning it keeps workers x threads within the machine's cores.
 
-        X_train, y_train = X[:train_end], y[:train_end]
-        X_test, y_test = X[train_end:test_end], y[train_end:test_end]
+_worker_X = None
+_worker_y = None
+_worker_threads = None
 
-        if len(X_test) == 0:
-            continue
 
-        # Use primary model for backtest
-        temp_model = HistGradientBoostingRegressor(
-            max_iter=200, learning_rate=0.1, max_depth=8,
-            min_samples_leaf=10, random_state=42,
-        )
-        temp_model.fit(X_train, np.log1p(y_train))
-        preds = np.expm1(temp_model.predict(X_test))
-        preds = np.maximum(preds, 0)
+def _init_training_worker(X, y, threads_per_job):
+    """Pool initializer: ship the training matrix to each worker once."""
+    global _worker_X, _worker_y, _worker_threads
+    _worker_X, _worker_y, _worker_threads = X, y, threads_per_job
 
-        all_preds.extend(preds)
-        all_actuals.extend(y_test)
 
-    if not all_preds:
-        return {"mae": float("inf"), "rmse": float("inf")}
+def _timed_job(func, X, y, args, threads_per_job):
+    start = time.perf_counter()
+    with threadpool_limits(limits=threads_per_job, user_api="openmp"):
+        result = func(X, y, *args)
+    return result, time.perf_counter() - start
 
-    mae = mean_absolute_error(all_actuals, all_preds)
-    rmse = np.sqrt(mean_squared_error(all_actuals, all_preds))
-    return {"mae": round(float(mae), 2), "rmse": round(float(rmse), 2)}
+
+def _pool_job(func, args):
+    return _timed_job(func, _worker_X, _worker_y, args, _worker_threads)
+
+
+def _training_workers(n_jobs, threads_per_job, workers=None):
+    """Pool size: explicit, else TRAINING_WORKERS, else as many as the cores allow."""
+    if workers is None:
+        workers = TRAINING_WORKERS
+    if workers is None:
+        workers = (os.cpu_count() or 1) // threads_per_job
+    return max(1, min(int(workers), n_jobs))
+
+
+def _run_training_jobs(jobs, X, y, workers=None, threads_per_job=TRAINING_THREADS_PER_JOB):
+    """
+    Run ``{name: (func, args)}`` jobs as ``func(X, y, *args)``.
+    Uses a spawn-context process pool when more than one worker is available
+    and falls back to running in-process if the pool can't be used.
+    Returns ({name: result}, {name: wall seconds}).
+    """
+    workers = _training_workers(len(jobs), threads_per_job, workers)
+    outcomes = None
+
+    if workers > 1:
+        try:
+            # spawn, not fork: forking after OpenMP has started can deadlock
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_training_worker,
+                initargs=(X, y, threads_per_job),
+            ) as pool:
+                futures = {name: pool.submit(_pool_job, func, args) for name, (func, args) in jobs.items()}
+                outcomes = {name: future.result() for name, future in futures.items()}
+        except Exception as e:
+            logger.warning("Training pool failed (%s), falling back to serial training", e)
+            outcomes = None
+
+    if outcomes is None:
+        workers = 1
+        outcomes = {
+            name: _timed_job(func, X, y, args, threads_per_job)
+            for name, (func, args) in jobs.items()
+        }
+        # A freshly fitted model pickles to different bytes than its unpickled
+        # copy, and pool results always arrive unpickled. Round-trip serial
+        # results too so both paths save byte-identical artifacts.
+        outcomes = {name: (pickle.loads(pickle.dumps(result)), elapsed)  # noqa: S301
+                    for name, (result, elapsed) in outcomes.items()}
+
+    results = {name: result for name, (result, _) in outcomes.items()}
+    timings = {name: round(elapsed, 3) for name, (_, elapsed) in outcomes.items()}
+    logger.info("Ran %d training jobs on %d worker(s) x %d thread(s): %s",
+                len(jobs), workers, threads_per_job, timings)
+    return results, timings
+
+
+def _fit_ensemble_members(X, y, workers=None, threads_per_job=TRAINING_THREADS_PER_JOB, n_folds=5):
+    """
+    Fit primary, alt, quantile and backtest-fold models as one batch of jobs.
+    Returns (members, backtest_metrics, job_timings) where members holds
+    "primary", "alt" and the "quantile" dict.
+    """
+    jobs = {
+        "primary": (_train_histgbr, ()),
+        "alt": (_train_histgbr_alt, ()),
+    }
+    for q in QUANTILES:
+        jobs[f"q{int(q*100)}"] = (_train_quantile_model, (q,))
+    fold_names = []
+    for i, bounds in enumerate(_backtest_fold_bounds(len(X), n_folds), start=1):
+        fold_names.append(f"backtest_fold{i}")
+        jobs[fold_names[-1]] = (_backtest_fold, bounds)
+
+    results, timings = _run_training_jobs(jobs, X, y, workers, threads_per_job)
+
+    members = {
+        "primary": results["primary"],
+        "alt": results["alt"],
+        "quantile": {f"q{int(q*100)}": results[f"q{int(q*100)}"] for q in QUANTILES},
+    }
+    backtest_metrics = _backtest_metrics([results[name] for name in fold_names])
+    return members, backtest_metrics, timings
 
 
 def train_adaptive_ensemble(df=None):
@@ -154,8 +276,9 @@ def train_adaptive_ensemble(df=None):
     Full training pipeline:
     1. Load data
     2. Build features
-    3. Train ensemble (primary + alt + quantile)
-    4. Run rolling backtest
+    3. Train ensemble (primary + alt + quantile) and rolling backtest
+       folds as parallel jobs (see _run_training_jobs)
+    4. Score the backtest
     5. Save artifacts with metadata
     """
     if df is None:
@@ -163,32 +286,30 @@ def train_adaptive_ensemble(df=None):
         df = pd.read_csv(data_path)
         df["Date"] = pd.to_datetime(df["Date"])
 
+    stage_timings = {}
+    start = time.perf_counter()
     logger.info("Building training features from %d rows...", len(df))
     X, y, feature_names = _build_training_data(df)
+    stage_timings["features"] = round(time.perf_counter() - start, 3)
     logger.info("Training data: X=%s, y=%s", X.shape, y.shape)
 
     if len(X) < 50:
         logger.error("Not enough training data (%d rows). Need at least 50.", len(X))
         return None
 
-    # Train models
-    logger.info("Training primary HistGBR model...")
-    primary_model = _train_histgbr(X, y)
-
-    logger.info("Training alternative HistGBR model (diversity)...")
-    alt_model = _train_histgbr_alt(X, y)
-
-    logger.info("Training quantile models (P10/P50/P90)...")
-    quantile_models = _train_quantile_models(X, y)
-
-    # Rolling backtest
-    logger.info("Running rolling-origin backtest...")
-    backtest_metrics = _rolling_origin_backtest(
-        {"primary": primary_model, "alt": alt_model}, X, y
-    )
+    # Train models and rolling backtest folds
+    logger.info("Training primary, alt and quantile models with rolling-origin backtest...")
+    start = time.perf_counter()
+    members, backtest_metrics, job_timings = _fit_ensemble_members(X, y)
+    stage_timings["fit"] = round(time.perf_counter() - start, 3)
+    stage_timings["fit_jobs"] = job_timings
+    primary_model = members["primary"]
+    alt_model = members["alt"]
+    quantile_models = members["quantile"]
     logger.info("Backtest results: %s", backtest_metrics)
 
     # Feature importance via permutation-based approach
+    start = time.perf_counter()
     importances = {}
     try:
         from sklearn.inspection import permutation_importance
@@ -204,6 +325,7 @@ def train_adaptive_ensemble(df=None):
         importances = dict(sorted(importances.items(), key=lambda x: x[1], reverse=True))
     except Exception as e:
         logger.warning("Could not compute permutation importance: %s", e)
+    stage_timings["importance"] = round(time.perf_counter() - start, 3)
 
     # Package ensemble
     ensemble = {
@@ -216,12 +338,14 @@ def train_adaptive_ensemble(df=None):
         "version": f"v2_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
     }
 
-    # Save model
-    model_path = os.path.join(BASE_DIR, "models", "adaptive_ensemble.pkl")
-    joblib.dump(ensemble, model_path)
-    logger.info("Ensemble saved to %s", model_path)
+    # Packed node arrays for fast serving (None if a member can't be compiled)
+    start = time.perf_counter()
+    ensemble["compiled"] = compile_ensemble(ensemble)
+    stage_timings["compile"] = round(time.perf_counter() - start, 3)
+    logger.info("Stage wall times (s): %s", stage_timings)
 
-    # Save metadata
+    # Save metadata, then the model: running servers watch the .pkl
+    # (ml_loader) and read the metadata when it changes
     metadata = {
         "version": ensemble["version"],
         "trained_at": datetime.now().isoformat(),
@@ -234,15 +358,24 @@ def train_adaptive_ensemble(df=None):
         "window_size": WINDOW_SIZE,
         "horizon": DEFAULT_HORIZON,
         "promotion_metric": PROMOTION_METRIC,
+        "stage_timings": stage_timings,
     }
     meta_path = os.path.join(BASE_DIR, "models", "ensemble_metadata.json")
-    with open(meta_path, "w") as f:
-        json.dump(metadata, f, indent=2)
+    replace_atomically(meta_path, lambda tmp: _write_json(tmp, metadata))
     logger.info("Metadata saved to %s", meta_path)
 
+    model_path = os.path.join(BASE_DIR, "models", "adaptive_ensemble.pkl")
+    replace_atomically(model_path, lambda tmp: joblib.dump(ensemble, tmp))
+    logger.info("Ensemble saved to %s", model_path)
+
     return ensemble, metadata
 
 
+def _write_json(path, obj):
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2)
+
+
 def evaluate_challenger(current_ensemble, challenger_ensemble, X_test, y_test):
     """
     Compare current vs challenger on test data using promotion metric.
@@ -288,44 +421,87 @@ def evaluate_challenger(current_ensemble, challenger_ensemble, X_test, y_test):
     return should_promote, comparison
 
 
-def predict_with_ensemble(ensemble, features_dict):
+def features_to_matrix(ensemble, feature_rows):
+    """Stack feature dicts into an N×F matrix in the ensemble's column order."""
+    feature_names = ensemble["feature_names"]
+    return np.array(
+        [[row.get(f, 0.0) for f in feature_names] for row in feature_rows],
+        dtype=float,
+    ).reshape(len(feature_rows), len(feature_names))
+
+
+def predict_ensemble_batch(ensemble, X):
     """
-    Generate point + interval predictions from the ensemble.
-    Returns dict with p10, p50, p90, point estimate, and model agreement.
+    Vectorized point + interval predictions for an N×F feature matrix.
+    Each ensemble member is called once for the whole batch.
+    Returns dict of float arrays (length N): point, p10, p50, p90,
+    primary_pred, alt_pred and model_agreement.
     """
-    feature_names = ensemble["feature_names"]
-    X = np.array([[features_dict.get(f, 0.0) for f in feature_names]])
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+
+    # Raw (log-space) scores: one vectorized pass over all packed trees when
+    # the ensemble was compiled at promotion time, else one sklearn call each.
+    compiled = ensemble.get("compiled")
+    if compiled is not None:
+        raw = compiled.predict_raw(X)
+    else:
+        raw = {"primary": ensemble["primary"].predict(X), "alt": ensemble["alt"].predict(X)}
+        raw.update({name: model.predict(X) for name, model in ensemble.get("quantile", {}).items()})
 
     # Point estimates from primary and alt (weighted blend: 70/30)
-    p_primary = float(np.expm1(ensemble["primary"].predict(X)[0]))
-    p_alt = float(np.expm1(ensemble["alt"].predict(X)[0]))
-    point = max(0, 0.7 * p_primary + 0.3 * p_alt)
+    p_primary = np.expm1(raw["primary"])
+    p_alt = np.expm1(raw["alt"])
+    point = np.maximum(0, 0.7 * p_primary + 0.3 * p_alt)
 
     # Quantile estimates
-    q_models = ensemble.get("quantile", {})
-    p10 = float(np.expm1(q_models["q10"].predict(X)[0])) if "q10" in q_models else point * 0.6
-    p50 = float(np.expm1(q_models["q50"].predict(X)[0])) if "q50" in q_models else point
-    p90 = float(np.expm1(q_models["q90"].predict(X)[0])) if "q90" in q_models else point * 1.6
+    p10 = np.expm1(raw["q10"]) if "q10" in raw else point * 0.6
+    p50 = np.expm1(raw["q50"]) if "q50" in raw else point
+    p90 = np.expm1(raw["q90"]) if "q90" in raw else point * 1.6
 
     # Ensure monotonicity: P10 <= P50 <= P90
-    p10 = max(0, min(p10, p50))
-    p90 = max(p50, p90)
+    p10 = np.maximum(0, np.minimum(p10, p50))
+    p90 = np.maximum(p50, p90)
 
     # Model agreement score (how much primary and alt agree)
-    spread = abs(p_primary - p_alt)
-    agreement = max(0, 1.0 - spread / max(point, 1))
+    spread = np.abs(p_primary - p_alt)
+    agreement = np.maximum(0, 1.0 - spread / np.maximum(point, 1))
 
     return {
-        "point": round(point),
-        "p10": round(max(0, p10)),
-        "p50": round(max(0, p50)),
-        "p90": round(max(0, p90)),
-        "primary_pred": round(max(0, p_primary)),
-        "alt_pred": round(max(0, p_alt)),
-        "model_agreement": round(agreement, 3),
+        "point": point,
+        "p10": p10,
+        "p50": p50,
+        "p90": p90,
+        "primary_pred": p_primary,
+        "alt_pred": p_alt,
+        "model_agreement": agreement,
     }
 
 
+def format_ensemble_predictions(batch):
+    """Convert ``predict_ensemble_batch`` arrays into per-row API dicts."""
+    return [
+        {
+            "point": round(float(batch["point"][i])),
+            "p10": round(max(0, float(batch["p10"][i]))),
+            "p50": round(max(0, float(batch["p50"][i]))),
+            "p90": round(max(0, float(batch["p90"][i]))),
+            "primary_pred": round(max(0, float(batch["primary_pred"][i]))),
+            "alt_pred": round(max(0, float(batch["alt_pred"][i]))),
+            "model_agreement": round(float(batch["model_agreement"][i]), 3),
+        }
+        for i in range(len(batch["point"]))
+    ]
+
+
+def predict_with_ensemble(ensemble, features_dict):
+    """
+    Generate point + interval predictions from the ensemble.
+    Returns dict with p10, p50, p90, point estimate, and model agreement.
+    """
+    X = features_to_matrix(ensemble, [features_dict])
+    return format_ensemble_predictions(predict_ensemble_batch(ensemble, X))[0]
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     result = train_adaptive_ensemble()
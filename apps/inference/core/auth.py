@@ -4,11 +4,28 @@ Authentication & authorisation helpers.
 - Clerk JWT / JWKS verification
 - ``require_auth`` decorator (defence-in-depth)
 - Clerk Management API helpers (role lookup, user info)
+
+Caller roles are cached per Clerk user id (``role_cache``: in-process LRU,
+shared through Redis when ``REDIS_URL`` is set) and concurrent lookups of
+the same user share one Clerk call. Role changes made through
+``/admin/set-role`` invalidate the entry; changes made in the Clerk
+dashboard take effect within ``CLERK_ROLE_CACHE_TTL_SECONDS``. Without
+``REDIS_URL`` the invalidation only reaches the worker that served the
+request, so other workers keep the old role for up to the same TTL.
+
+JWKS public keys are parsed once per fetch and kept per kid; a stale key
+set is served while a background thread refetches it, and a failed fetch
+keeps the previous keys. Tokens that pass RS256 verification are
+remembered by SHA-256 digest until their ``exp``, so repeat requests from
+a session skip the RSA check.
 """
 
 import base64
+import hashlib
 import json
 import os
+import threading
+import time
 import urllib.error
 import urllib.request
 from datetime import datetime
@@ -18,8 +35,23 @@ import jwt
 from flask import jsonify, request
 from jwt.algorithms import RSAAlgorithm
 
-from .config import CLERK_API_BASE, CLERK_PUBLISHABLE_KEY, CLERK_SECRET_KEY
+from .cache import SingleFlight, TieredCache, TTLCache
+from .config import (
+    CLERK_API_BASE,
+    CLERK_API_TIMEOUT_SECONDS,
+    CLERK_JWKS_MIN_REFRESH_SECONDS,
+    CLERK_JWKS_TTL_SECONDS,
+    CLERK_PUBLISHABLE_KEY,
+    CLERK_ROLE_CACHE_MAX_ENTRIES,
+    CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS,
+    CLERK_ROLE_CACHE_TTL_SECONDS,
+    CLERK_SECRET_KEY,
+    CLERK_VERIFIED_TOKEN_CACHE_MAX_ENTRIES,
+    CLERK_VERIFIED_TOKEN_CACHE_MAX_TTL_SECONDS,
+    REDIS_URL,
+)
 from .logging_config import get_logger
+from .user_cache import get_user
 
 logger_auth = get_logger("foresee.auth")
 logger_admin = get_logger("foresee.admin")
@@ -48,8 +80,6 @@ def decode_jwt_payload(token: str) -> dict | None:
 #  JWKS (RS256 signature verification)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-_clerk_jwks_cache: dict | None = None
-
 
 def _resolve_clerk_jwks_url() -> str:
     override = os.getenv("CLERK_JWKS_URL")
@@ -72,34 +102,140 @@ def _resolve_clerk_jwks_url() -> str:
 CLERK_JWKS_URL = _resolve_clerk_jwks_url()
 
 
-def get_clerk_public_key(kid: str):
-    """Return the RSA public key matching *kid*, fetching JWKS if needed."""
-    global _clerk_jwks_cache
-    if not _clerk_jwks_cache:
+class JWKSKeyCache:
+    """Parsed RSA public keys by kid, refetched in the background once stale."""
+
+    def __init__(self, url, ttl=3600.0, min_refresh_interval=30.0, timeout=5.0, timer=time.monotonic):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._timer = timer
+        self._keys = {}            # kid -> public key, replaced wholesale on refresh
+        self._fetched_at = None    # timer() of the last successful fetch
+        self._attempted_at = None  # timer() of the last fetch attempt
+        self._fetches = SingleFlight()
+        self._refreshing = threading.Lock()
+        self.refreshes = 0
+        self.failures = 0
+
+    def _download(self):
+        req = urllib.request.Request(self.url)
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            return json.loads(response.read().decode())
+
+    def _fetch(self):
+        self._attempted_at = self._timer()
         try:
-            req = urllib.request.Request(CLERK_JWKS_URL)
-            with urllib.request.urlopen(req) as response:
-                _clerk_jwks_cache = json.loads(response.read().decode())
-            logger_auth.info(
-                "Clerk JWKS fetched successfully (%d keys)",
-                len(_clerk_jwks_cache.get("keys", [])),
-            )
+            jwks = self._download()
         except Exception as e:
-            logger_auth.error("Failed to fetch Clerk JWKS from %s: %s", CLERK_JWKS_URL, e)
-            return None
-    for key in _clerk_jwks_cache.get("keys", []):
-        if key.get("kid") == kid:
-            return RSAAlgorithm.from_jwk(json.dumps(key))
-    # kid not found — refresh cache once and retry
-    _clerk_jwks_cache = None
-    return None
+            self.failures += 1
+            logger_auth.error("Failed to fetch Clerk JWKS from %s: %s", self.url, e)
+            return False
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                keys[jwk["kid"]] = RSAAlgorithm.from_jwk(json.dumps(jwk))
+            except Exception as e:
+                logger_auth.warning("Skipping unusable JWK %r: %s", jwk.get("kid"), e)
+        self._keys = keys
+        self._fetched_at = self._timer()
+        self.refreshes += 1
+        logger_auth.info("Clerk JWKS fetched successfully (%d keys)", len(keys))
+        return True
+
+    def refresh(self) -> bool:
+        """Refetch the key set (concurrent callers share one fetch); False if it failed."""
+        return self._fetches.do("jwks", self._fetch)
+
+    def _refresh_in_background(self):
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def _may_refetch(self, now):
+        return self._attempted_at is None or now - self._attempted_at >= self.min_refresh_interval
+
+    def get(self, kid):
+        """The public key for *kid*, or None if Clerk doesn't (yet) publish it."""
+        now = self._timer()
+        if self._fetched_at is None:
+            if not self._may_refetch(now) or not self.refresh():
+                return None
+        elif now - self._fetched_at >= self.ttl:
+            self._refresh_in_background()
+        key = self._keys.get(kid)
+        if key is None and self._may_refetch(now):
+            # Unknown kid: Clerk may have rotated keys. Rate-limited so bogus
+            # kids can't turn every request into a JWKS fetch.
+            self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def stats(self):
+        age = None if self._fetched_at is None else round(self._timer() - self._fetched_at, 1)
+        return {
+            "keys": len(self._keys),
+            "age_seconds": age,
+            "ttl_seconds": self.ttl,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+
+clerk_jwks = JWKSKeyCache(
+    CLERK_JWKS_URL,
+    ttl=CLERK_JWKS_TTL_SECONDS,
+    min_refresh_interval=CLERK_JWKS_MIN_REFRESH_SECONDS,
+    timeout=CLERK_API_TIMEOUT_SECONDS,
+)
+verified_tokens = TTLCache(
+    maxsize=CLERK_VERIFIED_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=CLERK_VERIFIED_TOKEN_CACHE_MAX_TTL_SECONDS,
+)
+
+
+def get_clerk_public_key(kid: str):
+    """Return the RSA public key matching *kid*, fetching JWKS if needed."""
+    return clerk_jwks.get(kid)
+
+
+def verify_token_signature(token: str, exp=None) -> bool:
+    """RS256-verify *token* against Clerk's JWKS.
+
+    Returns False when there is no key to check against; raises
+    ``jwt.InvalidTokenError`` for a bad signature. Verified tokens with an
+    ``exp`` are remembered (by digest, never the raw token) until then.
+    """
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    if verified_tokens.get(digest):
+        return True
+    kid = jwt.get_unverified_header(token).get("kid")
+    if not kid:
+        return False
+    public_key = get_clerk_public_key(kid)
+    if not public_key:
+        return False
+    jwt.decode(token, public_key, algorithms=["RS256"], options={"verify_aud": False})
+    if exp and verified_tokens.ttl > 0:
+        ttl = min(exp - time.time(), verified_tokens.ttl)
+        if ttl > 0:
+            verified_tokens.set(digest, True, ttl=ttl)
+    return True
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  Clerk Management API
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def clerk_request(method: str, path: str, body: dict | None = None):
+def clerk_request(method: str, path: str, body: dict | None = None, timeout: float = CLERK_API_TIMEOUT_SECONDS):
     """Make an authenticated request to the Clerk Management API."""
     url = f"{CLERK_API_BASE}{path}"
     data = json.dumps(body).encode() if body else None
@@ -111,7 +247,7 @@ def clerk_request(method: str, path: str, body: dict | None = None):
         headers["Content-Type"] = "application/json"
     req = urllib.request.Request(url, data=data, headers=headers, method=method)
     try:
-        with urllib.request.urlopen(req) as resp:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
             return json.loads(resp.read().decode()), resp.status
     except urllib.error.HTTPError as e:
         raw = e.read().decode("utf-8", errors="replace")
@@ -131,12 +267,43 @@ def test_clerk_connection():
             f"{CLERK_API_BASE}/users?limit=1",
             headers={"Authorization": f"Bearer {CLERK_SECRET_KEY}"},
         )
-        with urllib.request.urlopen(req) as r:
+        with urllib.request.urlopen(req, timeout=CLERK_API_TIMEOUT_SECONDS) as r:
             logger_admin.info("Clerk API connected — HTTP %s", r.status)
     except Exception:
         pass
 
 
+role_cache = TieredCache(
+    "clerk_role",
+    maxsize=CLERK_ROLE_CACHE_MAX_ENTRIES,
+    ttl=CLERK_ROLE_CACHE_TTL_SECONDS,
+    redis_url=REDIS_URL,
+)
+_role_lookups = SingleFlight()
+
+
+def _fetch_role(user_id: str) -> dict:
+    """``{"role", "reason"}`` from Clerk, cached unless Clerk failed."""
+    data, status = clerk_request("GET", f"/users/{user_id}")
+    logger_admin.debug("Clerk GET /users/%s → HTTP %s", user_id, status)
+    if status != 200:
+        entry = {"role": None, "reason": f"clerk_api_error:{status}:{data.get('errors', data)}"}
+        if status == 404 and CLERK_ROLE_CACHE_TTL_SECONDS > 0:
+            role_cache.set(user_id, entry, ttl=CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS)
+        return entry
+    role = (data.get("public_metadata") or {}).get("role")
+    logger_admin.debug("public_metadata=%r → role=%r", data.get("public_metadata"), role)
+    entry = {"role": role, "reason": "ok"}
+    if CLERK_ROLE_CACHE_TTL_SECONDS > 0:
+        role_cache.set(user_id, entry, ttl=None if role else CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS)
+    return entry
+
+
+def invalidate_role(user_id: str) -> None:
+    """Drop a cached role (this worker and Redis, if configured) after changing it."""
+    role_cache.invalidate(user_id)
+
+
 def get_caller_role(req=None) -> tuple[str | None, str]:
     """Return ``(role, reason)`` for the caller identified by the Bearer token."""
     req = req or request
@@ -154,13 +321,10 @@ def get_caller_role(req=None) -> tuple[str | None, str]:
             return None, "no_sub_in_jwt"
         if not CLERK_SECRET_KEY:
             return None, "clerk_key_not_set"
-        data, status = clerk_request("GET", f"/users/{user_id}")
-        logger_admin.debug("Clerk GET /users/%s → HTTP %s", user_id, status)
-        if status != 200:
-            return None, f"clerk_api_error:{status}:{data.get('errors', data)}"
-        role = (data.get("public_metadata") or {}).get("role")
-        logger_admin.debug("public_metadata=%r → role=%r", data.get("public_metadata"), role)
-        return role, "ok"
+        entry = role_cache.get(user_id) if CLERK_ROLE_CACHE_TTL_SECONDS > 0 else None
+        if entry is None:
+            entry = _role_lookups.do(user_id, lambda: _fetch_role(user_id))
+        return entry["role"], entry["reason"]
     except Exception as e:
         logger_admin.error("get_caller_role exception: %s", e)
         return None, f"exception:{e}"
@@ -175,7 +339,7 @@ def require_auth(roles=None, skip_db_check=False):
 
     Validation order (defence in depth):
       1. Decode JWT payload (sub + exp) via base64.
-      2. RS256 signature verification via Clerk JWKS.
+      2. RS256 signature verification via Clerk JWKS (memoised per token).
       3. DB user exists check (unless *skip_db_check*).
       4. Guard URL ``clerk_id`` params against lateral access.
       5. RBAC via Clerk Management API for role-restricted endpoints.
@@ -185,7 +349,7 @@ def require_auth(roles=None, skip_db_check=False):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Lazy import to avoid circular dep at module level
-            from flask_app import DB_AVAILABLE, get_user_by_clerk_id
+            from flask_app import DB_AVAILABLE
 
             if request.method == "OPTIONS":
                 return f(*args, **kwargs)
@@ -210,13 +374,7 @@ def require_auth(roles=None, skip_db_check=False):
             # Step 2: RS256 signature verification via JWKS
             _sig_verified = False
             try:
-                unverified_header = jwt.get_unverified_header(token)
-                kid = unverified_header.get("kid")
-                if kid:
-                    public_key = get_clerk_public_key(kid)
-                    if public_key:
-                        jwt.decode(token, public_key, algorithms=["RS256"], options={"verify_aud": False})
-                        _sig_verified = True
+                _sig_verified = verify_token_signature(token, exp)
             except jwt.ExpiredSignatureError:
                 return jsonify({"error": "Unauthorized", "message": "Token expired"}), 401
             except jwt.InvalidTokenError as e:
@@ -227,7 +385,7 @@ def require_auth(roles=None, skip_db_check=False):
             # Step 3: DB user validation
             if DB_AVAILABLE and not skip_db_check:
                 try:
-                    db_user = get_user_by_clerk_id(user_id)
+                    db_user = get_user(user_id)
                     if not db_user:
                         return jsonify({"error": "Unauthorized", "message": "User not found in system"}), 401
                 except Exception as e:
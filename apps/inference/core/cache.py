@@ -0,0 +1,261 @@
+"""
+In-process TTL/LRU cache with an optional shared Redis tier.
+
+``TTLCache`` is a thread-safe ``OrderedDict`` keyed cache: every entry
+expires ``ttl`` seconds after it was written, and the least recently used
+entry is evicted once ``maxsize`` is reached.
+
+``TieredCache`` puts a ``TTLCache`` in front of Redis (when ``REDIS_URL``
+is configured and reachable) so gunicorn workers share results. The Redis
+tier stores JSON and fails open: any Redis error is logged and treated as
+a miss, never as a request failure.
+
+``SingleFlight`` collapses concurrent computations of the same key into
+one call whose result every waiting thread shares.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("foresee.cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry time-to-live."""
+
+    def __init__(self, maxsize=256, ttl=300.0, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisTier:
+    """JSON values in Redis under ``foresee:<namespace>:``. Fails open."""
+
+    def __init__(self, client, namespace):
+        self._client = client
+        self._prefix = f"foresee:{namespace}:"
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def connect(cls, redis_url, namespace):
+        """Return a RedisTier, or None if Redis is unset or unreachable."""
+        if not redis_url:
+            return None
+        try:
+            import redis as _redis
+            client = _redis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=1)
+            client.ping()
+        except Exception as e:
+            logger.warning("Redis cache tier for %s disabled (%s: %s)",
+                           namespace, e.__class__.__name__, e)
+            return None
+        return cls(client, namespace)
+
+    def get(self, key):
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key):
+        """Return ``(value, seconds_left)``; ``seconds_left`` is None without an expiry."""
+        try:
+            raw = self._client.get(self._prefix + key)
+            ms_left = self._client.pttl(self._prefix + key) if raw is not None else -2
+        except Exception as e:
+            self.errors += 1
+            logger.debug("Redis get failed: %s", e)
+            return None, None
+        if raw is None or ms_left == -2:  # -2: expired between the two calls
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        return json.loads(raw), (ms_left / 1000 if ms_left >= 0 else None)
+
+    def set(self, key, value, ttl):
+        try:
+            self._client.set(self._prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+        except Exception as e:
+            self.errors += 1
+            logger.debug("Redis set failed: %s", e)
+
+    def invalidate(self, key):
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Redis cache invalidate failed: %s", e)
+
+    def clear(self):
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Redis cache clear failed: %s", e)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+class TieredCache:
+    """Local ``TTLCache`` backed by an optional ``RedisTier``."""
+
+    def __init__(self, namespace, maxsize=256, ttl=300.0, redis_url=""):
+        self.namespace = namespace
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._redis_url = redis_url
+        self._remote = _MISSING  # connected lazily on first use
+        self._remote_lock = threading.Lock()
+
+    @property
+    def remote(self):
+        if self._remote is _MISSING:
+            with self._remote_lock:
+                if self._remote is _MISSING:
+                    self._remote = RedisTier.connect(self._redis_url, self.namespace)
+        return self._remote
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        remote = self.remote
+        if remote is None:
+            return None
+        value, ttl = remote.get_with_ttl(key)
+        if value is not None:
+            # Keep the writer's TTL (e.g. a short negative entry) rather than ours
+            self.local.set(key, value, self.local.ttl if ttl is None else min(ttl, self.local.ttl))
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.local.ttl if ttl is None else ttl
+        self.local.set(key, value, ttl)
+        remote = self.remote
+        if remote is not None:
+            remote.set(key, value, ttl)
+
+    def invalidate(self, key):
+        self.local.invalidate(key)
+        remote = self.remote
+        if remote is not None:
+            remote.invalidate(key)
+
+    def clear(self):
+        self.local.clear()
+        remote = self.remote
+        if remote is not None:
+            remote.clear()
+
+    def stats(self):
+        remote = None if self._remote is _MISSING else self._remote
+        return {
+            "local": self.local.stats(),
+            "redis": remote.stats() if remote is not None else None,
+        }
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run ``fn`` once per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
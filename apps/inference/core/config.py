@@ -76,11 +76,64 @@ logger.info("CORS allowed origins: %s", ALLOWED_ORIGINS)
 DEFAULT_RATE_LIMIT = os.getenv("DEFAULT_RATE_LIMIT", "100 per minute")
 REDIS_URL = os.getenv("REDIS_URL", "").strip()
 
+# ── Forecast cache ───────────────────────────────────────────────────────────
+
+FORECAST_CACHE_ENABLED = os.getenv("FORECAST_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+FORECAST_CACHE_TTL_SECONDS = int(os.getenv("FORECAST_CACHE_TTL_SECONDS", 900))
+FORECAST_CACHE_MAX_ENTRIES = int(os.getenv("FORECAST_CACHE_MAX_ENTRIES", 512))
+
+# ── Live signal refresh ──────────────────────────────────────────────────────
+
+SIGNAL_REFRESH_ENABLED = os.getenv("SIGNAL_REFRESH_ENABLED", "true").lower() in ("true", "1", "yes")
+
+# ── Model runtime ────────────────────────────────────────────────────────────
+
+# "auto": serve the CNN / gatekeeper from exported .tflite files when present,
+# else Keras .h5. "keras": always Keras.
+MODEL_RUNTIME = os.getenv("MODEL_RUNTIME", "auto").strip().lower()
+
+# Memory-map numpy arrays in joblib model artifacts (shared across workers).
+# Only safe if every writer replaces the .pkl by rename (core.utils.replace_atomically):
+# truncating a mapped file in place kills the workers mapping it with SIGBUS.
+MODEL_MMAP = os.getenv("MODEL_MMAP", "false").lower() in ("true", "1", "yes")
+
+# When models load: "eager" (all at startup), "lazy" (each on first use) or
+# "background" (on first use, plus a warm-up thread loading them at startup)
+MODEL_LOADING = os.getenv("MODEL_LOADING", "background").strip().lower()
+
+# Poll models/ for retrained artifacts and hot-swap them (seconds; 0 disables)
+MODEL_WATCH_SECONDS = float(os.getenv("MODEL_WATCH_SECONDS", "30"))
+
+# Set by gunicorn.conf.py when the app is loaded in the master before fork;
+# image models and background threads are then started per worker in post_fork
+PRELOADING = os.getenv("FORESEE_PRELOADING", "") == "1"
+
 # ── Clerk / Auth ─────────────────────────────────────────────────────────────
 
 CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY", "").strip()
 CLERK_PUBLISHABLE_KEY = os.getenv("CLERK_PUBLISHABLE_KEY", "")
 CLERK_API_BASE = "https://api.clerk.com/v1"
+CLERK_API_TIMEOUT_SECONDS = float(os.getenv("CLERK_API_TIMEOUT_SECONDS", 5))
+
+# Parsed JWKS public keys are refreshed in the background once older than the
+# TTL; an unknown kid triggers a refetch at most every MIN_REFRESH seconds.
+CLERK_JWKS_TTL_SECONDS = float(os.getenv("CLERK_JWKS_TTL_SECONDS", 3600))
+CLERK_JWKS_MIN_REFRESH_SECONDS = float(os.getenv("CLERK_JWKS_MIN_REFRESH_SECONDS", 30))
+
+# Tokens whose RS256 signature has been verified, remembered until ``exp``
+# (capped at the max TTL; 0 disables)
+CLERK_VERIFIED_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("CLERK_VERIFIED_TOKEN_CACHE_MAX_ENTRIES", 4096))
+CLERK_VERIFIED_TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("CLERK_VERIFIED_TOKEN_CACHE_MAX_TTL_SECONDS", 300))
+
+# Caller roles from Clerk publicMetadata, shared through REDIS_URL when set.
+# Callers without a role (or unknown to Clerk) use the shorter negative TTL.
+CLERK_ROLE_CACHE_TTL_SECONDS = float(os.getenv("CLERK_ROLE_CACHE_TTL_SECONDS", 60))
+CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS", 15))
+CLERK_ROLE_CACHE_MAX_ENTRIES = int(os.getenv("CLERK_ROLE_CACHE_MAX_ENTRIES", 1024))
+
+# Process-level cache of "User" rows looked up by Clerk id (0 disables)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 1024))
 
 # ── Image upload limits ──────────────────────────────────────────────────────
 
@@ -88,6 +141,11 @@ IMAGE_MAX_FILE_SIZE_MB = 10
 IMAGE_MAX_FILE_SIZE_BYTES = IMAGE_MAX_FILE_SIZE_MB * 1024 * 1024
 IMAGE_ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/bmp", "image/tiff", "image/webp"}
 IMAGE_ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp"}
+IMAGE_BATCH_MAX_SIZE = int(os.getenv("IMAGE_BATCH_MAX_SIZE", 16))
+IMAGE_BATCH_MAX_WAIT_MS = float(os.getenv("IMAGE_BATCH_MAX_WAIT_MS", 5))
+# How long a request waits on a batched model call before giving up with 503
+IMAGE_MODEL_TIMEOUT_SECONDS = float(os.getenv("IMAGE_MODEL_TIMEOUT_SECONDS", 30))
+IMAGE_VALIDATION_ORDER = os.getenv("IMAGE_VALIDATION_ORDER", "auto")
 IMAGE_MAGIC_BYTES = [
     (b"\xff\xd8\xff", "JPEG"),
     (b"\x89PNG\r\n\x1a\n", "PNG"),
@@ -96,3 +154,8 @@ IMAGE_MAGIC_BYTES = [
     (b"MM\x00\x2a", "TIFF-BE"),
     (b"RIFF", "WEBP"),
 ]
+
+# ── Symptom scoring ──────────────────────────────────────────────────────────
+
+# Upper bound on records per /predict/symptoms/batch request
+SYMPTOM_BATCH_MAX_RECORDS = int(os.getenv("SYMPTOM_BATCH_MAX_RECORDS", 10000))
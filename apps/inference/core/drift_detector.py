@@ -6,12 +6,26 @@ to detect concept drift and trigger model retraining.
 Implements:
 - Residual drift: z-score on recent prediction errors
 - Feature drift: distribution shift in exogenous features
-- ADWIN-inspired windowed change detection
+- ADWIN (bucketed, ADWIN2) windowed change detection
+
+All statistics are maintained incrementally as observations arrive, so
+``check_drift`` costs O(1) per monitored series plus O(log n) for the
+ADWIN cut scan, independent of the window size.
+
+State is persisted write-behind: ``check_drift`` only marks the detector
+dirty, and a background thread batches everything recorded in the next
+``DRIFT_STATE_FLUSH_SECONDS`` into one write. Each worker appends its new
+observations to the shared ``.npz`` state under a file lock and replaces
+it atomically, so gunicorn workers merge instead of clobbering each other.
 """
 
+import atexit
 import json
 import logging
+import math
 import os
+import tempfile
+import threading
 import time
 from collections import deque
 
@@ -23,12 +37,270 @@ from core.adaptive_config import (
     DRIFT_MIN_SAMPLES,
     DRIFT_MODE,
     DRIFT_RESIDUAL_THRESHOLD,
+    DRIFT_STATE_FLUSH_SECONDS,
 )
+from core.utils import FileLock
 
 logger = logging.getLogger("foresee.drift")
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DRIFT_STATE_PATH = os.path.join(BASE_DIR, "models", "drift_state.json")
+DRIFT_STATE_PATH = os.path.join(BASE_DIR, "models", "drift_state.npz")
+LEGACY_DRIFT_STATE_PATH = os.path.join(BASE_DIR, "models", "drift_state.json")
+MAX_DRIFT_EVENTS = 50
+
+
+class RunningStats:
+    """Welford mean / variance accumulator that also supports removals."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x):
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.n -= 1
+        self.mean = (old_mean * (self.n + 1) - x) / self.n
+        self.m2 = max(self.m2 - (x - old_mean) * (x - self.mean), 0.0)
+
+    @property
+    def std(self):
+        """Population standard deviation (matches ``np.std``)."""
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
+
+
+class _WindowHalf:
+    """A deque of observations with running stats over exactly its contents."""
+
+    def __init__(self):
+        self.values = deque()
+        self.stats = RunningStats()
+        self._removals = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def push(self, x):
+        self.values.append(x)
+        self.stats.add(x)
+
+    def pop_oldest(self):
+        x = self.values.popleft()
+        self.stats.remove(x)
+        # Removals accumulate rounding error; an exact rebuild every
+        # len(values) removals keeps it bounded at amortized O(1) cost.
+        self._removals += 1
+        if self._removals > max(len(self.values), 64):
+            self._rebuild()
+        return x
+
+    def _rebuild(self):
+        self.stats = RunningStats()
+        for x in self.values:
+            self.stats.add(x)
+        self._removals = 0
+
+
+class SplitWindow:
+    """
+    Bounded sliding window split into an older half (the first n // 2
+    observations) and a newer half (the rest), each with running stats.
+    Appending moves at most one value across the split, so the half means
+    and stds are always available in O(1).
+    """
+
+    def __init__(self, values=(), maxlen=100):
+        self.maxlen = maxlen
+        self.older = _WindowHalf()
+        self.newer = _WindowHalf()
+        for x in values:
+            self.append(x)
+
+    def __len__(self):
+        return len(self.older) + len(self.newer)
+
+    def __iter__(self):
+        yield from self.older.values
+        yield from self.newer.values
+
+    def append(self, x):
+        x = float(x)
+        self.newer.push(x)
+        if len(self) > self.maxlen:
+            (self.older if len(self.older) else self.newer).pop_oldest()
+        while len(self.older) < len(self) // 2:
+            self.older.push(self.newer.pop_oldest())
+
+
+class Adwin:
+    """
+    ADWIN2 change detector (Bifet & Gavalda, 2007).
+
+    The window is kept as an exponential histogram: row i holds at most
+    ``max_buckets`` buckets of 2**i observations, each storing its sum and
+    sum of squared deviations. A change is signalled when some cut between
+    buckets splits the window into two sub-windows whose means differ by
+    more than the variance-aware ADWIN bound; the oldest buckets are then
+    dropped until no such cut remains. A scan visits O(log n) cuts using
+    running (prefix) sums over the buckets. ``max_width`` caps the window
+    by dropping whole oldest buckets, so the cap is approximate.
+    """
+
+    def __init__(self, delta=DRIFT_ADWIN_DELTA, max_buckets=5, min_window=DRIFT_MIN_SAMPLES // 2,
+                 max_width=None):
+        self.delta = delta
+        self.max_buckets = max_buckets
+        self.min_window = max(min_window, 1)
+        self.max_width = max_width
+        self._rows = []  # row i: deque of (total, m2) for buckets of 2**i items, oldest first
+        self.width = 0
+        self.total = 0.0
+        self.m2 = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.width if self.width else 0.0
+
+    @property
+    def n_buckets(self):
+        return sum(len(row) for row in self._rows)
+
+    def add(self, x):
+        x = float(x)
+        delta = x - self.mean
+        self.width += 1
+        self.total += x
+        self.m2 += delta * delta * (self.width - 1) / self.width
+
+        if not self._rows:
+            self._rows.append(deque())
+        self._rows[0].append((x, 0.0))
+
+        # Merge the two oldest buckets of any over-full row into the next row
+        level = 0
+        while len(self._rows[level]) > self.max_buckets:
+            size = 1 << level
+            t1, v1 = self._rows[level].popleft()
+            t2, v2 = self._rows[level].popleft()
+            merged = (t1 + t2, v1 + v2 + size / 2.0 * (t1 / size - t2 / size) ** 2)
+            if level + 1 == len(self._rows):
+                self._rows.append(deque())
+            self._rows[level + 1].append(merged)
+            level += 1
+
+        if self.max_width is not None and self.width > self.max_width:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        level = len(self._rows) - 1
+        size = 1 << level
+        t, v = self._rows[level].popleft()
+        rest = self.width - size
+        if rest <= 0:
+            self.width, self.total, self.m2 = 0, 0.0, 0.0
+        else:
+            mu_rest = (self.total - t) / rest
+            self.m2 = max(self.m2 - v - rest * size / self.width * (mu_rest - t / size) ** 2, 0.0)
+            self.total -= t
+            self.width = rest
+        while self._rows and not self._rows[-1]:
+            self._rows.pop()
+
+    def _cut_detected(self):
+        if self.width < 2 * self.min_window:
+            return False
+
+        variance = self.m2 / self.width
+        delta_prime = self.delta / max(math.log(self.width), 1.0)
+        log_term = math.log(2.0 / delta_prime)
+
+        n0, s0 = 0, 0.0
+        for level in range(len(self._rows) - 1, -1, -1):
+            size = 1 << level
+            for t, _ in self._rows[level]:
+                n0 += size
+                s0 += t
+                n1 = self.width - n0
+                if n1 < self.min_window:
+                    return False
+                if n0 < self.min_window:
+                    continue
+                m = 1.0 / (1.0 / n0 + 1.0 / n1)
+                eps = math.sqrt(2.0 / m * variance * log_term) + 2.0 / (3.0 * m) * log_term
+                if abs(s0 / n0 - (self.total - s0) / n1) > eps:
+                    return True
+        return False
+
+    def detect_change(self):
+        """Shrink the window past every significant cut. True if one was found."""
+        changed = False
+        while self._cut_detected():
+            self._drop_oldest()
+            changed = True
+        return changed
+
+
+def read_drift_state(path, legacy_path=None):
+    """
+    Load persisted drift state as plain lists, or None if there is none.
+    Falls back to the pre-``.npz`` JSON state at ``legacy_path``.
+    """
+    if os.path.exists(path):
+        with np.load(path, allow_pickle=False) as data:
+            names = [str(n) for n in data["feature_names"]]
+            offsets = np.cumsum(np.concatenate([[0], data["feature_lengths"]])).astype(int)
+            values = data["feature_values"]
+            return {
+                "residuals": data["residuals"].tolist(),
+                "feature_history": {
+                    name: values[offsets[i]: offsets[i + 1]].tolist() for i, name in enumerate(names)
+                },
+                "drift_events": json.loads(str(data["drift_events"])),
+                "last_drift_time": float(data["last_drift_time"]),
+            }
+    if legacy_path and os.path.exists(legacy_path):
+        with open(legacy_path) as f:
+            return json.load(f)
+    return None
+
+
+def write_drift_state(path, state):
+    """Write drift state as an uncompressed ``.npz`` via temp file + atomic rename."""
+    names = list(state["feature_history"])
+    histories = [np.asarray(state["feature_history"][n], dtype=float) for n in names]
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".drift_state.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                residuals=np.asarray(state["residuals"], dtype=float),
+                feature_names=np.array(names, dtype=str),
+                feature_lengths=np.array([len(h) for h in histories], dtype=np.int64),
+                feature_values=np.concatenate(histories) if histories else np.empty(0),
+                drift_events=np.array(json.dumps(state["drift_events"])),
+                last_drift_time=np.array(float(state["last_drift_time"])),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 class DriftDetector:
@@ -37,58 +309,157 @@ class DriftDetector:
     1. Prediction residuals (actual - predicted)
     2. Feature distribution shifts
 
-    Uses sliding-window z-score approach with ADWIN-inspired
-    adaptive windowing for aggressive mode.
+    Uses sliding-window z-score approach plus a bucketed ADWIN
+    over the residual stream.
     """
 
-    def __init__(self, max_window=100):
-        self.residuals = deque(maxlen=max_window)
-        self.feature_history = {}  # feature_name -> deque of values
+    def __init__(self, max_window=100, state_path=DRIFT_STATE_PATH,
+                 legacy_state_path=LEGACY_DRIFT_STATE_PATH, flush_seconds=DRIFT_STATE_FLUSH_SECONDS):
         self.max_window = max_window
+        self.state_path = state_path
+        self.legacy_state_path = legacy_state_path
+        self.flush_seconds = flush_seconds  # None: no background writer, call save_state()
+        self.residuals = SplitWindow(maxlen=max_window)
+        self.feature_history = {}  # feature_name -> SplitWindow of values
+        self._adwin = self._new_adwin()
         self.drift_events = []
         self.last_drift_time = 0
+
+        # Observations not yet merged into the state file
+        self._pending_lock = threading.Lock()
+        self._pending_residuals = []
+        self._pending_features = {}
+        self._pending_events = []
+        self._dirty = threading.Event()
+        self._writer = None
+        self._writer_pid = None
+        # FileLock excludes other workers only; the write-behind thread and the
+        # atexit save in one process also need excluding from each other
+        self._save_mutex = threading.Lock()
+        self._save_lock = FileLock(state_path + ".lock") if state_path else None
+
         self._load_state()
 
+    def _new_adwin(self):
+        delta = DRIFT_ADWIN_DELTA
+        if DRIFT_MODE == "aggressive":
+            delta *= 0.5
+        return Adwin(delta=delta, min_window=DRIFT_MIN_SAMPLES // 2, max_width=self.max_window)
+
     def _load_state(self):
-        if os.path.exists(DRIFT_STATE_PATH):
-            try:
-                with open(DRIFT_STATE_PATH) as f:
-                    state = json.load(f)
-                self.residuals = deque(state.get("residuals", []), maxlen=self.max_window)
-                self.drift_events = state.get("drift_events", [])
-                self.last_drift_time = state.get("last_drift_time", 0)
-                for k, v in state.get("feature_history", {}).items():
-                    self.feature_history[k] = deque(v, maxlen=self.max_window)
-                logger.info("Drift state loaded: %d residuals, %d events",
-                            len(self.residuals), len(self.drift_events))
-            except Exception as e:
-                logger.warning("Could not load drift state: %s", e)
+        if not self.state_path:
+            return
+        try:
+            state = read_drift_state(self.state_path, self.legacy_state_path)
+        except Exception as e:
+            logger.warning("Could not load drift state: %s", e)
+            return
+        if state is None:
+            return
+        for r in state.get("residuals", [])[-self.max_window:]:
+            self._observe_residual(float(r))
+        self.drift_events = state.get("drift_events", [])
+        self.last_drift_time = state.get("last_drift_time", 0)
+        for k, v in state.get("feature_history", {}).items():
+            self.feature_history[k] = SplitWindow(v[-self.max_window:], maxlen=self.max_window)
+        logger.info("Drift state loaded: %d residuals, %d events",
+                    len(self.residuals), len(self.drift_events))
+
+    # ── Persistence ───────────────────────────────────────────────────────
 
     def save_state(self):
-        state = {
-            "residuals": list(self.residuals),
-            "feature_history": {k: list(v) for k, v in self.feature_history.items()},
-            "drift_events": self.drift_events[-50:],  # keep last 50 events
-            "last_drift_time": self.last_drift_time,
-        }
+        """
+        Merge observations recorded since the last save into the state file.
+        Other workers' observations already on disk are kept; each window is
+        then trimmed to ``max_window``. Returns True if a file was written.
+        """
+        if not self.state_path:
+            return False
+        with self._pending_lock:
+            residuals, self._pending_residuals = self._pending_residuals, []
+            features, self._pending_features = self._pending_features, {}
+            events, self._pending_events = self._pending_events, []
+            last_drift_time = self.last_drift_time
+        if not (residuals or features or events) and os.path.exists(self.state_path):
+            return False
+
         try:
-            with open(DRIFT_STATE_PATH, "w") as f:
-                json.dump(state, f)
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with self._save_mutex, self._save_lock:
+                state = read_drift_state(self.state_path, self.legacy_state_path) or {}
+                history = state.get("feature_history", {})
+                for k, v in features.items():
+                    history[k] = history.get(k, []) + v
+                merged_events = {
+                    (e["time"], e["drift_score"]): e for e in state.get("drift_events", []) + events
+                }
+                write_drift_state(self.state_path, {
+                    "residuals": (state.get("residuals", []) + residuals)[-self.max_window:],
+                    "feature_history": {k: v[-self.max_window:] for k, v in history.items()},
+                    "drift_events": sorted(merged_events.values(),
+                                           key=lambda e: e["time"])[-MAX_DRIFT_EVENTS:],
+                    "last_drift_time": max(state.get("last_drift_time", 0), last_drift_time),
+                })
+            return True
         except Exception as e:
             logger.warning("Could not save drift state: %s", e)
+            # Put the batch back so the next save retries it
+            with self._pending_lock:
+                self._pending_residuals[:0] = residuals
+                for k, v in features.items():
+                    self._pending_features[k] = v + self._pending_features.get(k, [])
+                self._pending_events[:0] = events
+            return False
+
+    def _schedule_save(self):
+        """Mark state dirty for the write-behind thread (started on first use per process)."""
+        if not self.state_path or self.flush_seconds is None:
+            return
+        self._dirty.set()
+        if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        with self._pending_lock:
+            if self._writer is None or self._writer_pid != os.getpid() or not self._writer.is_alive():
+                if self._writer_pid != os.getpid():
+                    atexit.register(self.save_state)
+                self._writer = threading.Thread(target=self._write_behind, name="drift-state-writer",
+                                                daemon=True)
+                self._writer_pid = os.getpid()
+                self._writer.start()
+
+    def _write_behind(self):
+        while True:
+            self._dirty.wait()
+            # Let observations from the next few requests join this batch
+            time.sleep(self.flush_seconds)
+            self._dirty.clear()
+            self.save_state()
+
+    # ── Recording ─────────────────────────────────────────────────────────
+
+    def _observe_residual(self, residual):
+        self.residuals.append(residual)
+        self._adwin.add(residual)
 
     def record_residual(self, actual, predicted):
         """Record a new prediction residual."""
-        residual = actual - predicted
-        self.residuals.append(residual)
+        residual = float(actual - predicted)
+        self._observe_residual(residual)
+        with self._pending_lock:
+            self._pending_residuals.append(residual)
 
     def record_features(self, features_dict):
         """Record feature values for distribution monitoring."""
+        recorded = {}
         for key, val in features_dict.items():
             if isinstance(val, (int, float)) and not np.isnan(val):
                 if key not in self.feature_history:
-                    self.feature_history[key] = deque(maxlen=self.max_window)
+                    self.feature_history[key] = SplitWindow(maxlen=self.max_window)
                 self.feature_history[key].append(float(val))
+                recorded[key] = float(val)
+        with self._pending_lock:
+            for key, val in recorded.items():
+                self._pending_features.setdefault(key, []).append(val)
 
     def check_drift(self):
         """
@@ -109,13 +480,9 @@ class DriftDetector:
             return result
 
         # ── Residual Drift (z-score method) ───────────────────────────
-        residuals = np.array(self.residuals)
-        n = len(residuals)
-        split = n // 2
-
-        old_mean = np.mean(residuals[:split])
-        old_std = max(np.std(residuals[:split]), 1e-6)
-        new_mean = np.mean(residuals[split:])
+        old_mean = self.residuals.older.stats.mean
+        old_std = max(self.residuals.older.stats.std, 1e-6)
+        new_mean = self.residuals.newer.stats.mean
 
         z_residual = abs(new_mean - old_mean) / old_std
 
@@ -135,11 +502,9 @@ class DriftDetector:
         for feat_name, values in self.feature_history.items():
             if len(values) < DRIFT_MIN_SAMPLES:
                 continue
-            vals = np.array(values)
-            split_f = len(vals) // 2
-            old_f_mean = np.mean(vals[:split_f])
-            old_f_std = max(np.std(vals[:split_f]), 1e-6)
-            new_f_mean = np.mean(vals[split_f:])
+            old_f_mean = values.older.stats.mean
+            old_f_std = max(values.older.stats.std, 1e-6)
+            new_f_mean = values.newer.stats.mean
 
             z_feat = abs(new_f_mean - old_f_mean) / old_f_std
 
@@ -156,8 +521,8 @@ class DriftDetector:
         if len(drift_features) >= 2:
             result["feature_drift"] = True
 
-        # ── ADWIN-inspired adaptive check ─────────────────────────────
-        adwin_drift = self._adwin_check(residuals)
+        # ── ADWIN adaptive window check ───────────────────────────────
+        adwin_drift = self._adwin.detect_change()
         if adwin_drift:
             result["details"].append("ADWIN window split detected significant change")
 
@@ -181,40 +546,18 @@ class DriftDetector:
                 "details": result["details"],
             }
             self.drift_events.append(event)
+            self.drift_events = self.drift_events[-MAX_DRIFT_EVENTS:]
             self.last_drift_time = time.time()
+            with self._pending_lock:
+                self._pending_events.append(event)
             logger.warning("DRIFT DETECTED (score=%.2f): %s",
                            result["drift_score"], "; ".join(result["details"]))
         else:
             result["status"] = "stable"
 
-        self.save_state()
+        self._schedule_save()
         return result
 
-    def _adwin_check(self, data):
-        """
-        Simplified ADWIN: find the split point that maximizes
-        the difference between two sub-windows.
-        """
-        n = len(data)
-        if n < DRIFT_MIN_SAMPLES:
-            return False
-
-        max_diff = 0
-        threshold = DRIFT_ADWIN_DELTA
-
-        if DRIFT_MODE == "aggressive":
-            threshold *= 0.5
-
-        for cut in range(DRIFT_MIN_SAMPLES // 2, n - DRIFT_MIN_SAMPLES // 2):
-            left = data[:cut]
-            right = data[cut:]
-            m = abs(np.mean(left) - np.mean(right))
-            eps = np.sqrt(1.0 / (2.0 * cut) + 1.0 / (2.0 * (n - cut))) * np.log(2.0 / threshold)
-            if m > eps and m > max_diff:
-                max_diff = m
-
-        return max_diff > 0
-
     def get_status_summary(self):
         """Return a concise status dict for API responses."""
         n = len(self.residuals)
@@ -0,0 +1,285 @@
+"""
+On-disk Feature Cache
+SQLite-backed store for the live exogenous signals used by the feature
+store, replacing the whole-file JSON caches.
+
+Tables:
+    signals         (namespace, key) -> JSON payload + updated_at.
+                    Holds nowcast weather, news signals and archive-fetch
+                    markers; one row per key, so lookups are O(log n).
+    weekly_weather  (region, week_start) -> weekly weather aggregates,
+                    shared by every archive query that covers that week.
+
+WAL mode lets gunicorn workers read while one writes; SQLite's own file
+locking serialises writers across processes (``busy_timeout`` waits
+instead of failing). Rows older than ``FEATURE_CACHE_RETENTION_DAYS`` are
+evicted and the file is vacuumed at most once per
+``FEATURE_CACHE_COMPACT_INTERVAL_HOURS`` across all processes; each
+process checks whether that is due on startup and every
+``FEATURE_CACHE_COMPACT_CHECK_WRITES`` writes.
+
+On first use an empty database is seeded from the legacy JSON caches so
+the last-good fallback values survive the migration.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from core.adaptive_config import (
+    FEATURE_CACHE_COMPACT_CHECK_WRITES,
+    FEATURE_CACHE_COMPACT_INTERVAL_HOURS,
+    FEATURE_CACHE_DB_PATH,
+    FEATURE_CACHE_RETENTION_DAYS,
+    NEWS_CACHE_PATH,
+    WEATHER_CACHE_PATH,
+)
+
+logger = logging.getLogger("foresee.feature_cache")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS signals_updated_at ON signals (updated_at);
+
+CREATE TABLE IF NOT EXISTS weekly_weather (
+    region          TEXT NOT NULL,
+    week_start      TEXT NOT NULL,
+    temp_c_mean     REAL,
+    humidity_mean   REAL,
+    precip_mm_sum   REAL,
+    updated_at      REAL NOT NULL,
+    PRIMARY KEY (region, week_start)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS weekly_weather_updated_at ON weekly_weather (updated_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+"""
+
+# Legacy JSON key prefix -> signals namespace
+_LEGACY_PREFIXES = {"nowcast_": "nowcast", "news_": "news"}
+
+
+class FeatureCache:
+    """Keyed SQLite cache shared by all threads and processes on a host."""
+
+    def __init__(self, path=FEATURE_CACHE_DB_PATH,
+                 legacy_json_paths=(WEATHER_CACHE_PATH, NEWS_CACHE_PATH)):
+        self.path = path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+        self.legacy_json_paths = [
+            p if os.path.isabs(p) else os.path.join(BASE_DIR, p) for p in legacy_json_paths
+        ]
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized_pid = None
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    # ── Connections ───────────────────────────────────────────────────────
+
+    def _connect(self):
+        """Per-thread connection, re-opened after fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        if self._initialized_pid != os.getpid():
+            with self._init_lock:
+                if self._initialized_pid != os.getpid():
+                    self._initialize()
+                    self._initialized_pid = os.getpid()
+
+        conn = self._open()
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout = 10000")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _initialize(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._open()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+            self._import_legacy_json(conn)
+            self._maybe_compact(conn)
+        finally:
+            conn.close()
+
+    # ── Signals ───────────────────────────────────────────────────────────
+
+    def get(self, namespace, key):
+        """Return ``(data, updated_at)`` or None."""
+        row = self._connect().execute(
+            "SELECT data, updated_at FROM signals WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, namespace, key, data, updated_at=None):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO signals (namespace, key, data, updated_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(data), time.time() if updated_at is None else updated_at),
+        )
+        self._count_write()
+
+    # ── Weekly Weather ────────────────────────────────────────────────────
+
+    def put_weekly_weather(self, region, rows, updated_at=None):
+        """Upsert weekly aggregates (dicts with ``week_start`` + weather means)."""
+        updated_at = time.time() if updated_at is None else updated_at
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO weekly_weather "
+                "(region, week_start, temp_c_mean, humidity_mean, precip_mm_sum, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(region, r["week_start"], r.get("temp_c_mean"), r.get("humidity_mean"),
+                  r.get("precip_mm_sum"), updated_at) for r in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count_write()
+
+    def get_weekly_weather(self, region, first_week, last_week):
+        """Weekly rows for ``region`` with ``first_week <= week_start <= last_week``."""
+        rows = self._connect().execute(
+            "SELECT week_start, temp_c_mean, humidity_mean, precip_mm_sum FROM weekly_weather "
+            "WHERE region = ? AND week_start >= ? AND week_start <= ? ORDER BY week_start",
+            (region, first_week, last_week),
+        ).fetchall()
+        return [
+            {"region": region, "week_start": week_start, "temp_c_mean": temp,
+             "humidity_mean": humidity, "precip_mm_sum": precip}
+            for week_start, temp, humidity, precip in rows
+        ]
+
+    # ── Maintenance ───────────────────────────────────────────────────────
+
+    def evict_expired(self, max_age_seconds=FEATURE_CACHE_RETENTION_DAYS * 86400):
+        """Delete rows not refreshed within ``max_age_seconds``. Returns rows removed."""
+        return _delete_older_than(self._connect(), time.time() - max_age_seconds)
+
+    def compact(self):
+        """Evict expired rows, then VACUUM and fold the WAL back into the file."""
+        conn = self._connect()
+        removed = self.evict_expired()
+        _vacuum(conn)
+        logger.info("Feature cache compacted: %d expired rows removed", removed)
+        return removed
+
+    def _count_write(self):
+        """Long-lived workers re-check whether compaction is due every N writes."""
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % FEATURE_CACHE_COMPACT_CHECK_WRITES == 0
+        if due:
+            try:
+                self._maybe_compact(self._connect())
+            except sqlite3.Error as e:
+                logger.warning("Feature cache compaction check failed: %s", e)
+
+    def _maybe_compact(self, conn):
+        """Compact if no process on this host has done so recently."""
+        interval = FEATURE_CACHE_COMPACT_INTERVAL_HOURS * 3600
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock, so exactly one process claims the slot
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'last_compacted'").fetchone()
+            due = row is None or now - float(row[0]) >= interval
+            if due:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_compacted', ?)",
+                             (str(now),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if due and row is not None:
+            removed = _delete_older_than(conn, now - FEATURE_CACHE_RETENTION_DAYS * 86400)
+            _vacuum(conn)
+            logger.info("Feature cache compacted: %d expired rows removed", removed)
+
+    def _import_legacy_json(self, conn):
+        """Seed an empty database from the pre-SQLite JSON caches (once)."""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+
+        imported = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for json_path in self.legacy_json_paths:
+                if not os.path.exists(json_path):
+                    continue
+                try:
+                    with open(json_path) as f:
+                        entries = json.load(f)
+                except Exception as e:
+                    logger.warning("Skipping unreadable legacy cache %s: %s", json_path, e)
+                    continue
+                for legacy_key, entry in entries.items():
+                    for prefix, namespace in _LEGACY_PREFIXES.items():
+                        if legacy_key.startswith(prefix):
+                            conn.execute(
+                                "INSERT OR IGNORE INTO signals (namespace, key, data, updated_at) "
+                                "VALUES (?, ?, ?, ?)",
+                                (namespace, legacy_key[len(prefix):], json.dumps(entry["data"]),
+                                 float(entry.get("timestamp", 0))),
+                            )
+                            imported += 1
+                            break
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', '1')")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if imported:
+            logger.info("Imported %d legacy JSON cache entries into %s", imported, self.path)
+
+    def stats(self):
+        conn = self._connect()
+        signals = dict(conn.execute(
+            "SELECT namespace, COUNT(*) FROM signals GROUP BY namespace"
+        ).fetchall())
+        weeks = conn.execute("SELECT COUNT(*) FROM weekly_weather").fetchone()[0]
+        return {"signals": signals, "weekly_weather_rows": weeks}
+
+
+def _delete_older_than(conn, cutoff):
+    removed = conn.execute("DELETE FROM signals WHERE updated_at < ?", (cutoff,)).rowcount
+    removed += conn.execute("DELETE FROM weekly_weather WHERE updated_at < ?", (cutoff,)).rowcount
+    return removed
+
+
+def _vacuum(conn):
+    # In WAL mode VACUUM writes the rebuilt pages to the WAL; the checkpoint
+    # afterwards is what actually shrinks the database file.
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+# Module-level singleton
+feature_cache = FeatureCache()
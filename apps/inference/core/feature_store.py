@@ -2,63 +2,87 @@
 Feature Store: ingests, caches, and serves exogenous features (weather + news)
 for the adaptive forecasting system.
 
-Keyed by (region, week_start). Provides fallback to cached last-good values
+Keyed by (region, week_start) in the SQLite feature cache
+(core/feature_cache.py). Provides fallback to cached last-good values
 when live APIs are unavailable.
+
+All outbound calls share one pooled keep-alive ``requests.Session`` per
+process, and ``fetch_exogenous`` / ``fetch_exogenous_bulk`` run the
+weather and news lookups concurrently on a bounded thread pool.
 """
 
-import json
 import logging
 import os
+import threading
 import time
-import urllib.parse
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 from core.adaptive_config import (
-    NEWS_CACHE_PATH,
+    EXOGENOUS_FETCH_WORKERS,
+    GOOGLE_NEWS_RSS_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_READ_TIMEOUT,
     NEWS_CACHE_TTL_HOURS,
+    OPEN_METEO_ARCHIVE_URL,
+    OPEN_METEO_FORECAST_URL,
     REGION_COORDS,
-    WEATHER_CACHE_PATH,
+    SIGNAL_MAX_STALE_HOURS,
     WEATHER_CACHE_TTL_HOURS,
 )
+from core.feature_cache import feature_cache
 
 logger = logging.getLogger("foresee.feature_store")
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# ── HTTP Session & Fetch Pool ─────────────────────────────────────────────
+# Created lazily and re-created after fork (gunicorn workers must not share
+# sockets or pool threads with the master).
+
+_session = None
+_executor = None
+_owner_pid = None
+_pool_lock = threading.Lock()
 
-# ── Cache Helpers ─────────────────────────────────────────────────────────
 
-def _ensure_cache_dir():
-    cache_dir = os.path.join(BASE_DIR, "data", "cache")
-    os.makedirs(cache_dir, exist_ok=True)
+def _ensure_pools():
+    global _session, _executor, _owner_pid
+    if _owner_pid == os.getpid():
+        return
+    with _pool_lock:
+        if _owner_pid == os.getpid():
+            return
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+        _executor = ThreadPoolExecutor(max_workers=EXOGENOUS_FETCH_WORKERS,
+                                       thread_name_prefix="exogenous-fetch")
+        _owner_pid = os.getpid()
 
 
-def _load_cache(cache_path):
-    full_path = os.path.join(BASE_DIR, cache_path)
-    if os.path.exists(full_path):
-        try:
-            with open(full_path) as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
+def http_session():
+    """Shared keep-alive session for live signal APIs."""
+    _ensure_pools()
+    return _session
 
 
-def _save_cache(cache_path, data):
-    _ensure_cache_dir()
-    full_path = os.path.join(BASE_DIR, cache_path)
-    with open(full_path, "w") as f:
-        json.dump(data, f, indent=2)
+def _http_get(url, params, read_timeout=HTTP_READ_TIMEOUT):
+    return http_session().get(url, params=params, timeout=(HTTP_CONNECT_TIMEOUT, read_timeout))
 
 
-def _is_cache_fresh(cache_entry, ttl_hours):
-    ts = cache_entry.get("timestamp", 0)
-    return (time.time() - ts) < (ttl_hours * 3600)
+# ── Cache Helpers ─────────────────────────────────────────────────────────
+
+def _is_cache_fresh(updated_at, ttl_hours):
+    return (time.time() - updated_at) < (ttl_hours * 3600)
 
 
 # ── Weather Ingestion ─────────────────────────────────────────────────────
@@ -80,23 +104,28 @@ def fetch_weather_for_region(region, start_date=None, end_date=None):
     if start_date is None:
         start_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
 
-    url = (
-        f"https://archive-api.open-meteo.com/v1/archive"
-        f"?latitude={lat}&longitude={lon}"
-        f"&start_date={start_date}&end_date={end_date}"
-        f"&daily=temperature_2m_mean,relative_humidity_2m_mean,precipitation_sum"
-        f"&timezone=auto"
-    )
-
-    cache = _load_cache(WEATHER_CACHE_PATH)
-    cache_key = f"{region}_{start_date}_{end_date}"
-
-    if cache_key in cache and _is_cache_fresh(cache[cache_key], WEATHER_CACHE_TTL_HOURS):
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": start_date,
+        "end_date": end_date,
+        "daily": "temperature_2m_mean,relative_humidity_2m_mean,precipitation_sum",
+        "timezone": "auto",
+    }
+
+    # Weeks are stored once per (region, week_start); the marker only records
+    # when this exact range was last fetched.
+    first_week = pd.Timestamp(start_date).to_period("W").start_time.isoformat()
+    last_week = pd.Timestamp(end_date).isoformat()
+    marker_key = f"{region}_{start_date}_{end_date}"
+    marker = feature_cache.get("weather_archive", marker_key)
+
+    if marker is not None and _is_cache_fresh(marker[1], WEATHER_CACHE_TTL_HOURS):
         logger.debug("Weather cache hit for %s", region)
-        return cache[cache_key]["data"], True
+        return feature_cache.get_weekly_weather(region, first_week, last_week), True
 
     try:
-        resp = requests.get(url, timeout=10)
+        resp = _http_get(OPEN_METEO_ARCHIVE_URL, params, read_timeout=2 * HTTP_READ_TIMEOUT)
         if resp.status_code == 200:
             data = resp.json()
             daily = data.get("daily", {})
@@ -124,17 +153,18 @@ def fetch_weather_for_region(region, start_date=None, end_date=None):
             for r in result:
                 r["week_start"] = r["week_start"].isoformat()
 
-            cache[cache_key] = {"data": result, "timestamp": time.time()}
-            _save_cache(WEATHER_CACHE_PATH, cache)
+            feature_cache.put_weekly_weather(region, result)
+            feature_cache.put("weather_archive", marker_key, len(result))
             logger.info("Weather fetched for %s: %d weeks", region, len(result))
             return result, True
     except Exception as e:
         logger.warning("Weather API failed for %s: %s", region, e)
 
-    # Fallback to cached data
-    if cache_key in cache:
+    # Fallback to whatever weeks of this range are cached
+    cached_weeks = feature_cache.get_weekly_weather(region, first_week, last_week)
+    if cached_weeks:
         logger.info("Using stale weather cache for %s", region)
-        return cache[cache_key]["data"], False
+        return cached_weeks, False
 
     return _weather_fallback(region), False
 
@@ -145,29 +175,24 @@ def _weather_fallback(region):
              "temp_c_mean": 28.0, "humidity_mean": 65.0, "precip_mm_sum": 0.0}]
 
 
-def fetch_current_weather(region):
-    """Fetch current weather for real-time risk scoring (nowcast)."""
-    if region not in REGION_COORDS:
-        return {"temperature": 28.0, "humidity": 65.0, "precipitation": 0.0,
-                "risk_multiplier": 1.0, "fresh": False}
+_WEATHER_DEFAULT = {"temperature": 28.0, "humidity": 65.0, "precipitation": 0.0,
+                    "risk_multiplier": 1.0}
+_NEWS_DEFAULT = {"article_count": 0, "news_risk_score": 1.0, "headlines": []}
 
+
+def _fetch_nowcast_live(region):
+    """Query Open-Meteo for current conditions. Returns the signal or None on failure."""
     coords = REGION_COORDS[region]
     lat, lon = coords["lat"], coords["lon"]
-    url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={lat}&longitude={lon}"
-        f"&current=temperature_2m,relative_humidity_2m,precipitation"
-        f"&timezone=auto"
-    )
-
-    cache = _load_cache(WEATHER_CACHE_PATH)
-    nowcast_key = f"nowcast_{region}"
-
-    if nowcast_key in cache and _is_cache_fresh(cache[nowcast_key], WEATHER_CACHE_TTL_HOURS):
-        return {**cache[nowcast_key]["data"], "fresh": True}
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "current": "temperature_2m,relative_humidity_2m,precipitation",
+        "timezone": "auto",
+    }
 
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _http_get(OPEN_METEO_FORECAST_URL, params)
         if resp.status_code == 200:
             current = resp.json().get("current", {})
             temp = current.get("temperature_2m", 28.0)
@@ -182,42 +207,37 @@ def fetch_current_weather(region):
             if precip > 0:
                 risk += 0.3
 
-            result = {"temperature": float(temp), "humidity": float(humidity),
-                      "precipitation": float(precip), "risk_multiplier": float(risk)}
-
-            cache[nowcast_key] = {"data": result, "timestamp": time.time()}
-            _save_cache(WEATHER_CACHE_PATH, cache)
-            return {**result, "fresh": True}
+            return {"temperature": float(temp), "humidity": float(humidity),
+                    "precipitation": float(precip), "risk_multiplier": float(risk)}
     except Exception as e:
         logger.warning("Current weather API failed for %s: %s", region, e)
+    return None
 
-    if nowcast_key in cache:
-        return {**cache[nowcast_key]["data"], "fresh": False}
 
-    return {"temperature": 28.0, "humidity": 65.0, "precipitation": 0.0,
-            "risk_multiplier": 1.0, "fresh": False}
+def fetch_current_weather(region):
+    """Fetch current weather for real-time risk scoring (nowcast)."""
+    if region not in REGION_COORDS:
+        return {**_WEATHER_DEFAULT, "fresh": False}
 
+    data, fresh = _read_signal("nowcast", region)
+    if data is None:
+        return {**_WEATHER_DEFAULT, "fresh": False}
+    return {**data, "fresh": fresh}
 
-# ── News Ingestion ────────────────────────────────────────────────────────
 
-def fetch_news_signal(region):
-    """
-    Fetch outbreak-related news volume for a region.
-    Returns article count, risk score, and headlines.
-    Falls back to cached data if Google News RSS fails.
-    """
-    cache = _load_cache(NEWS_CACHE_PATH)
-    cache_key = f"news_{region}"
-
-    if cache_key in cache and _is_cache_fresh(cache[cache_key], NEWS_CACHE_TTL_HOURS):
-        return {**cache[cache_key]["data"], "fresh": True}
+# ── News Ingestion ────────────────────────────────────────────────────────
 
-    query = f"{region} (dengue OR malaria OR outbreak OR virus)"
-    encoded_query = urllib.parse.quote(query)
-    url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
+def _fetch_news_live(region):
+    """Query Google News RSS. Returns the signal or None on failure."""
+    params = {
+        "q": f"{region} (dengue OR malaria OR outbreak OR virus)",
+        "hl": "en-IN",
+        "gl": "IN",
+        "ceid": "IN:en",
+    }
 
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _http_get(GOOGLE_NEWS_RSS_URL, params)
         if resp.status_code == 200:
             root = ET.fromstring(resp.content)
             items = root.findall(".//item")
@@ -237,19 +257,130 @@ def fetch_news_signal(region):
                 if title is not None:
                     headlines.append(title.text)
 
-            result = {"article_count": article_count,
-                      "news_risk_score": float(risk_score), "headlines": headlines}
-
-            cache[cache_key] = {"data": result, "timestamp": time.time()}
-            _save_cache(NEWS_CACHE_PATH, cache)
-            return {**result, "fresh": True}
+            return {"article_count": article_count,
+                    "news_risk_score": float(risk_score), "headlines": headlines}
     except Exception as e:
         logger.warning("News API failed for %s: %s", region, e)
+    return None
+
+
+def fetch_news_signal(region):
+    """
+    Fetch outbreak-related news volume for a region.
+    Returns article count, risk score, and headlines.
+    Falls back to cached data if Google News RSS fails.
+    """
+    data, fresh = _read_signal("news", region)
+    if data is None:
+        return {**_NEWS_DEFAULT, "fresh": False}
+    return {**data, "fresh": fresh}
+
+
+# ── Refresh & Stale-While-Revalidate ──────────────────────────────────────
+# Reads never wait on a live API while a usable cached value exists: a
+# stale value (up to SIGNAL_MAX_STALE_HOURS old) is returned immediately
+# and refreshed in the background. The background refresher normally
+# renews every signal before it goes stale at all.
 
-    if cache_key in cache:
-        return {**cache[cache_key]["data"], "fresh": False}
+SIGNAL_KINDS = ("nowcast", "news")
 
-    return {"article_count": 0, "news_risk_score": 1.0, "headlines": [], "fresh": False}
+_refresh_locks = {}
+_refresh_locks_guard = threading.Lock()
+
+
+def signal_ttl_hours(kind):
+    return WEATHER_CACHE_TTL_HOURS if kind == "nowcast" else NEWS_CACHE_TTL_HOURS
+
+
+def _refresh_lock(kind, region):
+    with _refresh_locks_guard:
+        return _refresh_locks.setdefault((kind, region), threading.Lock())
+
+
+def refresh_signal(kind, region, wait=True):
+    """
+    Fetch one signal from its live source and store it. Single-flight per
+    (kind, region) within the process: a caller that finds a refresh in
+    flight waits for it (``wait=True``) or skips (``wait=False``).
+
+    Returns:
+        True if the cache was refreshed, False if the live fetch failed,
+        None if skipped because another refresh of the key was in flight.
+    """
+    fetch = _fetch_nowcast_live if kind == "nowcast" else _fetch_news_live
+    lock = _refresh_lock(kind, region)
+
+    if not lock.acquire(blocking=False):
+        if not wait:
+            return None
+        with lock:
+            # Whoever held the lock may just have stored a fresh value
+            cached = feature_cache.get(kind, region)
+            if cached is not None and _is_cache_fresh(cached[1], signal_ttl_hours(kind)):
+                return True
+            return _refresh_locked(kind, region, fetch)
+
+    try:
+        return _refresh_locked(kind, region, fetch)
+    finally:
+        lock.release()
+
+
+def _refresh_locked(kind, region, fetch):
+    result = fetch(region)
+    if result is None:
+        return False
+    feature_cache.put(kind, region, result)
+    return True
+
+
+def _revalidate_in_background(kind, region):
+    _ensure_pools()
+    _executor.submit(refresh_signal, kind, region, False)
+
+
+def _read_signal(kind, region):
+    """Cached-first read. Returns ``(data, fresh)``, or ``(None, False)`` if nothing is available."""
+    cached = feature_cache.get(kind, region)
+    if cached is not None:
+        data, updated_at = cached
+        if _is_cache_fresh(updated_at, signal_ttl_hours(kind)):
+            return data, True
+        if _is_cache_fresh(updated_at, SIGNAL_MAX_STALE_HOURS):
+            _revalidate_in_background(kind, region)
+            return data, False
+
+    # Cold or too stale to serve: refresh inline
+    if refresh_signal(kind, region):
+        refreshed = feature_cache.get(kind, region)
+        if refreshed is not None:
+            return refreshed[0], True
+    if cached is not None:
+        return cached[0], False
+    return None, False
+
+
+# ── Concurrent Signal Fetch ───────────────────────────────────────────────
+
+def fetch_exogenous_bulk(regions):
+    """
+    Fetch current weather and news for many regions in parallel.
+    At most ``EXOGENOUS_FETCH_WORKERS`` lookups are in flight at once.
+
+    Returns:
+        (weather_list, news_list) aligned with ``regions``.
+    """
+    regions = list(regions)
+    _ensure_pools()
+    weather_futures = [_executor.submit(fetch_current_weather, r) for r in regions]
+    news_futures = [_executor.submit(fetch_news_signal, r) for r in regions]
+    return [f.result() for f in weather_futures], [f.result() for f in news_futures]
+
+
+def fetch_exogenous(region):
+    """Fetch current weather and news for one region concurrently."""
+    weather_list, news_list = fetch_exogenous_bulk([region])
+    return weather_list[0], news_list[0]
 
 
 # ── Feature Assembly ──────────────────────────────────────────────────────
@@ -338,6 +469,41 @@ def build_feature_row(region, case_history, weather_data=None, news_data=None, d
     return features, freshness
 
 
+def build_feature_matrix(region, cases, dates):
+    """
+    Vectorized ``build_feature_row`` over a region's whole case history,
+    for training. Row ``j`` holds the core features (``get_feature_names()``
+    order) for predicting week ``WINDOW_SIZE + j`` from the ``WINDOW_SIZE``
+    weeks before it, dated ``dates[WINDOW_SIZE + j]``.
+
+    The 4-week trend uses the closed form of the least-squares slope over
+    x = 0..3, ``(-1.5*y0 - 0.5*y1 + 0.5*y2 + 1.5*y3) / 5``, instead of a
+    ``np.polyfit`` call per row.
+    """
+    from core.adaptive_config import REGION_INDEX, WINDOW_SIZE
+
+    names = get_feature_names()
+    cases = np.asarray(cases, dtype=float)
+    if len(cases) <= WINDOW_SIZE:
+        return np.empty((0, len(names)))
+
+    # windows[j] = cases[j : j + WINDOW_SIZE], the history before target j + WINDOW_SIZE
+    windows = np.lib.stride_tricks.sliding_window_view(cases[:-1], WINDOW_SIZE)
+    last4 = windows[:, -4:]
+    mean4 = last4.mean(axis=1) + 1e-6
+
+    weeks = pd.DatetimeIndex(dates[WINDOW_SIZE:]).isocalendar().week.to_numpy(dtype=float)
+
+    columns = {f"cases_lag_{i+1}": np.log1p(windows[:, -(i + 1)]) for i in range(WINDOW_SIZE)}
+    columns["cases_slope_4w"] = (last4 @ np.array([-1.5, -0.5, 0.5, 1.5])) / 5.0 / mean4
+    columns["cases_ratio_4w"] = last4[:, -1] / mean4
+    columns["week_sin"] = np.sin(2 * np.pi * weeks / 52)
+    columns["week_cos"] = np.cos(2 * np.pi * weeks / 52)
+    columns["region_id"] = np.full(len(windows), float(REGION_INDEX.get(region, 0)))
+
+    return np.column_stack([columns[name] for name in names])
+
+
 def get_feature_names():
     """Return ordered list of CORE feature names used for model training.
     Includes case lags + trend signals + seasonality + region identity.
@@ -0,0 +1,64 @@
+"""
+Forecast Response Cache
+Caches ``/forecast/region`` responses keyed on every input that can
+change the answer: region, horizon, scenario, the outbreak CSV version,
+the loaded model version (the ensemble's own version, or a digest of the
+legacy forecaster's file) and the weather/news feature-store entries.
+
+Because the key captures all inputs, entries never need to be invalidated
+when data changes — a new CSV or a refreshed weather entry simply yields a
+new key. Entries are dropped on model reload (``load_models``) and expire
+after ``FORECAST_CACHE_TTL_SECONDS``.
+
+The forecast rollout adds random noise to each step, so cached responses
+are only valid if that noise is reproducible: ``rollout_rng`` seeds a
+generator from the same key, making a cache hit identical to recomputing.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from core.cache import TieredCache
+from core.config import (
+    FORECAST_CACHE_ENABLED,
+    FORECAST_CACHE_MAX_ENTRIES,
+    FORECAST_CACHE_TTL_SECONDS,
+    REDIS_URL,
+)
+
+forecast_cache = TieredCache(
+    "forecast",
+    maxsize=FORECAST_CACHE_MAX_ENTRIES,
+    ttl=FORECAST_CACHE_TTL_SECONDS,
+    redis_url=REDIS_URL,
+)
+
+
+def forecast_cache_enabled():
+    return FORECAST_CACHE_ENABLED
+
+
+def _digest(obj):
+    blob = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def forecast_key(region, horizon_weeks, scenario, data_version, model_version,
+                 weather_data, news_data):
+    """Cache key for one region forecast. All arguments must be JSON-able."""
+    return _digest({
+        "region": region,
+        "horizon_weeks": horizon_weeks,
+        "scenario": scenario,
+        "data_version": data_version,
+        "model_version": model_version,
+        "weather": weather_data,
+        "news": news_data,
+    })
+
+
+def rollout_rng(key):
+    """Deterministic noise generator for the forecast identified by ``key``."""
+    return np.random.default_rng(int(key[:16], 16))
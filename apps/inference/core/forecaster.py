@@ -0,0 +1,115 @@
+"""
+Lockstep Autoregressive Forecaster
+Advances one or many regions' case windows week by week in lockstep,
+so every horizon step scores a single R×F matrix (one call per model)
+no matter how many regions are being forecast.
+
+Used by ``/forecast/region`` (R = 1) and ``/forecast/all`` (R = every
+tracked region).
+"""
+
+import logging
+from datetime import timedelta
+
+import numpy as np
+
+from core.adaptive_config import WINDOW_SIZE
+from core.adaptive_trainer import (
+    features_to_matrix,
+    format_ensemble_predictions,
+    predict_ensemble_batch,
+)
+from core.feature_store import build_feature_row
+
+logger = logging.getLogger("foresee.forecaster")
+
+
+def rollout_ensemble(ensemble, regions, case_windows, last_dates, weather_list, news_list,
+                     horizon_weeks, rngs=None):
+    """
+    Autoregressive multi-region forecast with the adaptive ensemble.
+
+    Args:
+        regions, case_windows, last_dates, weather_list, news_list:
+            parallel per-region sequences (observed cases, last observed
+            week and live exogenous signals).
+        horizon_weeks: number of weeks to forecast.
+        rngs: optional per-region ``np.random.Generator`` for the step
+            noise, making the rollout reproducible (required for caching).
+            Defaults to the global ``np.random`` state.
+
+    Returns:
+        list (one per region) of dicts with ``predictions`` (API-shaped
+        weekly entries) plus ``first_features`` / ``first_result``, the
+        step-1 row and scores, which are reused for explainability.
+    """
+    windows = [list(w[-WINDOW_SIZE:]) for w in case_windows]
+    rollouts = [{"predictions": [], "first_features": None, "first_result": None} for _ in regions]
+
+    for i in range(horizon_weeks):
+        week_dates = [d + timedelta(weeks=i + 1) for d in last_dates]
+        rows = [
+            build_feature_row(region, window, weather, news, date=week_date)[0]
+            for region, window, weather, news, week_date
+            in zip(regions, windows, weather_list, news_list, week_dates, strict=True)
+        ]
+        # One call per ensemble member for all regions at this step
+        results = format_ensemble_predictions(
+            predict_ensemble_batch(ensemble, features_to_matrix(ensemble, rows))
+        )
+
+        for r, result in enumerate(results):
+            rollout = rollouts[r]
+            if i == 0:
+                rollout["first_features"] = rows[r]
+                rollout["first_result"] = result
+
+            rollout["predictions"].append({
+                "week": week_dates[r].strftime("%Y-%m-%d"),
+                "point": result["point"],
+                "p10": result["p10"],
+                "p50": result["p50"],
+                "p90": result["p90"],
+                "model_agreement": result["model_agreement"],
+            })
+
+            # ── Anti-reversion blending ──────────────────────────────────
+            # Raw autoregressive prediction compounds downward drift because
+            # each synthetic value is slightly lower than the previous one.
+            # Blend the point prediction 50/50 with the recent rolling mean to
+            # anchor the window and slow the collapse over many weeks.
+            window = windows[r]
+            rolling_mean = float(np.mean(window[-4:]))
+            blended_val = max(0.0, result["point"] * 0.50 + rolling_mean * 0.50)
+
+            # Add a tiny amount of noise so long forecasts don't flatten to
+            # a perfectly straight line (looks more realistic)
+            rng = rngs[r] if rngs is not None else np.random
+            noise = float(rng.normal(0, rolling_mean * 0.03))
+            blended_val = max(0.0, blended_val + noise)
+
+            window.append(blended_val)
+            windows[r] = window[-WINDOW_SIZE:]
+
+    return rollouts
+
+
+def rollout_legacy(model, case_windows, last_dates, horizon_weeks):
+    """
+    Autoregressive multi-region forecast with the v1 window forecaster
+    (log1p-scaled 8-week window -> next week). Returns one list of
+    ``{"week", "cases"}`` entries per region.
+    """
+    windows = np.array([np.asarray(w[-WINDOW_SIZE:], dtype=float) for w in case_windows])
+    rollouts = [[] for _ in case_windows]
+
+    for i in range(horizon_weeks):
+        preds = np.expm1(model.predict(np.log1p(windows)))
+        preds = np.maximum(0, np.trunc(preds)).astype(np.int64)
+
+        windows = np.concatenate([windows[:, 1:], preds[:, None]], axis=1)
+        for r, pred in enumerate(preds):
+            week_date = last_dates[r] + timedelta(weeks=i + 1)
+            rollouts[r].append({"week": week_date.strftime("%Y-%m-%d"), "cases": int(pred)})
+
+    return rollouts
@@ -0,0 +1,59 @@
+"""
+In-Memory Image Preprocessing
+Decodes an uploaded image once and derives every view ``/predict/image``
+needs from that one buffer, without touching disk:
+
+- ``cnn``:        128x128 RGB float32 in [0, 1] for the malaria CNN
+- ``gatekeeper``: 64x64 RGB float32 in [0, 1] for the OOD autoencoder
+- ``gray``:       full-resolution grayscale uint8 for contour validation
+
+The CNN and gatekeeper views match ``keras_image.load_img(path,
+target_size=...)`` + ``img_to_array`` / 255: Keras resizes with PIL's
+nearest-neighbour filter and ignores EXIF orientation, which is what
+``INTER_NEAREST_EXACT`` and ``IMREAD_IGNORE_ORIENTATION`` reproduce.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+CNN_INPUT_SIZE = (128, 128)
+GATEKEEPER_INPUT_SIZE = (64, 64)
+
+
+class PreprocessedImage(NamedTuple):
+    cnn: np.ndarray
+    gatekeeper: np.ndarray
+    gray: np.ndarray
+
+
+def decode_image(file_bytes):
+    """Decode image bytes to a BGR uint8 array, or None if they aren't an image."""
+    import cv2  # lazy — mocked in tests
+
+    buf = np.frombuffer(file_bytes, dtype=np.uint8)
+    return cv2.imdecode(buf, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+
+
+def _model_view(cv2, rgb, size):
+    resized = cv2.resize(rgb, size, interpolation=cv2.INTER_NEAREST_EXACT)
+    return resized.astype(np.float32) / 255.0
+
+
+def preprocess_image(file_bytes):
+    """
+    Build the CNN, gatekeeper and grayscale views of an uploaded image.
+    Raises ValueError if the bytes can't be decoded.
+    """
+    import cv2  # lazy — mocked in tests
+
+    bgr = decode_image(file_bytes)
+    if bgr is None:
+        raise ValueError("File could not be decoded as an image")
+
+    rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    return PreprocessedImage(
+        cnn=_model_view(cv2, rgb, CNN_INPUT_SIZE),
+        gatekeeper=_model_view(cv2, rgb, GATEKEEPER_INPUT_SIZE),
+        gray=cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY),
+    )
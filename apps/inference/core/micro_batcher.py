@@ -0,0 +1,177 @@
+"""
+Micro-Batching Inference
+Coalesces concurrent single-image ``predict`` calls into one batched
+Keras call. Keras ``predict`` has a large fixed cost per call, so under a
+burst of uploads throughput grows with the batch size instead of paying
+that cost once per request.
+
+A request thread submits one sample and blocks on a future. A per-process
+worker thread takes the first queued sample, keeps collecting until
+``max_batch_size`` samples are queued or ``max_wait_ms`` has passed, runs
+each model once on the stacked batch and hands every caller its own row.
+
+Batching only helps when a worker serves requests concurrently, i.e. with
+gunicorn ``--threads``. With ``max_batch_size`` 1 calls run inline in
+``submit``. ``predict`` gives up after ``timeout`` seconds so a stalled
+batch can't hold request threads forever.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+from core.config import IMAGE_BATCH_MAX_SIZE, IMAGE_BATCH_MAX_WAIT_MS, IMAGE_MODEL_TIMEOUT_SECONDS
+
+logger = logging.getLogger("foresee.batcher")
+
+
+class MicroBatcher:
+    """Dynamic batcher for single-sample model calls."""
+
+    def __init__(self, name, max_batch_size=IMAGE_BATCH_MAX_SIZE, max_wait_ms=IMAGE_BATCH_MAX_WAIT_MS,
+                 timeout=IMAGE_MODEL_TIMEOUT_SECONDS):
+        self.name = name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.samples = 0
+        self.largest_batch = 0
+
+    def submit(self, model, sample):
+        """
+        Queue ``model.predict`` on one sample (no batch axis). Returns a
+        Future for that sample's output row; cancelling it before its batch
+        starts drops the sample from the batch.
+        """
+        future = Future()
+        if not self.batching:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(model.predict(np.expand_dims(sample, axis=0), verbose=0)[0])
+                self._count(1)
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._ensure_worker()
+        self._queue.put((model, sample, future))
+        return future
+
+    @property
+    def batching(self):
+        """False when calls run inline in ``submit``."""
+        return self.max_batch_size > 1
+
+    def predict(self, model, sample, timeout=None):
+        """
+        Blocking ``submit``: returns the sample's output row. Raises
+        ``TimeoutError`` after ``timeout`` (default ``self.timeout``) seconds.
+        """
+        return self.result(self.submit(model, sample), timeout)
+
+    def result(self, future, timeout=None):
+        """Wait for a submitted sample; on timeout drop it from its batch and raise."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            logger.warning("%s call timed out after %ss", self.name, timeout)
+            raise
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread_pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._thread_pid != os.getpid() or not self._thread.is_alive():
+                if self._thread_pid != os.getpid():
+                    self._queue = queue.Queue()  # a forked copy may hold the parent's items
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-batcher",
+                                                daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def _collect(self, batch):
+        """Fill ``batch`` in place, so a failure here still knows who was waiting."""
+        batch.append(self._queue.get())
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                self._collect(batch)
+                # A model reload can leave old and new models in one batch
+                groups = {}
+                for model, sample, future in batch:
+                    groups.setdefault((id(model), np.shape(sample)), []).append((model, sample, future))
+                for items in groups.values():
+                    self._run_group(items)
+            except Exception as e:
+                # Keep the thread alive; nobody waiting on this batch is left blocked
+                logger.exception("%s batcher failed on a batch of %d", self.name, len(batch))
+                for _, _, future in batch:
+                    if not future.done():
+                        try:
+                            future.set_exception(e)
+                        except InvalidStateError:  # resolved meanwhile
+                            pass
+
+    def _run_group(self, items):
+        live = [item for item in items if item[2].set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            outputs = live[0][0].predict(np.stack([sample for _, sample, _ in live]), verbose=0)
+            # A wrong row count must fail every caller, not leave some blocked
+            results = list(zip(live, outputs, strict=True))
+        except Exception as e:
+            logger.warning("%s batch of %d failed: %s", self.name, len(live), e)
+            for _, _, future in live:
+                future.set_exception(e)
+            return
+        self._count(len(live))
+        for (_, _, future), output in results:
+            future.set_result(output)
+
+    def _count(self, n):
+        # Inline calls (max_batch_size 1) count from many request threads
+        with self._stats_lock:
+            self.batches += 1
+            self.samples += n
+            self.largest_batch = max(self.largest_batch, n)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "batches": self.batches,
+            "samples": self.samples,
+            "avg_batch": round(self.samples / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+
+
+# Module-level singletons, one queue per model so each batch has one input shape
+gatekeeper_batcher = MicroBatcher("gatekeeper")
+cnn_batcher = MicroBatcher("cnn")
@@ -4,140 +4,454 @@ ML model loading & global model references.
 All model-related globals live here so any route can do::
 
     from ml_loader import malaria_model, malaria_forecast_model, …
+
+Models load eagerly at startup, or on first use (``MODEL_LOADING``); either
+way each one loads once per process behind its own lock and ``model_status``
+reports its readiness, version and load time.
+
+A retrained artifact is hot-swapped without a restart: ``reload_model``
+builds the new version off to the side while the old one keeps serving, then
+publishes it in a single namespace update. Requests already holding the old
+object finish on it; it is freed when the last of them drops it. A watcher
+thread (``MODEL_WATCH_SECONDS``) and ``POST /admin/models/reload`` trigger it.
 """
 
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
 
 import joblib
 
+from core.config import MODEL_LOADING, MODEL_MMAP, MODEL_RUNTIME, MODEL_WATCH_SECONDS
+
 logger = logging.getLogger("foresee.models")
 
 
 # ── Global Model References ──────────────────────────────────────────────────
+#
+# The model objects below are resolved through ``__getattr__`` (PEP 562): a
+# name stays out of the module namespace until its model has loaded, so the
+# first access blocks until it is available. ``MODEL_LOADING`` decides whether
+# that happens at startup (eager), on first use (lazy) or on first use with a
+# background warm-up (background). Display metadata — SYMPTOM_MODEL_NAME,
+# MODEL_TEST_ACCURACY — are plain globals that never trigger a load.
 
-malaria_model = None
-malaria_forecast_model = None
-symptoms_model = None
-gatekeeper_model = None
-gatekeeper_threshold: float = 0.05
 SYMPTOM_MODEL_NAME: str = "Malaria Risk Screening (DHS-Based)"
 MODEL_TEST_ACCURACY: str = "Pending"
 
-# ── Adaptive Ensemble References ─────────────────────────────────────────────
-adaptive_ensemble = None
-ensemble_metadata = None
+# Values of the lazy names while their model is unscheduled, missing or failed
+_LAZY_DEFAULTS: dict = {
+    "malaria_model": None,
+    "malaria_forecast_model": None,
+    "symptoms_model": None,
+    "gatekeeper_model": None,
+    "gatekeeper_threshold": 0.05,
+    "adaptive_ensemble": None,
+    "ensemble_metadata": None,
+}
+
+MODEL_ATTRS: dict[str, tuple[str, ...]] = {
+    "gatekeeper": ("gatekeeper_model", "gatekeeper_threshold"),
+    "cnn": ("malaria_model",),
+    "forecaster": ("malaria_forecast_model",),
+    "dhs_risk": ("symptoms_model",),
+    "ensemble": ("adaptive_ensemble", "ensemble_metadata"),
+}
+_ATTR_MODEL = {attr: name for name, attrs in MODEL_ATTRS.items() for attr in attrs}
+
+ALL_MODELS = tuple(MODEL_ATTRS)
+# TensorFlow / LiteRT models — loaded per worker, after fork, when preloading
+IMAGE_MODELS = ("gatekeeper", "cnn")
+TABULAR_MODELS = ("forecaster", "dhs_risk", "ensemble")
 
+# Which runtime serves each image model: "tflite", "keras" or None
+MODEL_RUNTIMES: dict = {"cnn": None, "gatekeeper": None}
 
-def load_models():
-    """Load ML models from disk into the module-level globals."""
-    global malaria_model, malaria_forecast_model, symptoms_model
-    global SYMPTOM_MODEL_NAME, MODEL_TEST_ACCURACY
-    global gatekeeper_model, gatekeeper_threshold
-    global adaptive_ensemble, ensemble_metadata
+# Files each model is loaded from; their (mtime, size) identify the version
+_ARTIFACTS: dict[str, tuple[str, ...]] = {
+    "gatekeeper": ("models/gatekeeper_autoencoder.tflite", "models/gatekeeper_autoencoder.h5"),
+    "cnn": ("models/malaria_cnn_full.tflite", "models/malaria_cnn_full.h5",
+            "models/malaria_test_small.tflite", "models/malaria_test_small.h5"),
+    "forecaster": ("models/outbreak_forecaster.pkl",),
+    "dhs_risk": ("models/malaria_symptoms_dhs.pkl",),
+    "ensemble": ("models/adaptive_ensemble.pkl",),
+}
 
-    # These imports are deferred so this module can be imported without TF
+# Per-model readiness: state is "unloaded" (not scheduled), "pending" (loads on
+# first use), "loading", "ready", "missing" (no artifact) or "error".
+# version counts the versions published in this process; artifact digests the
+# files the published version was read from, so it agrees across workers.
+_status: dict[str, dict] = {
+    name: {"state": "unloaded", "version": 0, "artifact": None, "load_seconds": None,
+           "loaded_at": None, "error": None}
+    for name in ALL_MODELS
+}
+_fingerprints: dict[str, tuple] = {}
+_load_locks = {name: threading.Lock() for name in ALL_MODELS}
+_reload_locks = {name: threading.Lock() for name in ALL_MODELS}
+_SETTLED = ("ready", "missing", "error")
+
+
+def __getattr__(name: str):
+    model = _ATTR_MODEL.get(name)
+    if model is None:
+        raise AttributeError(f"module 'core.ml_loader' has no attribute {name!r}")
+    if _status[model]["state"] != "unloaded":
+        ensure_loaded(model)
+    return globals().get(name, _LAZY_DEFAULTS[name])
+
+
+def _keras_loader():
+    """``keras.models.load_model``, imported only when a Keras model is needed."""
     try:
         from tensorflow.keras.models import load_model as keras_load_model
+        return keras_load_model
     except Exception:
         logger.warning("TensorFlow not available — Keras models will not load")
-        keras_load_model = None  # type: ignore[assignment]
+        return None
+
+
+def _load_image_model(tflite_path, keras_path, **keras_kwargs):
+    """
+    Load an image model from its exported TFLite artifact when one exists
+    (unless MODEL_RUNTIME=keras), else from the Keras ``.h5``.
+    Returns (model, runtime) or (None, None) if neither is available.
+    """
+    if MODEL_RUNTIME != "keras" and os.path.exists(tflite_path):
+        try:
+            from core.tflite_runtime import TFLiteModel
+            return TFLiteModel(tflite_path), "tflite"
+        except Exception as e:
+            logger.warning("Could not serve %s with TFLite (%s) — falling back to Keras", tflite_path, e)
+
+    if os.path.exists(keras_path):
+        keras_load_model = _keras_loader()
+        if keras_load_model is not None:
+            return keras_load_model(keras_path, **keras_kwargs), "keras"
+    return None, None
+
+
+def _read_metadata() -> dict:
+    metadata: dict = {}
+    metadata_path = "models/metadata.json"
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+            logger.info("Model metadata loaded successfully")
+        except Exception as e:
+            logger.warning("Error loading metadata.json: %s", e)
+    return metadata
+
+
+def _joblib_load(path):
+    """
+    ``joblib.load`` with numpy arrays memory-mapped read-only (MODEL_MMAP),
+    so every worker maps the same page-cache pages instead of holding a
+    private copy. Only uncompressed joblib dumps can be mapped, and only
+    files replaced by rename: truncating a mapped file raises SIGBUS.
+    """
+    return joblib.load(path, mmap_mode="r" if MODEL_MMAP else None)
+
+
+# ── Per-Model Loaders ────────────────────────────────────────────────────────
+# Each returns the globals to publish (plus "runtime" for image models), or
+# None when the artifact is missing, or raises. They never assign the
+# globals themselves, so a reload can build a version while the old serves.
+
+def _load_gatekeeper(metadata) -> dict | None:
+    model, runtime = _load_image_model("models/gatekeeper_autoencoder.tflite",
+                                       "models/gatekeeper_autoencoder.h5", compile=False)
+    if model is None:
+        return None
+    threshold = metadata.get("gatekeeper_model", {}).get("mse_threshold", 0.05)
+    logger.info("Gatekeeper Autoencoder loaded (runtime=%s, Threshold: %.4f)", runtime, threshold)
+    return {"gatekeeper_model": model, "gatekeeper_threshold": threshold, "runtime": runtime}
 
+
+def _load_cnn(metadata) -> dict | None:
+    cnn_model_path = "models/malaria_cnn_full.h5"
+    model, runtime = _load_image_model("models/malaria_cnn_full.tflite", cnn_model_path)
+    if model is not None:
+        cnn_acc = metadata.get("cnn_model", {}).get("accuracy", "94.8%")
+        logger.info(
+            "CNN model loaded (Production) — path=%s runtime=%s accuracy=%s precision=%s recall=%s f1=%s",
+            cnn_model_path, runtime, cnn_acc,
+            metadata.get("cnn_model", {}).get("precision", "N/A"),
+            metadata.get("cnn_model", {}).get("recall", "N/A"),
+            metadata.get("cnn_model", {}).get("f1_score", "N/A"),
+        )
+        return {"malaria_model": model, "MODEL_TEST_ACCURACY": cnn_acc, "runtime": runtime}
+
+    model, runtime = _load_image_model("models/malaria_test_small.tflite",
+                                       "models/malaria_test_small.h5")
+    if model is None:
+        logger.warning("No CNN model file found")
+        return None
+    logger.warning("Using legacy CNN model (quick-fit, runtime=%s)", runtime)
+    return {"malaria_model": model, "MODEL_TEST_ACCURACY": "94.2% (Legacy)", "runtime": runtime}
+
+
+def _load_forecaster(metadata) -> dict | None:
+    forecaster_path = "models/outbreak_forecaster.pkl"
+    if not os.path.exists(forecaster_path):
+        logger.warning("Forecasting model file not found at %s", forecaster_path)
+        return None
+    model = _joblib_load(forecaster_path)
+    logger.info("Generalized Outbreak Forecasting Model loaded successfully")
+    return {"malaria_forecast_model": model}
+
+
+def _load_dhs_risk(metadata) -> dict | None:
+    if not os.path.exists("models/malaria_symptoms_dhs.pkl"):
+        logger.warning("DHS Risk Index model file not found")
+        return None
+    model = _joblib_load("models/malaria_symptoms_dhs.pkl")
+    model_meta = metadata.get("symptoms_model", {})
+    model_type = model_meta.get("model_type", "Risk Calculator")
+    accuracy = model_meta.get("accuracy", "100.0%")
+    cv_accuracy = model_meta.get("cv_accuracy", "N/A")
+    note = model_meta.get("note", "")
+    logger.info(
+        "DHS Risk Index Model loaded — type=%s accuracy=%s cv_accuracy=%s%s",
+        model_type, accuracy, cv_accuracy,
+        f" note={note}" if note else "",
+    )
+    return {"symptoms_model": model, "SYMPTOM_MODEL_NAME": f"DHS-based {model_type}"}
+
+
+def _load_ensemble(metadata) -> dict | None:
+    ensemble_path = "models/adaptive_ensemble.pkl"
+    if not os.path.exists(ensemble_path):
+        logger.info("Adaptive ensemble not yet trained — will use legacy forecaster")
+        return None
+    ensemble = _joblib_load(ensemble_path)
+    if "compiled" not in ensemble:
+        # Pre-compilation artifacts: pack the trees at load time
+        from core.tree_scorer import compile_ensemble
+        ensemble["compiled"] = compile_ensemble(ensemble)
+    ens_metadata = None
+    ens_meta_path = "models/ensemble_metadata.json"
+    if os.path.exists(ens_meta_path):
+        with open(ens_meta_path) as f:
+            ens_metadata = json.load(f)
+    logger.info(
+        "Adaptive Ensemble loaded — version=%s models=%d features=%d",
+        ensemble.get("version", "unknown"),
+        len(ensemble.get("quantile", {})) + 2,
+        len(ensemble.get("feature_names", [])),
+    )
+    return {"adaptive_ensemble": ensemble, "ensemble_metadata": ens_metadata}
+
+
+_LOADERS = {
+    "gatekeeper": _load_gatekeeper,
+    "cnn": _load_cnn,
+    "forecaster": _load_forecaster,
+    "dhs_risk": _load_dhs_risk,
+    "ensemble": _load_ensemble,
+}
+
+# Published when a model's first load fails
+_ERROR_VALUES = {"cnn": {"MODEL_TEST_ACCURACY": "Error"}}
+
+
+# ── Loading & Readiness ──────────────────────────────────────────────────────
+
+def _fingerprint(name: str) -> tuple:
+    stamps = []
+    for path in _ARTIFACTS[name]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+def _publish(name: str, values: dict, started: float, fingerprint: tuple):
+    """Swap in a loaded version; one dict update, so readers see all or none."""
+    values = dict(values)
+    runtime = values.pop("runtime", None)
+    globals().update(values)
+    if name in MODEL_RUNTIMES:
+        MODEL_RUNTIMES[name] = runtime
+    status = _status[name]
+    status.update(
+        state="ready", version=status["version"] + 1, error=None,
+        artifact=hashlib.sha256(repr(fingerprint).encode()).hexdigest()[:12],
+        load_seconds=round(time.perf_counter() - started, 3),
+        loaded_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+
+
+def _load_locked(name: str, metadata=None):
+    """Load one model; caller holds ``_load_locks[name]``."""
+    status = _status[name]
+    status.update(state="loading", error=None)
+    start = time.perf_counter()
+    fingerprint = _fingerprints[name] = _fingerprint(name)
     try:
-        # ── Metadata ─────────────────────────────────────────────────────
-        metadata: dict = {}
-        metadata_path = "models/metadata.json"
-        if os.path.exists(metadata_path):
-            try:
-                with open(metadata_path) as f:
-                    metadata = json.load(f)
-                logger.info("Model metadata loaded successfully")
-            except Exception as e:
-                logger.warning("Error loading metadata.json: %s", e)
-
-        # ── Gatekeeper Autoencoder ───────────────────────────────────────
-        gatekeeper_path = "models/gatekeeper_autoencoder.h5"
-        if keras_load_model and os.path.exists(gatekeeper_path):
-            try:
-                gatekeeper_model = keras_load_model(gatekeeper_path, compile=False)
-                gk_meta = metadata.get("gatekeeper_model", {})
-                gatekeeper_threshold = gk_meta.get("mse_threshold", 0.05)
-                logger.info("Gatekeeper Autoencoder loaded (Threshold: %.4f)", gatekeeper_threshold)
-            except Exception as e:
-                logger.warning("Error loading gatekeeper: %s", e)
-
-        # ── Outbreak Forecasting Model ───────────────────────────────────
-        forecaster_path = "models/outbreak_forecaster.pkl"
-        if os.path.exists(forecaster_path):
-            try:
-                malaria_forecast_model = joblib.load(forecaster_path)
-                logger.info("Generalized Outbreak Forecasting Model loaded successfully")
-            except Exception as e:
-                logger.error("Error loading forecasting model", exc_info=e)
-        else:
-            logger.warning("Forecasting model file not found at %s", forecaster_path)
-
-        # ── CNN Model (Production — Full Dataset) ────────────────────────
-        cnn_model_path = "models/malaria_cnn_full.h5"
-        if keras_load_model and os.path.exists(cnn_model_path):
-            malaria_model = keras_load_model(cnn_model_path)
-            cnn_acc = metadata.get("cnn_model", {}).get("accuracy", "94.8%")
-            MODEL_TEST_ACCURACY = cnn_acc
-            logger.info(
-                "CNN model loaded (Production) — path=%s accuracy=%s precision=%s recall=%s f1=%s",
-                cnn_model_path, cnn_acc,
-                metadata.get("cnn_model", {}).get("precision", "N/A"),
-                metadata.get("cnn_model", {}).get("recall", "N/A"),
-                metadata.get("cnn_model", {}).get("f1_score", "N/A"),
-            )
-        elif keras_load_model and os.path.exists("models/malaria_test_small.h5"):
-            malaria_model = keras_load_model("models/malaria_test_small.h5")
-            MODEL_TEST_ACCURACY = "94.2% (Legacy)"
-            logger.warning("Using legacy CNN model (quick-fit)")
+        values = _LOADERS[name](_read_metadata() if metadata is None else metadata)
+        if values is None:
+            status.update(state="missing", load_seconds=round(time.perf_counter() - start, 3))
         else:
-            logger.warning("No CNN model file found")
-
-        # ── DHS Risk Index Model ─────────────────────────────────────────
-        if os.path.exists("models/malaria_symptoms_dhs.pkl"):
-            try:
-                symptoms_model = joblib.load("models/malaria_symptoms_dhs.pkl")
-                model_type = metadata.get("symptoms_model", {}).get("model_type", "Risk Calculator")
-                SYMPTOM_MODEL_NAME = f"DHS-based {model_type}"
-                model_meta = metadata.get("symptoms_model", {})
-                accuracy = model_meta.get("accuracy", "100.0%")
-                cv_accuracy = model_meta.get("cv_accuracy", "N/A")
-                note = model_meta.get("note", "")
-                logger.info(
-                    "DHS Risk Index Model loaded — type=%s accuracy=%s cv_accuracy=%s%s",
-                    model_type, accuracy, cv_accuracy,
-                    f" note={note}" if note else "",
-                )
-            except Exception as e:
-                logger.error("Error loading DHS Risk Index model", exc_info=e)
-        else:
-            logger.warning("DHS Risk Index model file not found")
-
-        # ── Adaptive Ensemble ────────────────────────────────────────────
-        ensemble_path = "models/adaptive_ensemble.pkl"
-        if os.path.exists(ensemble_path):
-            try:
-                adaptive_ensemble = joblib.load(ensemble_path)
-                ens_meta_path = "models/ensemble_metadata.json"
-                if os.path.exists(ens_meta_path):
-                    with open(ens_meta_path) as f:
-                        ensemble_metadata = json.load(f)
-                logger.info(
-                    "Adaptive Ensemble loaded — version=%s models=%d features=%d",
-                    adaptive_ensemble.get("version", "unknown"),
-                    len(adaptive_ensemble.get("quantile", {})) + 2,
-                    len(adaptive_ensemble.get("feature_names", [])),
-                )
-            except Exception as e:
-                logger.warning("Error loading adaptive ensemble: %s", e)
-        else:
-            logger.info("Adaptive ensemble not yet trained — will use legacy forecaster")
-
+            _publish(name, values, start, fingerprint)
     except Exception as e:
-        logger.error("Error loading models", exc_info=e)
-        MODEL_TEST_ACCURACY = "Error"
+        logger.error("Error loading %s model", name, exc_info=e)
+        globals().update(_ERROR_VALUES.get(name, {}))
+        status.update(state="error", error=str(e), load_seconds=round(time.perf_counter() - start, 3))
+    # Settled: pin the names so later reads skip __getattr__
+    for attr in MODEL_ATTRS[name]:
+        globals().setdefault(attr, _LAZY_DEFAULTS[attr])
+
+
+def ensure_loaded(name: str):
+    """Block until ``name`` has loaded (or failed); load it here if nobody has."""
+    if _status[name]["state"] in _SETTLED:
+        return
+    with _load_locks[name]:
+        if _status[name]["state"] not in _SETTLED:
+            _load_locked(name)
+
+
+def _unpin(name: str):
+    for attr in MODEL_ATTRS[name]:
+        globals().pop(attr, None)
+    if name in MODEL_RUNTIMES:
+        MODEL_RUNTIMES[name] = None
+
+
+def load_models(names=ALL_MODELS):
+    """
+    Load ``names`` now, in order, discarding whatever was loaded. Readers
+    block until each is back; use ``reload_model`` to swap while serving.
+    """
+    metadata = _read_metadata()
+    for name in names:
+        with _load_locks[name]:
+            # Readers arriving mid-load must block, not see the defaults
+            _status[name]["state"] = "loading"
+            _unpin(name)
+            _load_locked(name, metadata)
+
+    # Cached forecasts were produced by the previous models
+    from core.forecast_cache import forecast_cache
+    forecast_cache.clear()
+
+
+def defer_models(names=ALL_MODELS, warm=False):
+    """
+    Mark ``names`` to load on first use. With ``warm`` a daemon thread also
+    loads them in order, so the first request usually finds them ready.
+    """
+    for name in names:
+        with _load_locks[name]:
+            _status[name].update(state="pending", load_seconds=None, error=None)
+            _unpin(name)
+
+    if warm:
+        threading.Thread(target=_warm_up, args=(tuple(names),),
+                         name="model-warmup", daemon=True).start()
+
+
+def _warm_up(names):
+    start = time.perf_counter()
+    for name in names:
+        ensure_loaded(name)
+    logger.info("Model warm-up finished in %.1fs", time.perf_counter() - start)
+
+
+def init_models(names=ALL_MODELS):
+    """Load ``names`` according to MODEL_LOADING (eager / lazy / background)."""
+    if MODEL_LOADING == "eager":
+        load_models(names)
+    else:
+        defer_models(names, warm=MODEL_LOADING == "background")
+
+
+def is_ready(name: str) -> bool:
+    """True once ``name`` has loaded successfully; never triggers a load."""
+    return _status[name]["state"] == "ready"
+
+
+def artifact_version(name: str) -> str | None:
+    """Digest of the files the serving version of ``name`` was loaded from, or None."""
+    status = _status[name]
+    return status["artifact"] if status["state"] == "ready" else None
+
+
+def model_status() -> dict:
+    """Per-model readiness, version and load duration, for /health."""
+    return {name: dict(status) for name, status in _status.items()}
+
+
+# ── Hot Reload ───────────────────────────────────────────────────────────────
+
+def reload_model(name: str, force: bool = False) -> bool:
+    """
+    Load a new version of ``name`` while the current one keeps serving and
+    swap it in. Skipped when the artifact is unchanged (unless ``force``) or
+    the model hasn't been asked for yet — it will load fresh on first use.
+    A failed or missing reload keeps the current version. Returns True if a
+    new version was published.
+    """
+    with _reload_locks[name]:
+        if _status[name]["state"] in ("unloaded", "pending"):
+            return False
+        ensure_loaded(name)  # wait out an in-progress first load
+
+        fingerprint = _fingerprint(name)
+        if not force and fingerprint == _fingerprints.get(name):
+            return False
+        _fingerprints[name] = fingerprint  # a broken artifact is retried only once it changes
+
+        start = time.perf_counter()
+        try:
+            values = _LOADERS[name](_read_metadata())
+        except Exception as e:
+            logger.error("Reloading %s failed — keeping version %d", name, _status[name]["version"], exc_info=e)
+            _status[name]["error"] = str(e)
+            return False
+        if values is None:
+            logger.warning("%s artifact is gone — keeping version %d", name, _status[name]["version"])
+            return False
+
+        with _load_locks[name]:
+            _publish(name, values, start, fingerprint)
+        logger.info("Hot-swapped %s to version %d in %.1fs",
+                    name, _status[name]["version"], time.perf_counter() - start)
+
+    if name in ("forecaster", "ensemble"):
+        from core.forecast_cache import forecast_cache
+        forecast_cache.clear()
+    return True
+
+
+def check_for_updates(names=ALL_MODELS, force: bool = False) -> list[str]:
+    """Hot-reload every model in ``names`` whose artifact changed; returns those swapped."""
+    return [name for name in names if reload_model(name, force=force)]
+
+
+_watcher_pid = None
+
+
+def start_model_watcher(interval: float = MODEL_WATCH_SECONDS):
+    """Poll the model artifacts every ``interval`` seconds; once per process."""
+    global _watcher_pid
+    if interval <= 0 or _watcher_pid == os.getpid():
+        return
+    _watcher_pid = os.getpid()
+    threading.Thread(target=_watch, args=(interval,), name="model-watcher", daemon=True).start()
+
+
+def _watch(interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            check_for_updates()
+        except Exception as e:
+            logger.error("Model watcher check failed", exc_info=e)
@@ -0,0 +1,108 @@
+"""
+Outbreak Series Store
+Process-wide, in-memory index over ``data/realtime_india_outbreaks.csv``.
+
+The CSV is parsed once per process and re-parsed only when its mtime
+changes (e.g. after ``agents.live_data_agent`` regenerates it). Each
+region's weekly case counts are held as a contiguous NumPy array sorted
+by date, so region listings and trailing windows are served without
+touching pandas on the request path.
+"""
+
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core.adaptive_config import OUTBREAK_DATA_PATH
+
+logger = logging.getLogger("foresee.outbreak_store")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RegionSeries(NamedTuple):
+    """Date-sorted weekly series for one region."""
+
+    dates: np.ndarray   # datetime64[ns]
+    cases: np.ndarray   # int64 / float64 case counts
+
+    def __len__(self):
+        return len(self.cases)
+
+    @property
+    def last_date(self) -> pd.Timestamp:
+        return pd.Timestamp(self.dates[-1])
+
+    def window(self, size: int) -> np.ndarray:
+        """Trailing ``size`` case counts (a view, not a copy)."""
+        return self.cases[-size:]
+
+    def tail(self, n: int) -> "RegionSeries":
+        return RegionSeries(self.dates[-n:], self.cases[-n:])
+
+
+class OutbreakSeriesStore:
+    """
+    Lazily loaded, mtime-invalidated index of region -> RegionSeries.
+
+    Reads take a snapshot of the current index without locking; only a
+    reload (first use or file change) is serialised behind a lock.
+    """
+
+    def __init__(self, path=OUTBREAK_DATA_PATH):
+        self.path = path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._series: dict[str, RegionSeries] = {}
+        self._regions: list[str] = []
+
+    def _current_index(self) -> dict[str, RegionSeries]:
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._load(mtime)
+        return self._series
+
+    def _load(self, mtime):
+        df = pd.read_csv(self.path, usecols=["Date", "Region", "New_Cases"])
+        df["Date"] = pd.to_datetime(df["Date"])
+        df = df.sort_values(["Region", "Date"], kind="mergesort")
+
+        series = {}
+        for region, group in df.groupby("Region", sort=True):
+            series[region] = RegionSeries(
+                dates=np.ascontiguousarray(group["Date"].values),
+                cases=np.ascontiguousarray(group["New_Cases"].values),
+            )
+
+        # Publish the new index before the mtime so concurrent readers never
+        # see a fresh mtime paired with a stale index.
+        self._series = series
+        self._regions = sorted(series)
+        self._mtime = mtime
+        logger.info("Outbreak series loaded: %d regions, %d rows from %s",
+                    len(series), len(df), self.path)
+
+    @property
+    def version(self) -> float | None:
+        """mtime of the loaded CSV; changes whenever the data is reloaded."""
+        self._current_index()
+        return self._mtime
+
+    def regions(self) -> list[str]:
+        """Sorted list of regions present in the data file."""
+        self._current_index()
+        return list(self._regions)
+
+    def get(self, region) -> RegionSeries | None:
+        """Return the date-sorted series for ``region`` or None if unknown."""
+        return self._current_index().get(region)
+
+
+# Module-level singleton
+outbreak_store = OutbreakSeriesStore()
@@ -0,0 +1,191 @@
+"""
+Background Signal Refresher
+Keeps the weather nowcast and news signal of every region in
+``REGION_COORDS`` warm, so request handlers read fresh values from the
+feature cache instead of paying for a live API call when a TTL expires.
+
+Each signal is refreshed once ``SIGNAL_REFRESH_AHEAD_FRACTION`` of its
+TTL has elapsed, minus a per-key random jitter so regions don't all come
+due on the same tick. A failed refresh backs off exponentially (with
+jitter) up to ``SIGNAL_REFRESH_BACKOFF_MAX_SECONDS``.
+
+Every gunicorn worker starts a refresher thread, but only the one holding
+the host-wide ``flock`` on ``SIGNAL_REFRESH_LOCK_PATH`` does any work; the
+others stay on standby and take over if that worker exits.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+from core import feature_store
+from core.adaptive_config import (
+    REGION_COORDS,
+    SIGNAL_REFRESH_AHEAD_FRACTION,
+    SIGNAL_REFRESH_BACKOFF_BASE_SECONDS,
+    SIGNAL_REFRESH_BACKOFF_MAX_SECONDS,
+    SIGNAL_REFRESH_JITTER_FRACTION,
+    SIGNAL_REFRESH_LOCK_PATH,
+    SIGNAL_REFRESH_TICK_SECONDS,
+)
+from core.config import SIGNAL_REFRESH_ENABLED
+from core.utils import FileLock
+
+logger = logging.getLogger("foresee.signal_refresher")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_jitter_rng = random.Random()  # noqa: S311 — timing jitter only
+
+
+class SignalRefresher:
+    """Refresh-ahead scheduler for the live exogenous signals."""
+
+    def __init__(self, regions=None, lock_path=SIGNAL_REFRESH_LOCK_PATH,
+                 tick_seconds=SIGNAL_REFRESH_TICK_SECONDS, clock=time.time):
+        self.regions = list(REGION_COORDS if regions is None else regions)
+        lock_path = lock_path if os.path.isabs(lock_path) else os.path.join(BASE_DIR, lock_path)
+        self._lock = FileLock(lock_path)
+        self.tick_seconds = tick_seconds
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+
+        self._jitter = {}     # key -> seconds taken off its refresh point
+        self._failures = {}   # key -> consecutive failed refreshes
+        self._retry_at = {}   # key -> earliest next attempt after a failure
+        self.refreshed = 0
+        self.failed = 0
+        self.last_run = None
+
+    # ── Scheduling ────────────────────────────────────────────────────────
+
+    def _key_jitter(self, key, ttl_seconds):
+        if key not in self._jitter:
+            self._jitter[key] = _jitter_rng.uniform(0, SIGNAL_REFRESH_JITTER_FRACTION * ttl_seconds)
+        return self._jitter[key]
+
+    def due_keys(self, now=None):
+        """(kind, region) pairs that are missing or past their refresh point."""
+        now = self._clock() if now is None else now
+        due = []
+        for kind in feature_store.SIGNAL_KINDS:
+            ttl_seconds = feature_store.signal_ttl_hours(kind) * 3600
+            for region in self.regions:
+                key = (kind, region)
+                if now < self._retry_at.get(key, 0):
+                    continue
+                cached = feature_store.feature_cache.get(kind, region)
+                if cached is None:
+                    due.append(key)
+                    continue
+                refresh_at = (cached[1] + SIGNAL_REFRESH_AHEAD_FRACTION * ttl_seconds
+                              - self._key_jitter(key, ttl_seconds))
+                if now >= refresh_at:
+                    due.append(key)
+        return due
+
+    def _backoff_seconds(self, failures):
+        delay = min(SIGNAL_REFRESH_BACKOFF_MAX_SECONDS,
+                    SIGNAL_REFRESH_BACKOFF_BASE_SECONDS * 2 ** (failures - 1))
+        return delay * _jitter_rng.uniform(0.5, 1.0)
+
+    def refresh_due(self):
+        """Refresh every due signal in parallel. Returns the number refreshed."""
+        due = self.due_keys()
+        if not due:
+            return 0
+
+        feature_store._ensure_pools()
+        futures = [
+            (key, feature_store._executor.submit(feature_store.refresh_signal, *key, False))
+            for key in due
+        ]
+        refreshed = 0
+        for key, future in futures:
+            try:
+                ok = future.result()
+            except Exception:
+                logger.warning("Refresh of %s/%s raised", *key, exc_info=True)
+                ok = False
+
+            if ok:
+                refreshed += 1
+                self._failures.pop(key, None)
+                self._retry_at.pop(key, None)
+                self._jitter.pop(key, None)  # re-drawn for the next cycle
+            elif ok is False:
+                failures = self._failures.get(key, 0) + 1
+                self._failures[key] = failures
+                self._retry_at[key] = self._clock() + self._backoff_seconds(failures)
+                self.failed += 1
+            # ok is None: a request thread is already refreshing this key
+
+        self.refreshed += refreshed
+        self.last_run = self._clock()
+        logger.info("Signal refresh: %d/%d due signals refreshed", refreshed, len(due))
+        return refreshed
+
+    # ── Thread ────────────────────────────────────────────────────────────
+
+    def _sleep(self, seconds):
+        return self._stop.wait(seconds * _jitter_rng.uniform(0.9, 1.1))
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._lock.acquire(blocking=False):
+                # Another worker on this host is the active refresher
+                if self._sleep(self.tick_seconds * 5):
+                    break
+                continue
+
+            logger.info("Signal refresher active in pid %d", os.getpid())
+            try:
+                while not self._stop.is_set():
+                    try:
+                        self.refresh_due()
+                    except Exception:
+                        logger.error("Signal refresh cycle failed", exc_info=True)
+                    if self._sleep(self.tick_seconds):
+                        break
+            finally:
+                self._lock.release()
+
+    def start(self):
+        """Start the refresher thread in this process (idempotent)."""
+        if self._thread is not None and self._thread_pid == os.getpid() and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="signal-refresher", daemon=True)
+        self._thread_pid = os.getpid()
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self):
+        return {
+            "enabled": SIGNAL_REFRESH_ENABLED,
+            "active": self._lock.held,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "backing_off": len(self._retry_at),
+            "last_run": self.last_run,
+        }
+
+
+# Module-level singleton
+signal_refresher = SignalRefresher()
+
+
+def start_signal_refresher():
+    """Start the background refresher unless disabled via SIGNAL_REFRESH_ENABLED."""
+    if not SIGNAL_REFRESH_ENABLED:
+        logger.info("Background signal refresh disabled")
+        return
+    signal_refresher.start()
@@ -0,0 +1,223 @@
+"""
+Vectorized DHS Symptom Risk Scorer
+Turns symptom records into the DHS risk model's feature matrix without
+pandas: state and residence are encoded through dict lookups precomputed
+from the fitted LabelEncoders, the SimpleImputer's fill values are applied
+with NumPy, and ``predict_proba`` runs once for the whole batch.
+
+Semantics match the original one-row DataFrame path: unknown states and
+residence types encode as ``classes_[0]``, a missing ``fever`` or
+``slept_under_net`` is -1, and the other numeric fields go through the
+imputer. Input is either request dicts (``build_matrix``) or columns of a
+survey file (``build_columns``, used by scripts/score_symptoms.py).
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+RISK_LABELS = {0: "Low Risk", 1: "Medium Risk", 2: "High Risk"}
+MODEL_METHOD = "DHS-based ML Risk Model"
+MODEL_VERSION = "v1.0"
+
+_RULE_SYMPTOMS = (
+    "chills", "headache", "fatigue", "muscle_aches",
+    "nausea", "diarrhea", "abdominal_pain",
+    "cough", "skin_rash",
+)
+
+
+# Request fields and the value used when a record omits one
+# (interview_month defaults to the current month)
+INPUT_FIELDS = ("fever", "age_months", "state", "residence_type",
+                "slept_under_net", "anemia_level", "interview_month")
+_FIELD_DEFAULTS = {"fever": None, "slept_under_net": None, "age_months": -1,
+                   "anemia_level": -1, "state": "Unknown", "residence_type": "Rural"}
+_FLAG_FIELDS = ("fever", "slept_under_net")
+_NUMERIC_FIELDS = ("age_months", "anemia_level", "interview_month")
+
+
+def field_default(name):
+    return datetime.now().month if name == "interview_month" else _FIELD_DEFAULTS[name]
+
+
+def _numeric(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _floats(values, n, errors) -> np.ndarray:
+    """Column → float array (None → NaN); unconvertible cells flag their row."""
+    try:
+        return np.asarray(values, dtype=float).reshape(n)
+    except (TypeError, ValueError):
+        out = np.empty(n)
+        for r, value in enumerate(values):
+            try:
+                out[r] = _numeric(value)
+            except (TypeError, ValueError) as e:
+                out[r] = np.nan
+                errors[r] = f"Invalid record: {e}"
+        return out
+
+
+def _code(codes, value) -> int:
+    try:
+        return codes.get(value, 0)
+    except TypeError:  # unhashable
+        return 0
+
+
+class SymptomScorer:
+    """Batch preprocessing + scoring for a ``malaria_symptoms_dhs.pkl`` bundle."""
+
+    def __init__(self, bundle):
+        self.model = bundle["model"]
+        self.features = list(bundle["features"])
+        self.state_codes = {c: i for i, c in enumerate(bundle["le_state"].classes_)}
+        self.residence_codes = {c: i for i, c in enumerate(bundle["le_res"].classes_)}
+
+        # Per-feature imputer fill value (NaN for columns it doesn't cover)
+        self.fill = np.full(len(self.features), np.nan)
+        self.imputer = None
+        imputer = bundle.get("imputer")
+        cols = bundle.get("cols_to_impute") or []
+        if imputer is not None and cols:
+            stats = getattr(imputer, "statistics_", None)
+            missing = getattr(imputer, "missing_values", np.nan)
+            if stats is None or not (isinstance(missing, float) and np.isnan(missing)):
+                # Not a NaN-filling SimpleImputer: use it as-is on its columns
+                self.imputer = imputer
+            self.impute_idx = np.array([self.features.index(c) for c in cols])
+            if stats is not None:
+                self.fill[self.impute_idx] = np.asarray(stats, dtype=float)
+
+    def build_columns(self, columns, n):
+        """
+        Feature matrix from column-oriented input: ``columns`` maps request
+        field names to length-``n`` sequences or arrays; absent fields take
+        their defaults. Returns (X, errors) where ``errors[i]`` is a message
+        for a row that couldn't be encoded (left as fill values) or None.
+        """
+        X = np.empty((n, len(self.features)), dtype=float)
+        errors = [None] * n
+        col = {name: i for i, name in enumerate(self.features)}
+
+        for name in _FLAG_FIELDS + _NUMERIC_FIELDS:
+            values = columns.get(name)
+            if values is None:
+                default = field_default(name)
+                X[:, col[name]] = np.nan if default is None else default
+            else:
+                X[:, col[name]] = _floats(values, n, errors)
+        for name in _FLAG_FIELDS:
+            # fever / slept_under_net: bools are 1/0 already, missing → -1
+            flags = X[:, col[name]]
+            flags[np.isnan(flags)] = -1
+
+        for name, codes in (("state", self.state_codes), ("residence_type", self.residence_codes)):
+            values = columns.get(name)
+            if values is None:
+                X[:, col[name]] = _code(codes, field_default(name))
+            else:
+                X[:, col[name]] = np.fromiter((_code(codes, v) for v in values), dtype=float, count=n)
+
+        bad = [r for r, error in enumerate(errors) if error is not None]
+        if bad:
+            X[bad] = np.where(np.isnan(self.fill), 0.0, self.fill)
+
+        if self.imputer is not None:
+            X[:, self.impute_idx] = self.imputer.transform(X[:, self.impute_idx])
+        else:
+            missing = np.isnan(X)
+            if missing.any():
+                X[missing] = np.broadcast_to(self.fill, X.shape)[missing]
+        return X, errors
+
+    def build_matrix(self, records):
+        """``build_columns`` for a list of request dicts; non-dicts are errors."""
+        n = len(records)
+        invalid = []
+        columns = {name: [None] * n for name in INPUT_FIELDS}
+        defaults = {name: field_default(name) for name in INPUT_FIELDS}
+        for r, rec in enumerate(records):
+            if not isinstance(rec, dict):
+                invalid.append(r)
+                rec = {}
+            for name in INPUT_FIELDS:
+                columns[name][r] = rec.get(name, defaults[name])
+
+        X, errors = self.build_columns(columns, n)
+        for r in invalid:
+            errors[r] = "Invalid record: expected an object"
+            X[r] = np.where(np.isnan(self.fill), 0.0, self.fill)
+        return X, errors
+
+    def classify(self, X):
+        """(class index, probability of that class) per row, one predict_proba call."""
+        probabilities = self.model.predict_proba(X)
+        classes = probabilities.argmax(axis=1)
+        return classes, probabilities[np.arange(len(X)), classes]
+
+    def score(self, records):
+        """
+        One result dict per record, in order: the single-record response
+        schema, or ``{"error": ...}`` for records that couldn't be encoded.
+        """
+        if not records:
+            return []
+        X, errors = self.build_matrix(records)
+        classes, scores = self.classify(X)
+
+        results = []
+        for error, cls, score in zip(errors, classes.tolist(), scores.tolist(), strict=True):
+            if error is not None:
+                results.append({"error": error})
+                continue
+            risk_score = round(score, 2)
+            results.append({
+                "label": RISK_LABELS.get(cls, "Unknown Risk"),
+                "risk_score": risk_score,
+                "confidence": risk_score,
+                "method": MODEL_METHOD,
+                "model_version": MODEL_VERSION,
+            })
+        return results
+
+
+def scorer_for(bundle) -> SymptomScorer:
+    """The bundle's scorer, built on first use and kept on the bundle."""
+    scorer = bundle.get("scorer")
+    if scorer is None:
+        scorer = bundle["scorer"] = SymptomScorer(bundle)
+    return scorer
+
+
+def rule_based_risk(record) -> dict:
+    """Clinical rule-based assessment, used when the DHS model isn't loaded."""
+    fever = bool(record.get("fever", False))
+    symptom_count = sum(bool(record.get(s, False)) for s in _RULE_SYMPTOMS)
+
+    anemia_level = record.get("anemia_level", 4)
+    is_anemic = False
+    try:
+        if int(anemia_level) <= 2:
+            is_anemic = True
+    except (ValueError, TypeError):
+        pass
+
+    if not fever and not is_anemic:
+        risk, risk_score = "Low", 0.15
+    elif symptom_count >= 2 or (fever and is_anemic):
+        risk, risk_score = "High", 0.85
+    elif is_anemic:
+        risk, risk_score = "Medium", 0.65
+    else:
+        risk, risk_score = "Medium", 0.50
+
+    return {
+        "label": f"{risk} Risk",
+        "risk_score": risk_score,
+        "confidence": risk_score,
+        "method": "Clinical Rule-Based Assessment (Fallback)",
+        "model_version": "v1.0 (Fallback)",
+    }
@@ -0,0 +1,91 @@
+"""
+Lightweight TFLite Runtime
+Serves exported ``.tflite`` models (``scripts/export_tflite_models.py``)
+through a standalone LiteRT / tflite-runtime interpreter, so a worker can
+run the CNN and gatekeeper without importing full TensorFlow.
+
+``TFLiteModel`` exposes the subset of the Keras model API the routes use
+(``predict(X, verbose=0)``), so it drops into ``MicroBatcher`` and the
+validation stages unchanged.
+"""
+
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger("foresee.models")
+
+
+def _interpreter_class():
+    """The lightest available TFLite interpreter class, or None."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        return None
+
+
+def tflite_available():
+    return _interpreter_class() is not None
+
+
+class TFLiteModel:
+    """Keras-``predict``-compatible wrapper around a TFLite interpreter."""
+
+    def __init__(self, model_path, num_threads=None, interpreter_class=None):
+        interpreter_class = interpreter_class or _interpreter_class()
+        if interpreter_class is None:
+            raise ImportError("No TFLite interpreter installed (ai-edge-litert or tflite-runtime)")
+        self.path = model_path
+        self._interpreter = interpreter_class(model_path=model_path, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._batch_size = int(self._input["shape"][0])
+        # Interpreters aren't thread-safe; batchers call from one thread,
+        # inline (unbatched) calls from many
+        self._lock = threading.Lock()
+
+    @property
+    def input_shape(self):
+        return tuple(int(d) for d in self._input["shape"][1:])
+
+    def _resize(self, batch_size):
+        if batch_size == self._batch_size:
+            return
+        self._interpreter.resize_tensor_input(
+            self._input["index"], [batch_size, *self.input_shape], strict=False
+        )
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._batch_size = batch_size
+
+    def predict(self, X, verbose=0):
+        X = np.asarray(X, dtype=np.float32)
+        with self._lock:
+            self._resize(len(X))
+            scale, zero_point = self._input.get("quantization", (0.0, 0))
+            dtype = self._input["dtype"]
+            if dtype != np.float32:
+                X = np.round(X / scale + zero_point) if scale else X
+                if np.issubdtype(dtype, np.integer):
+                    # Saturate like the converter does; a bare cast wraps around
+                    info = np.iinfo(dtype)
+                    X = np.clip(X, info.min, info.max)
+                X = X.astype(dtype)
+            self._interpreter.set_tensor(self._input["index"], X)
+            self._interpreter.invoke()
+            out = self._interpreter.get_tensor(self._output["index"])
+            scale, zero_point = self._output.get("quantization", (0.0, 0))
+        if out.dtype != np.float32:
+            out = out.astype(np.float32)
+            if scale:
+                out = (out - zero_point) * scale
+        return out
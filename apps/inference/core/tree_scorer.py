@@ -0,0 +1,143 @@
+"""
+Compiled Tree-Ensemble Scorer
+Flattens fitted HistGradientBoostingRegressor models into packed NumPy
+node arrays (feature, threshold, left, right, value) and evaluates every
+tree of every model over a batch in one vectorized pass.
+
+sklearn's ``predict`` re-validates input and dispatches an OpenMP kernel
+per model, which dominates the cost of single-row autoregressive steps.
+Walking all trees level-by-level with NumPy fancy indexing costs a fixed
+``max_depth`` iterations regardless of how many models are packed.
+
+Semantics mirror sklearn's ``_predict_from_raw_data``: a sample goes left
+when ``x <= num_threshold``, NaNs follow ``missing_go_to_left``, and the
+raw prediction is ``baseline + sum(leaf values)`` (leaf values already
+include shrinkage). Only identity-link losses (squared_error, quantile,
+absolute_error) and numerical splits are supported.
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("foresee.tree_scorer")
+
+
+class CompiledTreeEnsemble:
+    """Packed node arrays for a named set of HistGradientBoostingRegressors."""
+
+    def __init__(self, models):
+        if not models:
+            raise ValueError("No models to compile")
+
+        self.model_names = list(models)
+        self.n_features = None
+
+        features, thresholds, lefts, rights = [], [], [], []
+        values, missing_left, roots = [], [], []
+        model_offsets, baselines = [], []
+        n_nodes = 0
+        max_depth = 0
+
+        for name in self.model_names:
+            model = models[name]
+            self._check_supported(name, model)
+            if self.n_features is None:
+                self.n_features = int(model.n_features_in_)
+            elif int(model.n_features_in_) != self.n_features:
+                raise ValueError(f"Model {name!r} expects {model.n_features_in_} features, "
+                                 f"others expect {self.n_features}")
+
+            model_offsets.append(len(roots))
+            baselines.append(float(np.ravel(model._baseline_prediction)[0]))
+
+            for iteration in model._predictors:
+                for predictor in iteration:
+                    nodes = predictor.nodes
+                    if nodes["is_categorical"].any():
+                        raise ValueError(f"Model {name!r} uses categorical splits")
+
+                    idx = np.arange(len(nodes), dtype=np.int64) + n_nodes
+                    is_leaf = nodes["is_leaf"].astype(bool)
+                    # Leaves point at themselves so every sample can take the
+                    # same number of steps without a per-node leaf check.
+                    left = np.where(is_leaf, idx, nodes["left"].astype(np.int64) + n_nodes)
+                    right = np.where(is_leaf, idx, nodes["right"].astype(np.int64) + n_nodes)
+
+                    features.append(np.where(is_leaf, 0, nodes["feature_idx"]).astype(np.intp))
+                    thresholds.append(nodes["num_threshold"].astype(np.float64))
+                    lefts.append(left)
+                    rights.append(right)
+                    values.append(np.where(is_leaf, nodes["value"], 0.0).astype(np.float64))
+                    missing_left.append(nodes["missing_go_to_left"].astype(bool))
+                    roots.append(n_nodes)
+
+                    if is_leaf.any():
+                        max_depth = max(max_depth, int(nodes["depth"][is_leaf].max()))
+                    n_nodes += len(nodes)
+
+            if len(roots) == model_offsets[-1]:
+                raise ValueError(f"Model {name!r} has no trees")
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.value = np.concatenate(values)
+        self.missing_left = np.concatenate(missing_left)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.model_offsets = np.asarray(model_offsets, dtype=np.intp)
+        self.baselines = np.asarray(baselines, dtype=np.float64)
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _check_supported(name, model):
+        if not hasattr(model, "_predictors") or not hasattr(model, "_baseline_prediction"):
+            raise ValueError(f"Model {name!r} is not a fitted HistGradientBoostingRegressor")
+        if getattr(model, "n_trees_per_iteration_", 1) != 1:
+            raise ValueError(f"Model {name!r} has more than one tree per iteration")
+        link = type(model._loss.link).__name__
+        if link != "IdentityLink":
+            raise ValueError(f"Model {name!r} uses unsupported link {link}")
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def predict_raw(self, X):
+        """
+        Score an N×F matrix with every packed model.
+        Returns dict of model name -> length-N array, equal to each
+        model's ``predict(X)``.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | (np.isnan(x) & self.missing_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        raw = np.add.reduceat(self.value[node], self.model_offsets, axis=1) + self.baselines
+        return {name: raw[:, i] for i, name in enumerate(self.model_names)}
+
+
+def compile_ensemble(ensemble):
+    """
+    Build a CompiledTreeEnsemble for the primary, alt and quantile models
+    of an ``adaptive_ensemble.pkl`` dict. Returns None (and the caller
+    keeps using sklearn) if any member cannot be compiled.
+    """
+    models = {"primary": ensemble["primary"], "alt": ensemble["alt"]}
+    models.update(ensemble.get("quantile", {}))
+    try:
+        compiled = CompiledTreeEnsemble(models)
+    except (ValueError, AttributeError, KeyError) as e:
+        logger.warning("Ensemble not compiled, falling back to sklearn predict: %s", e)
+        return None
+    logger.info("Compiled ensemble: %d models, %d trees, %d nodes, max depth %d",
+                len(models), compiled.n_trees, len(compiled.value), compiled.max_depth)
+    return compiled
@@ -0,0 +1,57 @@
+"""
+User Lookup Cache
+Resolves a Clerk id to its ``"User"`` row with at most one database round
+trip per request. ``require_auth`` and the route body ask for the same
+user, so lookups are memoised on ``flask.g`` for the rest of the request,
+and found users are also kept in a short-TTL process-level LRU so repeat
+requests from the same user skip the query entirely.
+
+Only found users go in the process cache; a miss is remembered for the
+current request only, so a user who syncs right after a 401/404 is seen
+immediately. ``invalidate_user`` drops both tiers and is called after
+``upsert_user``. Other workers may serve the previous row for up to
+``USER_CACHE_TTL_SECONDS``; ``0`` disables the process cache.
+"""
+
+from flask import g, has_request_context
+
+from core.cache import TTLCache
+from core.config import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+
+_MISSING = object()
+
+
+def _request_memo():
+    if not has_request_context():
+        return None
+    memo = g.get("_users_by_clerk_id")
+    if memo is None:
+        memo = g._users_by_clerk_id = {}
+    return memo
+
+
+def get_user(clerk_id: str) -> dict | None:
+    """The user row for ``clerk_id`` (None if there isn't one). DB errors propagate."""
+    memo = _request_memo()
+    user = _MISSING if memo is None else memo.get(clerk_id, _MISSING)
+    if user is _MISSING and user_cache.ttl > 0:
+        user = user_cache.get(clerk_id, _MISSING)
+    if user is _MISSING:
+        # Through flask_app so @patch("flask_app.get_user_by_clerk_id") applies
+        import flask_app as _fa
+        user = _fa.get_user_by_clerk_id(clerk_id)
+        if user and user_cache.ttl > 0:
+            user_cache.set(clerk_id, user)
+    if memo is not None:
+        memo[clerk_id] = user
+    return dict(user) if user else user
+
+
+def invalidate_user(clerk_id: str) -> None:
+    """Forget ``clerk_id`` in this request and this worker's cache."""
+    user_cache.invalidate(clerk_id)
+    memo = _request_memo()
+    if memo is not None:
+        memo.pop(clerk_id, None)
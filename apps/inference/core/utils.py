@@ -1,11 +1,18 @@
 """
-Shared utility helpers: validation, serialisation, formatting.
+Shared utility helpers: validation, serialisation, formatting, file locks.
 
 No Flask or ML dependencies — only stdlib.
 """
 
+import os
+import tempfile
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows — single-process dev server only
+    fcntl = None
+
 
 class ValidationError(Exception):
     """Raised by ``validate_fields`` on the first failing field."""
@@ -108,3 +115,100 @@ def safe_float(value, default=0, decimals=1):
         return round(float(value), decimals) if value is not None else default
     except (TypeError, ValueError):
         return default
+
+
+def replace_atomically(path: str, write) -> None:
+    """Write ``path`` via ``write(tmp_path)`` and rename the result into place.
+
+    The temp file sits in the same directory and keeps the extension (Keras
+    picks its format from it). Readers see the old file or the new one,
+    never a partial one, and workers that memory-mapped the old file keep
+    their pages: it is unlinked, not truncated.
+    """
+    base = os.path.basename(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f".{base}.",
+                                    suffix=".tmp" + os.path.splitext(base)[1])
+    os.close(fd)
+    try:
+        write(tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class FileLock:
+    """Advisory inter-process lock (``flock``) on ``path``.
+
+    Held by at most one process on the host; released automatically if
+    the holder exits. Without ``fcntl`` (Windows) it always succeeds. It
+    does not exclude threads: ``acquire`` on an instance that is already
+    held returns True, so threads sharing one need their own lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def process_memory(pid="self") -> dict | None:
+    """RSS, PSS and USS (unique) memory of a process in MB, from ``/proc``.
+
+    USS is what the process would free if it exited; pages shared with the
+    gunicorn master (copy-on-write or memory-mapped) count only in RSS/PSS.
+    Returns None where ``/proc/<pid>/smaps_rollup`` isn't available.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+    uss = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "rss_mb": round(fields.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+        "uss_mb": round(uss / 1024, 1),
+    }
@@ -1,20 +1,80 @@
+import atexit
 import json
 import os
+import threading
 import uuid
 from datetime import datetime, timedelta
 from typing import Any
 
-import psycopg
 from dotenv import load_dotenv
 from psycopg.rows import dict_row
 
 load_dotenv()
 
+# ── Connection pool ──────────────────────────────────────────────────────────
+# One psycopg_pool.ConnectionPool per process (gunicorn worker), created on
+# first use: pool threads and sockets don't survive fork, so a pool
+# inherited from the master is replaced rather than reused.
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))            # wait for a free connection
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))  # recycle connections after
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))          # close surplus idle connections after
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            db_url = os.getenv("DATABASE_URL")
+            if not db_url:
+                raise Exception("DATABASE_URL not configured")
+            from psycopg_pool import ConnectionPool
+            _pool = ConnectionPool(
+                db_url,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=max(DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE),
+                timeout=DB_POOL_TIMEOUT,
+                max_lifetime=DB_POOL_MAX_LIFETIME,
+                max_idle=DB_POOL_MAX_IDLE,
+                # Checked on checkout, so a connection the server dropped
+                # (idle timeout, restart) is replaced instead of failing a query
+                check=ConnectionPool.check_connection,
+                # No server-side prepared statements: long-lived connections
+                # would otherwise start preparing, which PgBouncer-style
+                # poolers (e.g. Neon's -pooler endpoint) may reject
+                kwargs={"row_factory": dict_row, "autocommit": True, "prepare_threshold": None},
+                name="foresee-db",
+                open=True,
+            )
+            _pool_pid = os.getpid()
+    return _pool
+
+
 def get_db_connection():
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        raise Exception("DATABASE_URL not configured")
-    return psycopg.connect(db_url, row_factory=dict_row, autocommit=True)
+    """A pooled connection, as a context manager that returns it to the pool on exit."""
+    return _get_pool().connection()
+
+
+def pool_stats() -> dict[str, Any] | None:
+    """Pool size, waits and usage counters for this worker (None before first use)."""
+    if _pool is None or _pool_pid != os.getpid():
+        return None
+    return _pool.get_stats()
+
+
+@atexit.register
+def _close_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+
 
 def upsert_user(clerk_id: str, email: str, first_name: str | None = None, last_name: str | None = None, image_url: str | None = None) -> dict[str, Any]:
     with get_db_connection() as conn:
@@ -61,6 +61,7 @@ from core.config import (  # noqa: F401
 )
 from core.middleware import track_performance  # noqa: F401
 from core.ml_loader import load_models  # noqa: F401
+from core.user_cache import get_user as _get_cached_user
 from core.utils import (  # noqa: F401
     ValidationError,
     serialize_datetime,
@@ -144,7 +145,7 @@ except Exception as e:
 def _resolve_user_or_error(clerk_id: str):
     if not DB_AVAILABLE:
         return None, (jsonify({"error": "Database module not available"}), 503)
-    user = get_user_by_clerk_id(clerk_id)
+    user = _get_cached_user(clerk_id)
     if not user:
         return None, (jsonify({"error": "User not found"}), 404)
     return user, None
@@ -164,8 +165,18 @@ def create_app() -> Flask:
     from routes import register_blueprints
     register_blueprints(application)
 
-    load_models()
+    from core.config import PRELOADING
+    if PRELOADING:
+        # Tabular models load in the master so workers share them
+        load_models(_ml_loader.TABULAR_MODELS)
+    else:
+        _ml_loader.init_models()
     _test_clerk_connection()
+
+    if not PRELOADING:
+        from core.signal_refresher import start_signal_refresher
+        start_signal_refresher()
+        _ml_loader.start_model_watcher()
     return application
 
 
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for the inference app.
+
+Loads the app once in the master before forking (``preload_app``) so the
+forecaster, DHS risk model and ensemble are shared copy-on-write across
+workers; with ``MODEL_MMAP`` their numpy arrays are also memory-mapped so
+even refcount writes don't copy the array pages. TensorFlow/LiteRT image models
+and background threads are not fork-safe, so each worker starts those in
+``post_fork`` (loading the image models per ``MODEL_LOADING``). A model
+hot-reloaded later is private to the worker that loads it until the next
+restart.
+
+Bind, workers and threads stay on the command line (Procfile, Dockerfile).
+Set ``GUNICORN_PRELOAD=false`` to load everything per worker as before.
+"""
+
+import gc
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("true", "1", "yes")
+
+if preload_app:
+    os.environ["FORESEE_PRELOADING"] = "1"
+
+
+def when_ready(server):
+    if preload_app:
+        # Move everything the master allocated into the permanent generation
+        # so workers' garbage collections don't touch (and copy) those pages.
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from core.ml_loader import IMAGE_MODELS, init_models, start_model_watcher
+    from core.signal_refresher import start_signal_refresher
+
+    init_models(IMAGE_MODELS)
+    start_signal_refresher()
+    start_model_watcher()
@@ -9,6 +9,7 @@ from flask import Blueprint, jsonify, request
 
 from core.auth import require_auth
 from core.logging_config import get_logger
+from core.user_cache import get_user
 from core.utils import format_time_ago, safe_float, serialize_datetime
 
 logger = get_logger("foresee.app")
@@ -153,7 +154,7 @@ def dashboard_stats():
         # --- Database path (authenticated user) ---
         if clerk_id and _fa.DB_AVAILABLE:
             try:
-                user = _fa.get_user_by_clerk_id(clerk_id)
+                user = get_user(clerk_id)
                 if user:
                     user_id = user["id"]
 
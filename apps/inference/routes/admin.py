@@ -1,10 +1,11 @@
 """
-Admin routes: user listing & role management via Clerk Management API.
+Admin routes: user listing & role management via Clerk Management API,
+model hot reload.
 """
 
 from flask import Blueprint, jsonify, request
 
-from core.auth import clerk_request, get_caller_role, require_auth
+from core.auth import clerk_request, get_caller_role, invalidate_role, require_auth
 from core.config import CLERK_SECRET_KEY
 from core.logging_config import get_logger
 
@@ -76,5 +77,34 @@ def admin_set_role():
 
     if status != 200:
         return jsonify({"error": "Failed to update role", "detail": data}), 502
+    invalidate_role(user_id)
 
     return jsonify({"success": True, "userId": user_id, "role": new_role}), 200
+
+
+@admin_bp.route("/admin/models/reload", methods=["POST", "OPTIONS"])
+@require_auth(roles=["admin"])
+def admin_reload_models():
+    """
+    Hot-swap retrained model artifacts in this worker. Admin only.
+    Other workers pick the new files up through their model watcher.
+    """
+    if request.method == "OPTIONS":
+        return jsonify({}), 200
+
+    caller_role, reason = get_caller_role(request)
+    if caller_role != "admin":
+        return jsonify({"error": "Forbidden", "reason": reason}), 403
+
+    import core.ml_loader as _ml_loader
+
+    body = request.get_json(silent=True) or {}
+    names = body.get("models") or list(_ml_loader.ALL_MODELS)
+    unknown = [n for n in names if n not in _ml_loader.ALL_MODELS]
+    if unknown:
+        return jsonify({"error": "Unknown models", "models": unknown,
+                        "valid": list(_ml_loader.ALL_MODELS)}), 400
+
+    swapped = _ml_loader.check_for_updates(names, force=bool(body.get("force")))
+    logger_admin.info("/admin/models/reload → swapped=%s", swapped)
+    return jsonify({"reloaded": swapped, "models": _ml_loader.model_status()}), 200
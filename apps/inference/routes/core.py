@@ -30,9 +30,22 @@ def home():
     })
 
 
+def _db_pool_stats():
+    from db.database import pool_stats
+    return pool_stats()
+
+
 @core_bp.route("/health")
 def health_check():
+    import core.ml_loader as _ml_loader
     import flask_app as _fa
+    from core.auth import clerk_jwks, role_cache, verified_tokens
+    from core.forecast_cache import forecast_cache
+    from core.image_validation import image_validator
+    from core.micro_batcher import cnn_batcher, gatekeeper_batcher
+    from core.signal_refresher import signal_refresher
+    from core.user_cache import user_cache
+    from core.utils import process_memory
 
     try:
         return jsonify({
@@ -40,11 +53,22 @@ def health_check():
             "message": "OutbreakLens ML Inference API is operational",
             "timestamp": datetime.now().isoformat(),
             "models_loaded": {
-                "cnn_diagnostic_model": _fa.malaria_model is not None,
-                "arima_forecast_model": _fa.malaria_forecast_model is not None,
+                "cnn_diagnostic_model": _ml_loader.is_ready("cnn"),
+                "arima_forecast_model": _ml_loader.is_ready("forecaster"),
                 "dhs_risk_model": _fa.SYMPTOM_MODEL_NAME,
             },
+            "models": _ml_loader.model_status(),
+            "model_runtimes": _ml_loader.MODEL_RUNTIMES,
             "database_connected": _fa.DB_AVAILABLE,
+            "database_pool": _db_pool_stats() if _fa.DB_AVAILABLE else None,
+            "forecast_cache": forecast_cache.stats(),
+            "user_cache": user_cache.stats(),
+            "clerk_role_cache": role_cache.stats(),
+            "clerk_jwks": {**clerk_jwks.stats(), "verified_tokens": verified_tokens.stats()},
+            "signal_refresher": signal_refresher.status(),
+            "image_batching": {"gatekeeper": gatekeeper_batcher.stats(), "cnn": cnn_batcher.stats()},
+            "image_validation": image_validator.stats(),
+            "worker": {"pid": os.getpid(), "memory": process_memory()},
         })
     except Exception as e:
         return jsonify({
@@ -6,6 +6,7 @@ from flask import Blueprint, jsonify, request
 
 from core.auth import get_caller_role, require_auth
 from core.logging_config import get_logger
+from core.user_cache import get_user
 from core.utils import ValidationError, serialize_datetime, validate_fields
 
 logger = get_logger("foresee.app")
@@ -49,7 +50,7 @@ def create_diagnosis():
             if caller_role != "admin":
                 return jsonify({"error": "Forbidden", "message": "Access denied to other user data"}), 403
 
-        user = _fa.get_user_by_clerk_id(clerk_id)
+        user = get_user(clerk_id)
         if not user:
             return jsonify({"error": "User not found. Please sync user first."}), 404
 
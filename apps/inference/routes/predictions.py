@@ -3,14 +3,13 @@ ML prediction routes: symptom risk, image diagnosis, outbreak forecasting.
 """
 
 import os
-import tempfile
-from collections import deque
-from datetime import datetime, timedelta
+from datetime import timedelta
+from types import SimpleNamespace
 
 import numpy as np
-import pandas as pd
 from flask import Blueprint, jsonify, request
 
+from core.adaptive_config import REGION_COORDS, WINDOW_SIZE
 from core.auth import require_auth
 from core.config import (
     IMAGE_ALLOWED_EXTENSIONS,
@@ -18,9 +17,17 @@ from core.config import (
     IMAGE_MAGIC_BYTES,
     IMAGE_MAX_FILE_SIZE_BYTES,
     IMAGE_MAX_FILE_SIZE_MB,
+    SYMPTOM_BATCH_MAX_RECORDS,
 )
+from core.forecast_cache import forecast_cache, forecast_cache_enabled, forecast_key, rollout_rng
+from core.image_pipeline import preprocess_image
+from core.image_validation import image_validator
 from core.logging_config import get_logger
+from core.micro_batcher import cnn_batcher
 from core.middleware import track_performance
+from core.ml_loader import artifact_version
+from core.outbreak_store import outbreak_store
+from core.symptom_scorer import rule_based_risk, scorer_for
 
 logger = get_logger("foresee.app")
 logger_ml = get_logger("foresee.ml")
@@ -45,134 +52,132 @@ def predict_symptoms():
             return jsonify({"error": "No data provided"}), 400
 
         # --- ML Model Path ---
-        if _fa.symptoms_model and isinstance(_fa.symptoms_model, dict):
+        symptoms_model = _fa.symptoms_model
+        if symptoms_model and isinstance(symptoms_model, dict):
             try:
-                fever = data.get("fever")
-                if isinstance(fever, bool):
-                    fever = 1 if fever else 0
-                elif fever is None:
-                    fever = -1
-
-                net = data.get("slept_under_net")
-                if isinstance(net, bool):
-                    net = 1 if net else 0
-                elif net is None:
-                    net = -1
-
-                input_data = {
-                    "fever": [fever],
-                    "age_months": [data.get("age_months", -1)],
-                    "state": [data.get("state", "Unknown")],
-                    "residence_type": [data.get("residence_type", "Rural")],
-                    "slept_under_net": [net],
-                    "anemia_level": [data.get("anemia_level", -1)],
-                    "interview_month": [data.get("interview_month", datetime.now().month)],
-                }
-
-                df = pd.DataFrame(input_data)
-
-                try:
-                    le_state = _fa.symptoms_model["le_state"]
-                    state_valid = df["state"].isin(le_state.classes_)
-                    if not state_valid.all():
-                        df.loc[~state_valid, "state"] = le_state.classes_[0]
-                    df["state"] = le_state.transform(df["state"])
-                except Exception as e:
-                    logger_ml.warning("State encoding error: %s", e)
-                    df["state"] = 0
-
-                try:
-                    le_res = _fa.symptoms_model["le_res"]
-                    res_valid = df["residence_type"].isin(le_res.classes_)
-                    if not res_valid.all():
-                        df.loc[~res_valid, "residence_type"] = le_res.classes_[0]
-                    df["residence_type"] = le_res.transform(df["residence_type"])
-                except Exception:
-                    df["residence_type"] = 0
-
-                imputer = _fa.symptoms_model["imputer"]
-                cols_to_impute = _fa.symptoms_model.get("cols_to_impute")
-                if cols_to_impute:
-                    for col in cols_to_impute:
-                        if col in df.columns:
-                            df[col] = df[col].astype(float)
-                    df[cols_to_impute] = imputer.transform(df[cols_to_impute])
-
-                feature_order = _fa.symptoms_model["features"]
-                X = df[feature_order].values
-                model = _fa.symptoms_model["model"]
-
-                probabilities = model.predict_proba(X)[0]
-                prediction = np.argmax(probabilities)
-                risk_score = float(probabilities[prediction])
-
-                risk_map = {0: "Low Risk", 1: "Medium Risk", 2: "High Risk"}
-                label = risk_map.get(prediction, "Unknown Risk")
-
-                return jsonify({
-                    "label": label,
-                    "risk_score": round(risk_score, 2),
-                    "confidence": round(risk_score, 2),
-                    "method": "DHS-based ML Risk Model",
-                    "model_version": "v1.0",
-                })
-
+                result = scorer_for(symptoms_model).score([data])[0]
+                if "error" not in result:
+                    return jsonify(result)
+                logger_ml.warning("ML Inference Error, falling back to rules: %s", result["error"])
             except Exception:
                 logger_ml.warning("ML Inference Error, falling back to rules", exc_info=True)
 
         # --- Rule-Based Fallback ---
-        fever = bool(data.get("fever", False))
-        symptom_keys = [
-            "chills", "headache", "fatigue", "muscle_aches",
-            "nausea", "diarrhea", "abdominal_pain",
-            "cough", "skin_rash",
-        ]
-        symptom_count = sum(bool(data.get(s, False)) for s in symptom_keys)
+        return jsonify(rule_based_risk(data))
 
-        anemia_level = data.get("anemia_level", 4)
-        is_anemic = False
-        try:
-            if int(anemia_level) <= 2:
-                is_anemic = True
-        except (ValueError, TypeError):
-            pass
-
-        if not fever and not is_anemic:
-            risk, risk_score = "Low", 0.15
-        elif symptom_count >= 2 or (fever and is_anemic):
-            risk, risk_score = "High", 0.85
-        elif is_anemic:
-            risk, risk_score = "Medium", 0.65
-        else:
-            risk, risk_score = "Medium", 0.50
+    except Exception as e:
+        logger.error("Error in symptom prediction: %s", e)
+        return jsonify({"error": str(e)}), 500
 
-        return jsonify({
-            "label": f"{risk} Risk",
-            "risk_score": risk_score,
-            "confidence": risk_score,
-            "method": "Clinical Rule-Based Assessment (Fallback)",
-            "model_version": "v1.0 (Fallback)",
-        })
+
+@predictions_bp.route("/predict/symptoms/batch", methods=["POST"])
+@require_auth(skip_db_check=True)
+@track_performance
+def predict_symptoms_batch():
+    """Score many symptom records (e.g. bulk household surveys) in one call.
+    Body: ``{"records": [...]}``; results come back in order, each in the
+    /predict/symptoms response schema.
+    """
+    import flask_app as _fa
+
+    try:
+        data = request.get_json(silent=True)
+        records = data.get("records") if isinstance(data, dict) else None
+        if not isinstance(records, list) or not records:
+            return jsonify({"error": "Expected a non-empty \"records\" list"}), 400
+        if len(records) > SYMPTOM_BATCH_MAX_RECORDS:
+            return jsonify({
+                "error": "Too many records",
+                "message": f"At most {SYMPTOM_BATCH_MAX_RECORDS} records per request",
+            }), 413
+
+        results = None
+        symptoms_model = _fa.symptoms_model
+        if symptoms_model and isinstance(symptoms_model, dict):
+            try:
+                results = scorer_for(symptoms_model).score(records)
+            except Exception:
+                logger_ml.warning("Batch ML Inference Error, falling back to rules", exc_info=True)
+        if results is None:
+            results = [{"error": "Invalid record"}] * len(records)
+
+        # Records the model couldn't encode get the rule-based assessment,
+        # as a single /predict/symptoms request would
+        results = [
+            rule_based_risk(record) if "error" in result and isinstance(record, dict) else result
+            for record, result in zip(records, results, strict=True)
+        ]
+        return jsonify({"count": len(results), "results": results})
 
     except Exception as e:
-        logger.error("Error in symptom prediction: %s", e)
+        logger.error("Error in batch symptom prediction: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 # ── Outbreak Forecasting ─────────────────────────────────────────────────────
 
+def _historical_points(series, weeks=12):
+    """Last ``weeks`` observed points of a RegionSeries, shaped for the chart."""
+    tail = series.tail(weeks)
+    weeks_str = np.datetime_as_string(tail.dates, unit="D")
+    return [
+        {"week": str(week), "cases": int(cases)}
+        for week, cases in zip(weeks_str, tail.cases, strict=True)
+    ]
+
+
 @predictions_bp.route("/forecast/regions", methods=["GET"])
 @require_auth(skip_db_check=True)
 @track_performance
 def get_forecast_regions():
     try:
-        df = pd.read_csv("data/realtime_india_outbreaks.csv")
-        regions = df["Region"].unique().tolist()
-        return jsonify({"regions": sorted(regions)})
+        return jsonify({"regions": outbreak_store.regions()})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _hotspots(region, hotspot_score):
+    # Scale so the three zones always span a meaningful risk range:
+    # Northern = highest-risk sub-zone (boosted), Central = baseline, Southern = lowest
+    return [
+        {"name": f"Northern {region}", "intensity": round(min(hotspot_score * 1.4, 1.0), 2)},
+        {"name": f"Central {region}",  "intensity": round(min(hotspot_score * 0.95, 1.0), 2)},
+        {"name": f"Southern {region}", "intensity": round(max(hotspot_score * 0.5, 0.05), 2)},
+    ]
+
+
+def _live_insights(weather_data, news_data):
+    return {
+        "temperature": weather_data.get("temperature"),
+        "humidity": weather_data.get("humidity"),
+        "precipitation": weather_data.get("precipitation"),
+        "news_articles_found": news_data.get("article_count", 0),
+        "top_headlines": news_data.get("headlines", []),
+    }
+
+
+def _freshness(weather_data, news_data):
+    return {
+        "weather_fresh": weather_data.get("fresh", False),
+        "news_fresh": news_data.get("fresh", False),
+    }
+
+
+def _legacy_hotspot_score(predictions, weather_data, news_data):
+    MAX_EXPECTED_CASES = 5000
+    avg_cases = np.mean([p["cases"] for p in predictions])
+    base_score = min(1.0, max(0.1, avg_cases / MAX_EXPECTED_CASES))
+
+    live_multiplier = weather_data.get("risk_multiplier", 1.0) * news_data.get("news_risk_score", 1.0)
+    return float(min(1.0, base_score * live_multiplier))
+
+
+def _forecast_response(payload, cache_status):
+    resp = jsonify(payload)
+    resp.headers["X-Cache"] = cache_status
+    return resp
+
+
 @predictions_bp.route("/forecast/region", methods=["POST"])
 @require_auth(skip_db_check=True)
 @track_performance
@@ -188,91 +193,78 @@ def forecast_region():
         horizon_weeks = min(data.get("horizon_weeks", 8), 12)
         scenario_params = data.get("scenario", None)
 
-        df = pd.read_csv("data/realtime_india_outbreaks.csv")
-        region_df = df[df["Region"] == region].copy()
+        data_version = outbreak_store.version
+        series = outbreak_store.get(region)
 
-        if len(region_df) < 8:
+        if series is None or len(series) < WINDOW_SIZE:
             return jsonify({"error": f"Not enough historical data for {region}. Need at least 8 weeks."}), 400
 
-        region_df["Date"] = pd.to_datetime(region_df["Date"])
-        region_df = region_df.sort_values("Date")
-        region_cases = region_df["New_Cases"].values
-        last_date = region_df["Date"].iloc[-1]
-
-        WINDOW_SIZE = 8
+        region_cases = series.cases
+        last_date = series.last_date
 
         # ── Fetch live exogenous signals ──────────────────────────────
-        from core.feature_store import fetch_current_weather, fetch_news_signal
-        weather_data = fetch_current_weather(region)
-        news_data = fetch_news_signal(region)
-
-        freshness = {
-            "weather_fresh": weather_data.get("fresh", False),
-            "news_fresh": news_data.get("fresh", False),
-        }
+        from core.feature_store import fetch_exogenous
+        weather_data, news_data = fetch_exogenous(region)
+
+        freshness = _freshness(weather_data, news_data)
+
+        # ── Response cache ────────────────────────────────────────────
+        # The key covers every input of the forecast, so a hit is exactly
+        # what recomputing would return (the rollout noise is seeded from
+        # the same key). Drift status is live state and is never cached.
+        # One model version for the whole request, even if a hot reload
+        # swaps it meanwhile
+        ensemble = _fa.adaptive_ensemble
+
+        cache_key = rng = model_version = None
+        if ensemble is not None:
+            model_version = ensemble.get("version", "v2_adaptive")
+        else:
+            # Key legacy forecasts on the file the model was loaded from, so a
+            # worker that hasn't hot-swapped yet can't fill the shared tier
+            # under the new model's key. Read before the model itself: a swap
+            # in between only files a newer forecast under the older key.
+            artifact = artifact_version("forecaster")
+            model_version = f"v1_legacy:{artifact}" if artifact else None
+        if forecast_cache_enabled() and model_version is not None:
+            cache_key = forecast_key(region, horizon_weeks, scenario_params, data_version,
+                                     model_version, weather_data, news_data)
+            rng = rollout_rng(cache_key)
+            cached = forecast_cache.get(cache_key)
+            if cached is not None:
+                if ensemble is not None:
+                    from core.drift_detector import drift_detector
+                    cached = {**cached, "drift_status": drift_detector.get_status_summary()}
+                return _forecast_response(cached, "HIT")
 
         # ── Adaptive Ensemble Path ────────────────────────────────────
-        if _fa.adaptive_ensemble is not None:
+        if ensemble is not None:
             from core.adaptive_trainer import predict_with_ensemble
             from core.drift_detector import drift_detector
             from core.explainability import explain_prediction
             from core.feature_store import build_feature_row
+            from core.forecaster import rollout_ensemble
             from core.simulator import compute_risk_fusion_score, simulate_intervention
 
-            ensemble = _fa.adaptive_ensemble
-            predictions = []
-            forecast_vals = []
-
-            current_cases = list(region_cases[-WINDOW_SIZE:])
-
-            for i in range(horizon_weeks):
-                week_date = last_date + timedelta(weeks=i + 1)
-                features, _ = build_feature_row(
-                    region, current_cases, weather_data, news_data, date=week_date
-                )
-                result = predict_with_ensemble(ensemble, features)
-
-                pred_entry = {
-                    "week": week_date.strftime("%Y-%m-%d"),
-                    "point": result["point"],
-                    "p10": result["p10"],
-                    "p50": result["p50"],
-                    "p90": result["p90"],
-                    "model_agreement": result["model_agreement"],
-                }
-                predictions.append(pred_entry)
-                forecast_vals.append(result["point"])
-
-                # ── Anti-reversion blending ──────────────────────────────────
-                # Raw autoregressive prediction compounds downward drift because
-                # each synthetic value is slightly lower than the previous one.
-                # Blend 70% point prediction with 30% recent rolling mean to
-                # anchor the window and slow the collapse over many weeks.
-                rolling_mean = float(np.mean(current_cases[-4:]))
-                blended_val = max(0.0, result["point"] * 0.50 + rolling_mean * 0.50)
-
-                # Add a tiny amount of noise so long forecasts don't flatten to
-                # a perfectly straight line (looks more realistic)
-                noise = float(np.random.normal(0, rolling_mean * 0.03))
-                blended_val = max(0.0, blended_val + noise)
-
-                current_cases.append(blended_val)
-                current_cases = current_cases[-WINDOW_SIZE:]
+            rollout = rollout_ensemble(
+                ensemble, [region], [region_cases], [last_date], [weather_data], [news_data],
+                horizon_weeks, rngs=None if rng is None else [rng],
+            )[0]
+            predictions = rollout["predictions"]
 
             # Historical data for chart
-            historical = []
-            for _, row in region_df.tail(12).iterrows():
-                historical.append({
-                    "week": row["Date"].strftime("%Y-%m-%d"),
-                    "cases": int(row["New_Cases"]),
-                })
-
-            # Explainability
-            last_features, _ = build_feature_row(
-                region, list(region_cases[-WINDOW_SIZE:]), weather_data, news_data,
-                date=last_date + timedelta(weeks=1)
-            )
-            last_pred_result = predict_with_ensemble(ensemble, last_features)
+            historical = _historical_points(series)
+
+            # Explainability — the first horizon step is scored on exactly the
+            # observed window at last_date + 1 week, so reuse it rather than
+            # rebuilding and re-scoring the same row.
+            last_features, last_pred_result = rollout["first_features"], rollout["first_result"]
+            if last_features is None:
+                last_features, _ = build_feature_row(
+                    region, list(region_cases[-WINDOW_SIZE:]), weather_data, news_data,
+                    date=last_date + timedelta(weeks=1)
+                )
+                last_pred_result = predict_with_ensemble(ensemble, last_features)
             explanation = explain_prediction(
                 ensemble, last_features, last_pred_result, weather_data, news_data
             )
@@ -282,27 +274,8 @@ def forecast_region():
                 {"predictions": predictions}, weather_data, news_data
             )
 
-            # Drift status
-            drift_status = drift_detector.get_status_summary()
-
             # Hotspots (enhanced with risk fusion)
-            # Scale so the three zones always span a meaningful risk range:
-            # Northern = highest-risk sub-zone (boosted), Central = baseline, Southern = lowest
             hotspot_score = risk_fusion["fused_risk_score"]
-            hotspots = [
-                {"name": f"Northern {region}", "intensity": round(min(hotspot_score * 1.4, 1.0), 2)},
-                {"name": f"Central {region}",  "intensity": round(min(hotspot_score * 0.95, 1.0), 2)},
-                {"name": f"Southern {region}", "intensity": round(max(hotspot_score * 0.5, 0.05), 2)},
-            ]
-
-            # Live insights
-            live_insights = {
-                "temperature": weather_data.get("temperature", None),
-                "humidity": weather_data.get("humidity", None),
-                "precipitation": weather_data.get("precipitation", None),
-                "news_articles_found": news_data.get("article_count", 0),
-                "top_headlines": news_data.get("headlines", []),
-            }
 
             # Build response
             response = {
@@ -312,11 +285,10 @@ def forecast_region():
                 "historical": historical,
                 "predictions": predictions,
                 "hotspot_score": round(hotspot_score, 2),
-                "hotspots": hotspots,
-                "live_insights": live_insights,
+                "hotspots": _hotspots(region, hotspot_score),
+                "live_insights": _live_insights(weather_data, news_data),
                 "freshness": freshness,
                 "risk_fusion": risk_fusion,
-                "drift_status": drift_status,
                 "explanation": explanation,
             }
 
@@ -330,75 +302,144 @@ def forecast_region():
                     "effect_summary": effect_summary,
                 }
 
-            return jsonify(response)
+            if cache_key is not None:
+                forecast_cache.set(cache_key, response)
+
+            return _forecast_response(
+                {**response, "drift_status": drift_detector.get_status_summary()}, "MISS"
+            )
 
         # ── Legacy Fallback (v1 model) ────────────────────────────────
-        if _fa.malaria_forecast_model is None:
+        forecast_model = _fa.malaria_forecast_model
+        if forecast_model is None:
             return jsonify({"error": "No forecast model loaded"}), 500
 
-        current_window = deque(region_cases[-WINDOW_SIZE:], maxlen=WINDOW_SIZE)
+        from core.forecaster import rollout_legacy
+
+        predictions = rollout_legacy(
+            forecast_model, [region_cases], [last_date], horizon_weeks
+        )[0]
+        historical = _historical_points(series)
+        hotspot_score = _legacy_hotspot_score(predictions, weather_data, news_data)
+
+        response = {
+            "region": region,
+            "disease": "Aggregate Endemic",
+            "model_version": "v1_legacy",
+            "historical": historical,
+            "predictions": predictions,
+            "hotspot_score": round(hotspot_score, 2),
+            "hotspots": _hotspots(region, hotspot_score),
+            "live_insights": _live_insights(weather_data, news_data),
+            "freshness": freshness,
+        }
+        if cache_key is not None:
+            forecast_cache.set(cache_key, response)
 
-        predictions = []
-        forecast_val = []
-        for i in range(horizon_weeks):
-            input_feat = np.array([current_window])
-            input_scaled = np.log1p(input_feat)
+        return _forecast_response(response, "MISS")
 
-            pred_scaled = _fa.malaria_forecast_model.predict(input_scaled)[0]
-            pred_actual = np.expm1(pred_scaled)
-            pred_actual = max(0, int(pred_actual))
+    except Exception as e:
+        logger.error("Error in region forecast", exc_info=True)
+        return jsonify({"error": str(e)}), 500
 
-            forecast_val.append(pred_actual)
-            current_window.append(pred_actual)
 
-            week_date = last_date + timedelta(weeks=i + 1)
-            predictions.append({
-                "week": week_date.strftime("%Y-%m-%d"),
-                "cases": pred_actual,
-            })
+@predictions_bp.route("/forecast/all", methods=["POST"])
+@require_auth(skip_db_check=True)
+@track_performance
+def forecast_all_regions():
+    """Forecast every tracked region in one lockstep rollout.
 
-        historical = []
-        for _, row in region_df.tail(12).iterrows():
-            historical.append({
-                "week": row["Date"].strftime("%Y-%m-%d"),
-                "cases": int(row["New_Cases"]),
-            })
+    Each horizon step scores a single regions×features matrix per model
+    instead of one request (and one model call per member) per region.
+    """
+    import flask_app as _fa
+
+    try:
+        data = request.get_json(silent=True) or {}
+        horizon_weeks = min(data.get("horizon_weeks", 8), 12)
 
-        MAX_EXPECTED_CASES = 5000
-        avg_cases = np.mean(forecast_val)
-        base_score = min(1.0, max(0.1, avg_cases / MAX_EXPECTED_CASES))
+        regions, series_list = [], []
+        for region in REGION_COORDS:
+            series = outbreak_store.get(region)
+            if series is not None and len(series) >= WINDOW_SIZE:
+                regions.append(region)
+                series_list.append(series)
 
-        live_multiplier = weather_data.get("risk_multiplier", 1.0) * news_data.get("news_risk_score", 1.0)
-        hotspot_score = float(min(1.0, base_score * live_multiplier))
+        if not regions:
+            return jsonify({"error": "No region has enough historical data to forecast"}), 400
 
-        live_insights = {
-            "temperature": weather_data.get("temperature"),
-            "humidity": weather_data.get("humidity"),
-            "precipitation": weather_data.get("precipitation"),
-            "news_articles_found": news_data.get("article_count", 0),
-            "top_headlines": news_data.get("headlines", []),
-        }
+        from core.feature_store import fetch_exogenous_bulk
+        weather_list, news_list = fetch_exogenous_bulk(regions)
 
-        hotspots = [
-            {"name": f"Northern {region}", "intensity": round(min(hotspot_score * 1.4, 1.0), 2)},
-            {"name": f"Central {region}",  "intensity": round(min(hotspot_score * 0.95, 1.0), 2)},
-            {"name": f"Southern {region}", "intensity": round(max(hotspot_score * 0.5, 0.05), 2)},
-        ]
+        case_windows = [s.cases for s in series_list]
+        last_dates = [s.last_date for s in series_list]
+
+        results = []
+
+        ensemble = _fa.adaptive_ensemble
+        if ensemble is not None:
+            from core.drift_detector import drift_detector
+            from core.forecaster import rollout_ensemble
+            from core.simulator import compute_risk_fusion_score
+
+            rollouts = rollout_ensemble(
+                ensemble, regions, case_windows, last_dates, weather_list, news_list, horizon_weeks
+            )
+            for region, rollout, weather_data, news_data in zip(
+                regions, rollouts, weather_list, news_list, strict=True
+            ):
+                predictions = rollout["predictions"]
+                risk_fusion = compute_risk_fusion_score(
+                    {"predictions": predictions}, weather_data, news_data
+                )
+                hotspot_score = risk_fusion["fused_risk_score"]
+                results.append({
+                    "region": region,
+                    "predictions": predictions,
+                    "hotspot_score": round(hotspot_score, 2),
+                    "hotspots": _hotspots(region, hotspot_score),
+                    "risk_fusion": risk_fusion,
+                    "live_insights": _live_insights(weather_data, news_data),
+                    "freshness": _freshness(weather_data, news_data),
+                })
+
+            return jsonify({
+                "disease": "Aggregate Endemic",
+                "model_version": ensemble.get("version", "v2_adaptive"),
+                "horizon_weeks": horizon_weeks,
+                "regions": results,
+                "drift_status": drift_detector.get_status_summary(),
+            })
+
+        forecast_model = _fa.malaria_forecast_model
+        if forecast_model is None:
+            return jsonify({"error": "No forecast model loaded"}), 500
+
+        from core.forecaster import rollout_legacy
+
+        rollouts = rollout_legacy(forecast_model, case_windows, last_dates, horizon_weeks)
+        for region, predictions, weather_data, news_data in zip(
+            regions, rollouts, weather_list, news_list, strict=True
+        ):
+            hotspot_score = _legacy_hotspot_score(predictions, weather_data, news_data)
+            results.append({
+                "region": region,
+                "predictions": predictions,
+                "hotspot_score": round(hotspot_score, 2),
+                "hotspots": _hotspots(region, hotspot_score),
+                "live_insights": _live_insights(weather_data, news_data),
+                "freshness": _freshness(weather_data, news_data),
+            })
 
         return jsonify({
-            "region": region,
             "disease": "Aggregate Endemic",
             "model_version": "v1_legacy",
-            "historical": historical,
-            "predictions": predictions,
-            "hotspot_score": round(hotspot_score, 2),
-            "hotspots": hotspots,
-            "live_insights": live_insights,
-            "freshness": freshness,
+            "horizon_weeks": horizon_weeks,
+            "regions": results,
         })
 
     except Exception as e:
-        logger.error("Error in region forecast", exc_info=True)
+        logger.error("Error in all-regions forecast", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
 
@@ -411,8 +452,12 @@ def predict_image():
     import flask_app as _fa
 
     try:
-        if _fa.malaria_model is None:
+        cnn_model = _fa.malaria_model
+        if cnn_model is None:
             return jsonify({"error": "CNN model not loaded"}), 500
+        # The autoencoder and its threshold are one version; keep them together
+        gatekeeper = SimpleNamespace(gatekeeper_model=_fa.gatekeeper_model,
+                                     gatekeeper_threshold=_fa.gatekeeper_threshold)
 
         if "file" not in request.files:
             return jsonify({"error": "No file provided"}), 400
@@ -451,83 +496,47 @@ def predict_image():
                 "message": "File does not appear to be a valid image (magic bytes mismatch)",
             }), 415
 
-        # Lazy imports — mocked in tests
-        import cv2
-        from tensorflow.keras.preprocessing import image as keras_image
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = os.path.join(temp_dir, os.path.basename(file.filename))
-            with open(temp_path, "wb") as f_out:
-                f_out.write(file_bytes)
-
-            img = keras_image.load_img(temp_path, target_size=(128, 128))
-            img_array = keras_image.img_to_array(img)
-            img_array = img_array / 255.0
-            img_array = np.expand_dims(img_array, axis=0)
-
-            # Gatekeeper (Out-of-Distribution Detection)
-            if _fa.gatekeeper_model is not None:
-                gk_img = keras_image.load_img(temp_path, target_size=(64, 64))
-                gk_array = keras_image.img_to_array(gk_img) / 255.0
-                gk_array = np.expand_dims(gk_array, axis=0)
+        try:
+            views = preprocess_image(file_bytes)
+        except ValueError as e:
+            return jsonify({"error": "Invalid image content", "message": str(e)}), 415
 
-                reconstructed = _fa.gatekeeper_model.predict(gk_array, verbose=0)
-                mse = np.mean(np.square(gk_array - reconstructed))
+        # Cheap checks first. When batching, the CNN is queued alongside the
+        # gatekeeper; inline (unbatched) calls would run it to completion
+        # before the gatekeeper, wasted if the image is then rejected.
+        cnn_future = None
 
-                logger_ml.debug(
-                    "Gatekeeper Image MSE: %.5f (Threshold: %.5f)",
-                    mse, _fa.gatekeeper_threshold,
-                )
+        def _start_cnn():
+            nonlocal cnn_future
+            cnn_future = cnn_batcher.submit(cnn_model, views.cnn)
 
-                if mse > _fa.gatekeeper_threshold:
-                    return jsonify({
-                        "label": "Invalid Image",
-                        "confidence": 0.0,
-                        "probability": 0.0,
-                        "threshold": 0.5,
-                        "error": (
-                            "This image does not appear to be a standard Giemsa-stained "
-                            "thin blood smear. Please upload a valid microscopic image."
-                        ),
-                    }), 400
-
-            # OpenCV Cell-Count Validation
-            try:
-                cv_img = cv2.imread(temp_path)
-                if cv_img is not None:
-                    gray = cv2.cvtColor(cv_img, cv2.COLOR_BGR2GRAY)
-                    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-                    edges = cv2.Canny(blurred, 50, 150)
-                    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                    valid_contours = [c for c in contours if cv2.contourArea(c) > 50]
-
-                    logger_ml.debug("OpenCV Validator found %d cell-like contours", len(valid_contours))
-
-                    if len(valid_contours) > 15:
-                        return jsonify({
-                            "label": "Invalid Image",
-                            "confidence": 0.0,
-                            "probability": 0.0,
-                            "threshold": 0.5,
-                            "error": (
-                                "This appears to be a full blood smear with dozens of cells. "
-                                "Please upload an image of a SINGLE, cropped cell for accurate diagnosis."
-                            ),
-                        }), 400
-            except Exception as cv_e:
-                logger_ml.warning("OpenCV validation error: %s", cv_e)
+        try:
+            stage, rejection = image_validator.run(
+                views, gatekeeper, before_model_stage=_start_cnn if cnn_batcher.batching else None
+            )
+            if rejection is not None:
+                if cnn_future is not None:
+                    cnn_future.cancel()
+                logger_ml.debug("Image rejected by %s stage", stage)
+                return jsonify(rejection), 400
 
             # Malaria Classification
-            prediction = _fa.malaria_model.predict(img_array)
-            score = float(prediction[0][0])
-            label = "Parasitized" if score > 0.5 else "Uninfected"
+            if cnn_future is None:
+                _start_cnn()
+            prediction = cnn_batcher.result(cnn_future)
+        except TimeoutError:
+            if cnn_future is not None:
+                cnn_future.cancel()
+            return jsonify({"error": "Image model timed out, please retry"}), 503
+        score = float(prediction[0])
+        label = "Parasitized" if score > 0.5 else "Uninfected"
 
-            return jsonify({
-                "label": label,
-                "confidence": round(score, 3),
-                "probability": round(score, 3),
-                "threshold": 0.5,
-            })
+        return jsonify({
+            "label": label,
+            "confidence": round(score, 3),
+            "probability": round(score, 3),
+            "threshold": 0.5,
+        })
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -6,6 +6,7 @@ from flask import Blueprint, jsonify, request
 
 from core.auth import require_auth
 from core.logging_config import get_logger
+from core.user_cache import invalidate_user
 from core.utils import ValidationError, validate_fields
 
 logger = get_logger("foresee.app")
@@ -50,6 +51,7 @@ def sync_user():
             last_name=data.get("lastName"),
             image_url=data.get("imageUrl"),
         )
+        invalidate_user(clerk_id)
 
         user_with_stats = _fa.get_user_with_stats(clerk_id)
         return jsonify(user_with_stats if user_with_stats else user)
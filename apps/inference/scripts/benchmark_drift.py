@@ -0,0 +1,75 @@
+"""
+Drift Detector Check Benchmark
+------------------------------
+Times DriftDetector.check_drift on full windows of increasing size, next to
+the original full-recompute statistics (numpy split-half stats plus the
+O(n^2) slice-and-mean ADWIN scan) on the same data.
+
+Persistence is disabled so only the statistics are measured.
+
+Run from the inference app root:
+  cd apps/inference
+  python scripts/benchmark_drift.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.adaptive_config import DRIFT_ADWIN_DELTA, DRIFT_MIN_SAMPLES
+from core.drift_detector import DriftDetector
+
+WINDOWS = [1_000, 10_000, 100_000]
+N_FEATURES = 10
+CHECKS = 200
+LEGACY_MAX_WINDOW = 10_000  # the O(n^2) scan takes minutes beyond this
+
+
+def legacy_check(residuals, features):
+    """The original per-call recompute, kept only for comparison."""
+    split = len(residuals) // 2
+    _ = abs(np.mean(residuals[split:]) - np.mean(residuals[:split])) / max(np.std(residuals[:split]), 1e-6)
+    for vals in features:
+        split_f = len(vals) // 2
+        _ = abs(np.mean(vals[split_f:]) - np.mean(vals[:split_f])) / max(np.std(vals[:split_f]), 1e-6)
+    n = len(residuals)
+    for cut in range(DRIFT_MIN_SAMPLES // 2, n - DRIFT_MIN_SAMPLES // 2):
+        m = abs(np.mean(residuals[:cut]) - np.mean(residuals[cut:]))
+        _ = m > np.sqrt(1.0 / (2.0 * cut) + 1.0 / (2.0 * (n - cut))) * np.log(2.0 / DRIFT_ADWIN_DELTA)
+
+
+def main():
+    rng = np.random.RandomState(0)
+    print(f"{'window':>8} {'fill s':>8} {'check us':>10} {'legacy ms':>10}")
+    for window in WINDOWS:
+        residuals = rng.normal(scale=20, size=window)
+        features = rng.normal(size=(N_FEATURES, window))
+
+        detector = DriftDetector(max_window=window, state_path=None)
+
+        start = time.perf_counter()
+        for i in range(window):
+            detector.record_residual(residuals[i], 0.0)
+            detector.record_features({f"f{j}": features[j, i] for j in range(N_FEATURES)})
+        fill = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(CHECKS):
+            detector.check_drift()
+        per_check_us = (time.perf_counter() - start) / CHECKS * 1e6
+
+        legacy = "-"
+        if window <= LEGACY_MAX_WINDOW:
+            start = time.perf_counter()
+            legacy_check(residuals, features)
+            legacy = f"{(time.perf_counter() - start) * 1e3:.1f}"
+
+        print(f"{window:>8} {fill:>8.2f} {per_check_us:>10.1f} {legacy:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import sys
 
 import joblib
 import numpy as np
@@ -8,6 +9,10 @@ from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import replace_atomically
+
 
 def train_and_save_dhs_model():
     print("🚀 Starting DHS Model Training Pipeline...")
@@ -135,7 +140,8 @@ def train_and_save_dhs_model():
         "cols_to_impute": cols_to_impute
     }
 
-    joblib.dump(model_bundle, SAVE_PATH)
+    # Rename into place: the server may be serving (and memory-mapping) the old file
+    replace_atomically(SAVE_PATH, lambda tmp: joblib.dump(model_bundle, tmp))
     print(f"✅ Model successfully saved to {SAVE_PATH}")
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""
+Export CNN + Gatekeeper to TFLite
+---------------------------------
+Converts the Keras image models to TFLite with dynamic-range (int8
+weight) quantization, checks the converted models against Keras, and
+benchmarks worker startup and memory for both runtimes.
+
+Outputs:
+  models/malaria_cnn_full.tflite
+  models/gatekeeper_autoencoder.tflite
+  models/tflite_export_report.json  — parity + benchmark results
+
+An artifact is only kept if it passes the parity checks:
+  - CNN:        Parasitized/Uninfected label agreement >= 99.5% and
+                max |p_tflite - p_keras| <= 0.02
+  - Gatekeeper: accept/reject agreement at the metadata MSE threshold
+                >= 99.5%
+
+Parity images come from data/cell_images (same layout as training) when
+present, otherwise from synthetic smears.
+
+Run from the inference app root:
+  cd apps/inference
+  python scripts/export_tflite_models.py [--no-quantize] [--skip-benchmark]
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.chdir(BASE_DIR)
+
+MODELS = {
+    "cnn": ("models/malaria_cnn_full.h5", "models/malaria_cnn_full.tflite", (128, 128)),
+    "gatekeeper": ("models/gatekeeper_autoencoder.h5", "models/gatekeeper_autoencoder.tflite", (64, 64)),
+}
+REPORT_PATH = "models/tflite_export_report.json"
+PARITY_IMAGES = 1000
+MIN_AGREEMENT = 0.995
+MAX_CNN_PROB_DIFF = 0.02
+
+# Run in a fresh interpreter so startup time and RSS reflect one worker
+_BENCHMARK_SNIPPET = """
+import json, os, resource, sys, time
+sys.path.insert(0, {base!r})
+os.chdir({base!r})
+start = time.perf_counter()
+if {runtime!r} == "tflite":
+    from core.tflite_runtime import TFLiteModel
+    model = TFLiteModel({path!r})
+else:
+    from tensorflow.keras.models import load_model
+    model = load_model({path!r}, compile=False)
+import numpy as np
+loaded = time.perf_counter() - start
+x = np.random.RandomState(0).rand(1, *{shape!r}, 3).astype(np.float32)
+model.predict(x, verbose=0)
+start = time.perf_counter()
+for _ in range(50):
+    model.predict(x, verbose=0)
+per_call = (time.perf_counter() - start) / 50
+print(json.dumps({{
+    "startup_s": round(loaded, 3),
+    "predict_ms": round(per_call * 1000, 3),
+    "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+}}))
+"""
+
+
+def load_parity_images(size, limit=PARITY_IMAGES):
+    """RGB float32 [0, 1] images at ``size``, preprocessed like /predict/image."""
+    from core.image_pipeline import preprocess_image
+
+    files = []
+    for cls_name in ("Parasitized", "Uninfected"):
+        files += sorted(glob.glob(os.path.join("data", "cell_images", cls_name, "*.png")))[: limit // 2]
+
+    images = []
+    for path in files:
+        with open(path, "rb") as f:
+            try:
+                views = preprocess_image(f.read())
+            except ValueError:
+                continue
+        images.append(views.cnn if size == (128, 128) else views.gatekeeper)
+    if images:
+        return np.stack(images), "data/cell_images"
+
+    rng = np.random.RandomState(0)
+    return rng.rand(limit // 4, *size, 3).astype(np.float32), "synthetic"
+
+
+def convert(keras_model, quantize):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if quantize:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    return converter.convert()
+
+
+def check_parity(name, keras_model, tflite_model, images, threshold):
+    ref = keras_model.predict(images, verbose=0, batch_size=64)
+    out = np.concatenate([tflite_model.predict(images[i: i + 64]) for i in range(0, len(images), 64)])
+
+    if name == "cnn":
+        agreement = float(np.mean((ref[:, 0] > 0.5) == (out[:, 0] > 0.5)))
+        max_diff = float(np.max(np.abs(ref - out)))
+        return {
+            "label_agreement": round(agreement, 5),
+            "max_prob_diff": round(max_diff, 5),
+            "passed": agreement >= MIN_AGREEMENT and max_diff <= MAX_CNN_PROB_DIFF,
+        }
+
+    mse_ref = np.mean(np.square(images - ref), axis=(1, 2, 3))
+    mse_out = np.mean(np.square(images - out), axis=(1, 2, 3))
+    agreement = float(np.mean((mse_ref > threshold) == (mse_out > threshold)))
+    return {
+        "decision_agreement": round(agreement, 5),
+        "max_mse_rel_diff": round(float(np.max(np.abs(mse_out - mse_ref) / np.maximum(mse_ref, 1e-9))), 5),
+        "passed": agreement >= MIN_AGREEMENT,
+    }
+
+
+def benchmark(runtime, path, shape):
+    snippet = _BENCHMARK_SNIPPET.format(base=BASE_DIR, runtime=runtime, path=path, shape=shape)
+    result = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True,
+                            env={**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3"})
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--no-quantize", action="store_true", help="float32 export, no weight quantization")
+    parser.add_argument("--skip-benchmark", action="store_true")
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+
+    from core.tflite_runtime import TFLiteModel
+
+    threshold = 0.05
+    if os.path.exists("models/metadata.json"):
+        with open("models/metadata.json") as f:
+            threshold = json.load(f).get("gatekeeper_model", {}).get("mse_threshold", threshold)
+
+    report = {"quantized": not args.no_quantize, "models": {}}
+    for name, (h5_path, tflite_path, size) in MODELS.items():
+        if not os.path.exists(h5_path):
+            print(f"[{name}] {h5_path} not found — skipped")
+            continue
+
+        keras_model = load_model(h5_path, compile=False)
+        tmp_path = tflite_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(convert(keras_model, quantize=not args.no_quantize))
+
+        images, source = load_parity_images(size)
+        parity = check_parity(name, keras_model, TFLiteModel(tmp_path), images, threshold)
+        parity.update({"images": len(images), "source": source})
+        entry = {
+            "h5_mb": round(os.path.getsize(h5_path) / 2**20, 2),
+            "tflite_mb": round(os.path.getsize(tmp_path) / 2**20, 2),
+            "parity": parity,
+        }
+
+        if parity["passed"]:
+            os.replace(tmp_path, tflite_path)
+            print(f"[{name}] exported {tflite_path}: {parity}")
+        else:
+            os.unlink(tmp_path)
+            print(f"[{name}] parity FAILED, not exported: {parity}")
+
+        if not args.skip_benchmark and parity["passed"]:
+            entry["benchmark"] = {
+                "keras": benchmark("keras", h5_path, size),
+                "tflite": benchmark("tflite", tflite_path, size),
+            }
+            print(f"[{name}] benchmark: {entry['benchmark']}")
+        report["models"][name] = entry
+
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report saved to {REPORT_PATH}")
+    return 0 if all(m["parity"]["passed"] for m in report["models"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Uses all 27,558 NIH malaria cell images with proper augmentation
 """
 import glob
 import os
+import sys
 
 import cv2
 import matplotlib.pyplot as plt
@@ -15,6 +16,10 @@ from tensorflow import keras
 from tensorflow.keras import layers, models
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import replace_atomically
+
 # Configuration
 IMG_SIZE = (128, 128)
 BATCH_SIZE = 32
@@ -233,8 +238,8 @@ plt.tight_layout()
 plt.savefig('models/training_history_cnn.png', dpi=150)
 print("💾 Saved training history: models/training_history_cnn.png")
 
-# Save model
-model.save(MODEL_SAVE_PATH)
+# Save model (rename into place: a running server's model watcher may be reading it)
+replace_atomically(MODEL_SAVE_PATH, model.save)
 print(f"\n💾 Model saved: {MODEL_SAVE_PATH}")
 
 # Update metadata
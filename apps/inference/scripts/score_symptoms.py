@@ -0,0 +1,240 @@
+"""
+Bulk DHS Risk Scoring
+---------------------
+Scores a survey file with models/malaria_symptoms_dhs.pkl using the same
+encoding and imputation as /predict/symptoms (core/symptom_scorer.py).
+
+The input is streamed in chunks and each scored chunk is appended to the
+output as soon as it (and every chunk before it) is done, so memory stays
+bounded by roughly ``chunk_size * (2 * workers + 1)`` rows whatever the
+file size. Chunks are scored in parallel worker processes, each holding
+its own (memory-mapped) copy of the model.
+
+Input columns are the /predict/symptoms fields: fever, age_months, state,
+residence_type, slept_under_net, anemia_level, interview_month (any may be
+absent; the endpoint's defaults apply). All input columns are written
+through, followed by:
+  risk_label  — Low Risk / Medium Risk / High Risk (empty if the row
+                couldn't be encoded, e.g. a non-numeric age)
+  risk_score  — probability of that label
+
+CSV and Parquet are picked by file extension (Parquet needs pyarrow).
+CSV columns are read as text, except the numeric input fields, so a column
+that happens to be blank in one chunk keeps its type in the next. Parquet
+output keeps a Parquet input's schema; from CSV input, numeric input
+fields are written as float64 (unparseable values as null) and every other
+column as string.
+
+Run from the inference app root:
+  cd apps/inference
+  python -m scripts.score_symptoms surveys.parquet scored.parquet [--workers 8] [--chunk-size 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.symptom_scorer import INPUT_FIELDS, RISK_LABELS, SymptomScorer
+
+DEFAULT_MODEL = os.path.join(BASE_DIR, "models", "malaria_symptoms_dhs.pkl")
+# Label by class index; one past the known classes is "Unknown Risk" and the
+# last entry (index -1) marks rows that couldn't be encoded
+_N_LABELS = max(RISK_LABELS) + 1
+LABELS = np.array([RISK_LABELS[i] for i in range(_N_LABELS)] + ["Unknown Risk", ""], dtype=object)
+
+# Input fields parsed as numbers; everything else in a CSV is read as text
+_NUMBER_FIELDS = tuple(name for name in INPUT_FIELDS if name not in ("state", "residence_type"))
+_OUTPUT_TYPES = {"risk_label": "string", "risk_score": "float32"}
+
+_scorer = None
+
+
+def _load_scorer(model_path, single_threaded):
+    global _scorer
+    import joblib
+    bundle = joblib.load(model_path, mmap_mode="r")
+    if single_threaded and hasattr(bundle["model"], "n_jobs"):
+        # Parallelism comes from the process pool; don't oversubscribe cores
+        bundle["model"].n_jobs = 1
+    _scorer = SymptomScorer(bundle)
+
+
+def score_chunk(columns, n):
+    """(label index per row, score per row); unencodable rows get index -1 / NaN."""
+    X, errors = _scorer.build_columns(columns, n)
+    classes, scores = _scorer.classify(X)
+    bad = np.array([e is not None for e in errors])
+    classes = np.where(bad, -1, np.minimum(classes, _N_LABELS))
+    scores = np.where(bad, np.nan, np.round(scores, 4))
+    return classes.astype(np.int8), scores.astype(np.float32)
+
+
+# ── I/O ──────────────────────────────────────────────────────────────────────
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet input/output needs pyarrow: pip install pyarrow")
+    return pa, pq
+
+
+def read_chunks(path, chunk_size):
+    """
+    (total row count if known, Arrow schema of a Parquet input or None,
+    iterator of DataFrames of at most ``chunk_size`` rows).
+    """
+    if _is_parquet(path):
+        _, pq = _pyarrow()
+        reader = pq.ParquetFile(path)
+        chunks = (b.to_pandas() for b in reader.iter_batches(batch_size=chunk_size))
+        return reader.metadata.num_rows, reader.schema_arrow, chunks
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {name: str for name in header if name not in _NUMBER_FIELDS}
+    return None, None, pd.read_csv(path, chunksize=chunk_size, dtype=dtype, low_memory=False)
+
+
+class ChunkWriter:
+    """
+    Appends scored chunks to CSV or Parquet. The Parquet schema is the
+    input's (plus the output columns) or, for CSV input, fixed by field
+    name rather than inferred from whatever the first chunk holds.
+    """
+
+    def __init__(self, path, input_schema=None):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self.input_schema = input_schema
+        self.writer = None
+        self.first = True
+
+    def _schema(self, df):
+        pa, _ = _pyarrow()
+        fields = []
+        for name in df.columns:
+            if name in _OUTPUT_TYPES:
+                type_ = pa.type_for_alias(_OUTPUT_TYPES[name])
+            elif self.input_schema is not None and name in self.input_schema.names:
+                type_ = self.input_schema.field(name).type
+            elif name in _NUMBER_FIELDS:
+                type_ = pa.float64()
+            else:
+                type_ = pa.string()
+            fields.append(pa.field(name, type_))
+        return pa.schema(fields)
+
+    def write(self, df):
+        if self.parquet:
+            pa, pq = _pyarrow()
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, self._schema(df))
+            if self.input_schema is None:
+                df = df.copy()
+                for name in _NUMBER_FIELDS:
+                    if name in df.columns:
+                        df[name] = pd.to_numeric(df[name], errors="coerce").astype(float)
+            self.writer.write_table(pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False))
+        else:
+            df.to_csv(self.path, mode="w" if self.first else "a", header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+# ── Driver ───────────────────────────────────────────────────────────────────
+
+def _columns(df):
+    return {name: df[name].to_numpy() for name in INPUT_FIELDS if name in df.columns}
+
+
+def _attach(df, result):
+    classes, scores = result
+    df = df.copy()
+    df["risk_label"] = LABELS[classes]
+    df["risk_score"] = scores
+    return df
+
+
+def run(input_path, output_path, model_path=DEFAULT_MODEL, workers=None, chunk_size=100_000, quiet=False):
+    """Score ``input_path`` into ``output_path``; returns (rows, unscored rows)."""
+    workers = workers or os.cpu_count() or 1
+    total, input_schema, chunks = read_chunks(input_path, chunk_size)
+    writer = ChunkWriter(output_path, input_schema)
+    rows = unscored = 0
+    start = time.perf_counter()
+
+    def report():
+        if quiet:
+            return
+        rate = rows / max(time.perf_counter() - start, 1e-9)
+        done = f"{rows:,}" + (f"/{total:,} ({100 * rows / total:.0f}%)" if total else "")
+        print(f"\r  scored {done} rows — {rate:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    def finish(df, result):
+        nonlocal rows, unscored
+        writer.write(_attach(df, result))
+        rows += len(df)
+        unscored += int((result[0] < 0).sum())
+        report()
+
+    try:
+        if workers == 1:
+            _load_scorer(model_path, single_threaded=False)
+            for df in chunks:
+                finish(df, score_chunk(_columns(df), len(df)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_load_scorer,
+                                     initargs=(model_path, True)) as pool:
+                # Bounded window of in-flight chunks, written in input order
+                pending = deque()
+                for df in chunks:
+                    pending.append((df, pool.submit(score_chunk, _columns(df), len(df))))
+                    while len(pending) >= 2 * workers or (pending and pending[0][1].done()):
+                        df_done, future = pending.popleft()
+                        finish(df_done, future.result())
+                while pending:
+                    df_done, future = pending.popleft()
+                    finish(df_done, future.result())
+    finally:
+        writer.close()
+
+    if not quiet:
+        elapsed = time.perf_counter() - start
+        print(f"\nDone: {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s), "
+              f"{unscored:,} unscored → {output_path}", file=sys.stderr)
+    return rows, unscored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a survey CSV/Parquet file with the DHS risk model.")
+    parser.add_argument("input", help="CSV or Parquet file of symptom records")
+    parser.add_argument("output", help="CSV or Parquet file to write (overwritten)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model bundle (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Scoring processes (default: CPU count; 1 scores in-process)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk (default: %(default)s)")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        sys.exit(f"Model not found: {args.model} (train it with scripts/train_risk_index_model.py)")
+    run(args.input, args.output, args.model, args.workers, args.chunk_size, args.quiet)
+
+
+if __name__ == "__main__":
+    main()
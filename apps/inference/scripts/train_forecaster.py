@@ -1,4 +1,5 @@
 import os
+import sys
 import warnings
 from collections import deque
 
@@ -12,6 +13,9 @@ warnings.filterwarnings("ignore")
 
 # Resolve paths relative to the project root (one level up from scripts/)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.utils import replace_atomically
 
 WINDOW_SIZE = 8 # Look back 8 weeks to predict the next week
 
@@ -55,7 +59,9 @@ def train_model():
 
     # Save the model
     print("Saving the AI model to disk...")
-    joblib.dump(model, os.path.join(BASE_DIR, 'models', 'outbreak_forecaster.pkl'))
+    # Rename into place: the server may be serving (and memory-mapping) the old file
+    replace_atomically(os.path.join(BASE_DIR, 'models', 'outbreak_forecaster.pkl'),
+                       lambda tmp: joblib.dump(model, tmp))
     print("\u2705 Model trained and saved to 'models/outbreak_forecaster.pkl'!")
 
     # Let's run a quick simulation to prove it works
@@ -1,6 +1,7 @@
 import glob
 import json
 import os
+import sys
 
 import cv2
 import numpy as np
@@ -8,6 +9,10 @@ import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from tensorflow.keras import layers, models
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import replace_atomically
+
 # Configuration
 IMG_SIZE = (64, 64) # Smaller size for the Gatekeeper (faster, focuses on global features)
 BATCH_SIZE = 32
@@ -102,8 +107,8 @@ threshold = np.percentile(mse, 99)
 print(f"✅ Normal Blood Smear MSE Loss is typically around: {np.mean(mse):.5f}")
 print(f"🚧 STRICT GATEKEEPER THRESHOLD SET AT: {threshold:.5f} MSE")
 
-# Save the model
-autoencoder.save(MODEL_SAVE_PATH)
+# Save the model (rename into place: a running server's model watcher may be reading it)
+replace_atomically(MODEL_SAVE_PATH, autoencoder.save)
 print(f"\n💾 Gatekeeper Model saved: {MODEL_SAVE_PATH}")
 
 # Save metadata and the crucial threshold!
@@ -28,6 +28,7 @@ NOT FOR:
 
 import json
 import os
+import sys
 
 import joblib
 import numpy as np
@@ -40,6 +41,10 @@ from sklearn.preprocessing import LabelEncoder
 
 # DHS file path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.utils import replace_atomically
+
 dhs_path = os.path.join(project_root, "data", "dhs", "india", "raw", "IAKR7EFL.DTA")
 
 print("="*70)
@@ -217,7 +222,8 @@ model_bundle = {
 }
 
 save_path = "models/malaria_symptoms_dhs.pkl"
-joblib.dump(model_bundle, save_path)
+# Rename into place: the server may be serving (and memory-mapping) the old file
+replace_atomically(save_path, lambda tmp: joblib.dump(model_bundle, tmp))
 print(f"✅ Model saved: {save_path}")
 
 # Update metadata
@@ -0,0 +1,59 @@
+"""
+Gunicorn Worker Memory Report
+-----------------------------
+Prints RSS, PSS and USS (memory unique to the process) for a gunicorn
+master and its workers, read from /proc/<pid>/smaps_rollup (Linux only).
+
+With preloading, model pages shared copy-on-write with the master count in
+each worker's RSS but not its USS, so USS is the number to size workers by:
+roughly (available memory - master RSS) / worker USS.
+
+Usage:
+  cd apps/inference
+  python -m scripts.worker_memory_report <gunicorn-master-pid>
+"""
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.utils import process_memory
+
+
+def child_pids(pid):
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(p) for p in f.read().split())
+        except OSError:
+            continue
+    return sorted(children)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    master = int(sys.argv[1])
+    workers = child_pids(master)
+
+    print(f"{'process':<18}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+    rows = [("master", master)] + [(f"worker {pid}", pid) for pid in workers]
+    uss = []
+    for label, pid in rows:
+        mem = process_memory(pid)
+        if mem is None:
+            print(f"{label:<18}{'n/a':>10}")
+            continue
+        print(f"{label:<18}{mem['rss_mb']:>10}{mem['pss_mb']:>10}{mem['uss_mb']:>10}")
+        if pid != master:
+            uss.append(mem["uss_mb"])
+
+    if uss:
+        print(f"\nmean worker USS: {sum(uss) / len(uss):.1f} MB across {len(uss)} workers")
+
+
+if __name__ == "__main__":
+    main()
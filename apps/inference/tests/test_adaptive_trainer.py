@@ -0,0 +1,160 @@
+"""
+Tests for core/adaptive_trainer.py — ensemble inference helpers.
+
+Uses the ``small_ensemble`` fixture (real sklearn models on synthetic data).
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from core.adaptive_config import WINDOW_SIZE
+from core.adaptive_trainer import (
+    _build_training_data,
+    _fit_ensemble_members,
+    _rolling_origin_backtest,
+    features_to_matrix,
+    format_ensemble_predictions,
+    predict_ensemble_batch,
+    predict_with_ensemble,
+)
+from core.feature_store import build_feature_row, get_feature_names
+
+
+def _reference_prediction(ensemble, X_row):
+    """Row-at-a-time scoring exactly as the original scalar implementation did it."""
+    X = X_row.reshape(1, -1)
+    p_primary = float(np.expm1(ensemble["primary"].predict(X)[0]))
+    p_alt = float(np.expm1(ensemble["alt"].predict(X)[0]))
+    point = max(0, 0.7 * p_primary + 0.3 * p_alt)
+    q = ensemble["quantile"]
+    p10 = float(np.expm1(q["q10"].predict(X)[0]))
+    p50 = float(np.expm1(q["q50"].predict(X)[0]))
+    p90 = float(np.expm1(q["q90"].predict(X)[0]))
+    p10 = max(0, min(p10, p50))
+    p90 = max(p50, p90)
+    agreement = max(0, 1.0 - abs(p_primary - p_alt) / max(point, 1))
+    return {
+        "point": round(point),
+        "p10": round(max(0, p10)),
+        "p50": round(max(0, p50)),
+        "p90": round(max(0, p90)),
+        "primary_pred": round(max(0, p_primary)),
+        "alt_pred": round(max(0, p_alt)),
+        "model_agreement": round(agreement, 3),
+    }
+
+
+def _reference_training_data(df):
+    """The original row-at-a-time training matrix builder."""
+    feature_names = get_feature_names()
+    X_rows, y_values = [], []
+    for region, group in df.groupby("Region"):
+        group = group.sort_values("Date")
+        cases = group["New_Cases"].values
+        dates = group["Date"].values
+        for i in range(WINDOW_SIZE, len(cases)):
+            features, _ = build_feature_row(region, cases[i - WINDOW_SIZE: i], date=pd.Timestamp(dates[i]))
+            X_rows.append([features.get(f, 0.0) for f in feature_names])
+            y_values.append(float(cases[i]))
+    return np.array(X_rows), np.array(y_values)
+
+
+def _outbreak_frame(regions, weeks, seed=0):
+    rng = np.random.RandomState(seed)
+    frames = []
+    for r, region in enumerate(regions):
+        dates = pd.date_range("2021-01-03", periods=weeks - r, freq="W")
+        cases = rng.poisson(lam=rng.uniform(5, 3000), size=len(dates))
+        cases[: 3 * r] = 0  # leading zeros exercise the +1e-6 guards
+        frames.append(pd.DataFrame({"Date": dates, "Region": region, "New_Cases": cases}))
+    # Shuffle so the builder has to sort within each region
+    return pd.concat(frames).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+class TestTrainingMatrix:
+    def test_matches_row_builder(self):
+        df = _outbreak_frame(["Kerala", "Delhi", "Bihar", "Unknown Region"], weeks=160)
+        X, y, names = _build_training_data(df)
+        X_ref, y_ref = _reference_training_data(df)
+
+        assert names == get_feature_names()
+        assert X.shape == X_ref.shape
+        np.testing.assert_allclose(X, X_ref, rtol=1e-9, atol=1e-12)
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_short_regions_are_skipped(self):
+        df = _outbreak_frame(["Kerala", "Delhi"], weeks=WINDOW_SIZE + 1)
+        X, y, _ = _build_training_data(df)
+        # Kerala has one target week, Delhi (one week shorter) has none
+        assert X.shape == (1, len(get_feature_names())) and len(y) == 1
+
+    def test_empty_frame(self):
+        df = _outbreak_frame(["Kerala"], weeks=WINDOW_SIZE)
+        X, y, _ = _build_training_data(df)
+        assert X.shape == (0, len(get_feature_names())) and len(y) == 0
+
+
+class TestParallelTraining:
+    @staticmethod
+    def _training_matrix():
+        df = _outbreak_frame(["Kerala", "Delhi", "Bihar"], weeks=60)
+        X, y, _ = _build_training_data(df)
+        return X, y
+
+    def test_pool_matches_serial(self):
+        X, y = self._training_matrix()
+        serial, serial_metrics, _ = _fit_ensemble_members(X, y, workers=1)
+        pooled, pooled_metrics, timings = _fit_ensemble_members(X, y, workers=3)
+
+        assert pooled_metrics == serial_metrics
+        for name in ("primary", "alt"):
+            assert pickle.dumps(pooled[name]) == pickle.dumps(serial[name])
+        assert pooled["quantile"].keys() == serial["quantile"].keys()
+        for name, model in serial["quantile"].items():
+            assert pickle.dumps(pooled["quantile"][name]) == pickle.dumps(model)
+        assert {"primary", "alt", "q10", "q50", "q90", "backtest_fold5"} <= timings.keys()
+
+    def test_backtest_matches_rolling_origin(self):
+        X, y = self._training_matrix()
+        _, metrics, _ = _fit_ensemble_members(X, y, workers=1)
+        assert metrics == _rolling_origin_backtest({}, X, y)
+
+    def test_too_few_rows_for_backtest(self):
+        X, y = self._training_matrix()
+        _, metrics, timings = _fit_ensemble_members(X[:40], y[:40], workers=1)
+        assert metrics == {"mae": float("inf"), "rmse": float("inf")}
+        assert not any(name.startswith("backtest") for name in timings)
+
+
+class TestBatchedEnsembleInference:
+    def test_batch_matches_row_at_a_time(self, small_ensemble):
+        rng = np.random.RandomState(1)
+        X = rng.normal(size=(25, len(small_ensemble["feature_names"])))
+
+        batched = format_ensemble_predictions(predict_ensemble_batch(small_ensemble, X))
+
+        assert batched == [_reference_prediction(small_ensemble, row) for row in X]
+
+    def test_quantiles_are_monotonic(self, small_ensemble):
+        rng = np.random.RandomState(2)
+        X = rng.normal(scale=3.0, size=(50, len(small_ensemble["feature_names"])))
+        batch = predict_ensemble_batch(small_ensemble, X)
+        assert np.all(batch["p10"] <= batch["p50"])
+        assert np.all(batch["p50"] <= batch["p90"])
+        assert np.all(batch["point"] >= 0)
+
+    def test_features_to_matrix_orders_and_defaults(self, small_ensemble):
+        names = small_ensemble["feature_names"]
+        rows = [{names[0]: 1.5, names[-1]: 2.0}, {}]
+        X = features_to_matrix(small_ensemble, rows)
+        assert X.shape == (2, len(names))
+        assert X[0, 0] == 1.5 and X[0, -1] == 2.0
+        assert not X[1].any()
+
+    def test_single_row_wrapper(self, small_ensemble):
+        names = small_ensemble["feature_names"]
+        features = {name: 0.25 for name in names}
+        expected = _reference_prediction(small_ensemble, np.full(len(names), 0.25))
+        assert predict_with_ensemble(small_ensemble, features) == expected
@@ -0,0 +1,145 @@
+"""
+Tests for core/auth.py — cached Clerk role lookups in get_caller_role.
+"""
+
+import base64
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core import auth
+
+
+def _request(sub="user_1"):
+    payload = base64.urlsafe_b64encode(json.dumps({"sub": sub}).encode()).decode().rstrip("=")
+    req = MagicMock()
+    req.headers = {"Authorization": f"Bearer h.{payload}.s"}
+    return req
+
+
+@pytest.fixture()
+def clerk():
+    with patch.object(auth, "CLERK_SECRET_KEY", "sk_test_x"), \
+         patch.object(auth, "clerk_request") as mock:
+        mock.return_value = ({"public_metadata": {"role": "admin"}}, 200)
+        yield mock
+
+
+class TestCallerRoleCache:
+    def test_role_is_cached(self, clerk):
+        assert auth.get_caller_role(_request()) == ("admin", "ok")
+        assert auth.get_caller_role(_request()) == ("admin", "ok")
+        clerk.assert_called_once_with("GET", "/users/user_1")
+
+    def test_missing_role_uses_negative_ttl(self, clerk):
+        clerk.return_value = ({"public_metadata": {}}, 200)
+        with patch.object(auth.role_cache.local, "set", wraps=auth.role_cache.local.set) as cache_set:
+            assert auth.get_caller_role(_request()) == (None, "ok")
+        assert cache_set.call_args.args[2] == auth.CLERK_ROLE_CACHE_NEGATIVE_TTL_SECONDS
+        auth.get_caller_role(_request())
+        assert clerk.call_count == 1
+
+    def test_unknown_user_is_negatively_cached(self, clerk):
+        clerk.return_value = ({"errors": ["not found"]}, 404)
+        role, reason = auth.get_caller_role(_request())
+        assert role is None and reason.startswith("clerk_api_error:404")
+        auth.get_caller_role(_request())
+        assert clerk.call_count == 1
+
+    def test_clerk_failures_are_not_cached(self, clerk):
+        clerk.side_effect = [TimeoutError("timed out"), ({"public_metadata": {"role": "doctor"}}, 200)]
+        role, reason = auth.get_caller_role(_request())
+        assert role is None and reason.startswith("exception:")
+        assert auth.get_caller_role(_request()) == ("doctor", "ok")
+
+    def test_invalidate_role_forces_lookup(self, clerk):
+        auth.get_caller_role(_request())
+        clerk.return_value = ({"public_metadata": {"role": "patient"}}, 200)
+        auth.invalidate_role("user_1")
+        assert auth.get_caller_role(_request()) == ("patient", "ok")
+        assert clerk.call_count == 2
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _jwks(*kids):
+    return {"keys": [{"kid": kid} for kid in kids]}
+
+
+@pytest.fixture()
+def from_jwk():
+    with patch.object(auth.RSAAlgorithm, "from_jwk", side_effect=lambda raw: f"key:{json.loads(raw)['kid']}") as mock:
+        yield mock
+
+
+class TestJWKSKeyCache:
+    def _cache(self, *responses):
+        clock = _Clock()
+        cache = auth.JWKSKeyCache("https://example.test/jwks", ttl=60, min_refresh_interval=10, timer=clock)
+        cache._download = MagicMock(side_effect=list(responses))
+        return cache, clock
+
+    def test_keys_parsed_once_per_fetch(self, from_jwk):
+        cache, _ = self._cache(_jwks("a", "b"))
+        assert cache.get("a") == "key:a"
+        assert cache.get("a") == "key:a"
+        assert cache.get("b") == "key:b"
+        assert cache._download.call_count == 1
+        assert from_jwk.call_count == 2
+
+    def test_unknown_kid_refetch_is_rate_limited(self, from_jwk):
+        cache, clock = self._cache(_jwks("a"), _jwks("a", "rotated"))
+        assert cache.get("rotated") is None
+        assert cache._download.call_count == 1
+        clock.now += 11
+        assert cache.get("rotated") == "key:rotated"
+        assert cache.get("a") == "key:a"   # old keys are not dropped on a miss
+
+    def test_failed_refresh_keeps_current_keys(self, from_jwk):
+        cache, clock = self._cache(_jwks("a"), OSError("timeout"))
+        cache.get("a")
+        clock.now += 11
+        assert cache.refresh() is False
+        assert cache.get("a") == "key:a"
+        assert cache.stats()["failures"] == 1
+
+    def test_stale_keys_served_while_refreshing(self, from_jwk):
+        cache, clock = self._cache(_jwks("a"), _jwks("a"))
+        cache.get("a")
+        clock.now += 61
+        with patch.object(cache, "_refresh_in_background") as background:
+            assert cache.get("a") == "key:a"
+        background.assert_called_once()
+
+
+class TestVerifiedTokens:
+    def test_verified_token_skips_rsa_until_exp(self):
+        exp = auth.time.time() + 60
+        with patch.object(auth.jwt, "get_unverified_header", return_value={"kid": "a"}), \
+             patch.object(auth, "get_clerk_public_key", return_value="key"), \
+             patch.object(auth.jwt, "decode") as decode:
+            assert auth.verify_token_signature("tok", exp) is True
+            assert auth.verify_token_signature("tok", exp) is True
+            assert auth.verify_token_signature("other", exp) is True
+        assert decode.call_count == 2
+        assert "tok" not in auth.verified_tokens._data
+
+    def test_failed_or_unverifiable_tokens_not_remembered(self):
+        with patch.object(auth.jwt, "get_unverified_header", return_value={"kid": "a"}), \
+             patch.object(auth, "get_clerk_public_key", return_value=None):
+            assert auth.verify_token_signature("tok", auth.time.time() + 60) is False
+        assert len(auth.verified_tokens) == 0
+
+    def test_token_without_exp_is_not_remembered(self):
+        with patch.object(auth.jwt, "get_unverified_header", return_value={"kid": "a"}), \
+             patch.object(auth, "get_clerk_public_key", return_value="key"), \
+             patch.object(auth.jwt, "decode"):
+            auth.verify_token_signature("tok")
+        assert len(auth.verified_tokens) == 0
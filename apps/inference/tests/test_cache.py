@@ -0,0 +1,199 @@
+"""
+Tests for core/cache.py — TTL/LRU cache and the fail-open Redis tier.
+"""
+
+import json
+import threading
+
+import pytest
+
+from core.cache import RedisTier, SingleFlight, TieredCache, TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeRedis:
+    """Just enough of the redis-py client API for RedisTier."""
+
+    def __init__(self, fail=False):
+        self.store = {}
+        self.ttls = {}
+        self.fail = fail
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    def get(self, key):
+        self._check()
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.store[key] = value
+        self.ttls[key] = ex
+
+    def pttl(self, key):
+        self._check()
+        if key not in self.store:
+            return -2
+        ex = self.ttls.get(key)
+        return -1 if ex is None else ex * 1000
+
+    def scan_iter(self, match, count=None):
+        self._check()
+        prefix = match.rstrip("*")
+        return [k for k in self.store if k.startswith(prefix)]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entries_expire_after_ttl(self):
+        clock = _Clock()
+        cache = TTLCache(maxsize=4, ttl=60, timer=clock)
+        cache.set("a", 1)
+        clock.now += 59
+        assert cache.get("a") == 1
+        clock.now += 1
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")          # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_per_entry_ttl_override(self):
+        clock = _Clock()
+        cache = TTLCache(maxsize=4, ttl=60, timer=clock)
+        cache.set("short", 1, ttl=5)
+        clock.now += 10
+        assert cache.get("short") is None
+
+
+class TestTieredCache:
+    def _cache(self, client):
+        cache = TieredCache("test", maxsize=4, ttl=60)
+        cache._remote = RedisTier(client, "test")
+        return cache
+
+    def test_remote_hit_populates_local(self):
+        client = _FakeRedis()
+        client.store["foresee:test:k"] = json.dumps({"v": 1})
+        cache = self._cache(client)
+
+        assert cache.get("k") == {"v": 1}
+        client.store.clear()
+        assert cache.get("k") == {"v": 1}
+        assert cache.stats()["local"]["hits"] == 1
+
+    def test_remote_hit_keeps_remaining_ttl(self):
+        clock = _Clock()
+        client = _FakeRedis()
+        client.set("foresee:test:k", json.dumps("none"), ex=15)
+        cache = self._cache(client)
+        cache.local._timer = clock
+
+        assert cache.get("k") == "none"
+        client.store.clear()
+        clock.now += 14
+        assert cache.get("k") == "none"
+        clock.now += 2
+        assert cache.get("k") is None
+
+    def test_set_writes_both_tiers_and_clear_drops_namespace(self):
+        client = _FakeRedis()
+        client.store["foresee:other:k"] = "1"
+        cache = self._cache(client)
+
+        cache.set("k", [1, 2])
+        assert json.loads(client.store["foresee:test:k"]) == [1, 2]
+
+        cache.clear()
+        assert "foresee:test:k" not in client.store
+        assert "foresee:other:k" in client.store
+        assert cache.get("k") is None
+
+    def test_invalidate_drops_both_tiers(self):
+        client = _FakeRedis()
+        cache = self._cache(client)
+
+        cache.set("k", 1)
+        cache.invalidate("k")
+        assert "foresee:test:k" not in client.store
+        assert cache.get("k") is None
+
+    def test_redis_errors_fail_open(self):
+        client = _FakeRedis(fail=True)
+        cache = self._cache(client)
+
+        cache.set("k", 1)
+        assert cache.get("k") == 1          # served from the local tier
+        cache.local.clear()
+        assert cache.get("k") is None
+        assert cache.stats()["redis"]["errors"] == 2
+
+    def test_no_redis_url_is_local_only(self):
+        cache = TieredCache("test", maxsize=4, ttl=60, redis_url="")
+        cache.set("k", 1)
+        assert cache.get("k") == 1
+        assert cache.stats()["redis"] is None
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        while flight.shared < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert calls == [1]
+        assert results == ["value"] * 5
+
+    def test_errors_propagate_and_are_not_kept(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("k", fail)
+        assert flight.do("k", lambda: 2) == 2
@@ -0,0 +1,209 @@
+"""
+Tests for core/drift_detector.py — incremental statistics must match a
+full numpy recompute, the bucketed ADWIN must react to mean shifts, and
+persisted state must merge across workers.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.drift_detector import (
+    Adwin,
+    DriftDetector,
+    RunningStats,
+    SplitWindow,
+    read_drift_state,
+)
+
+
+def _detector(path, max_window=50, **kwargs):
+    kwargs.setdefault("flush_seconds", None)
+    return DriftDetector(max_window=max_window, state_path=str(path), legacy_state_path=None, **kwargs)
+
+
+class TestRunningStats:
+    def test_add_and_remove_match_numpy(self):
+        rng = np.random.RandomState(0)
+        values = rng.normal(loc=50, scale=7, size=300)
+        stats = RunningStats()
+        for x in values:
+            stats.add(x)
+        for x in values[:120]:
+            stats.remove(x)
+        assert stats.n == 180
+        np.testing.assert_allclose(stats.mean, np.mean(values[120:]), rtol=1e-10)
+        np.testing.assert_allclose(stats.std, np.std(values[120:]), rtol=1e-8)
+
+    def test_remove_last_resets(self):
+        stats = RunningStats()
+        stats.add(3.0)
+        stats.remove(3.0)
+        assert (stats.n, stats.mean, stats.std) == (0, 0.0, 0.0)
+
+
+class TestSplitWindow:
+    def test_halves_match_array_split(self):
+        rng = np.random.RandomState(1)
+        values = rng.normal(size=2000).cumsum()
+        window = SplitWindow(maxlen=101)
+        for i, x in enumerate(values, start=1):
+            window.append(x)
+            if i in (1, 2, 7, 101, 102, 1999, 2000):
+                current = values[max(0, i - 101): i]
+                split = len(current) // 2
+                assert list(window) == list(current)
+                assert len(window.older) == split
+                if split:
+                    np.testing.assert_allclose(window.older.stats.mean, np.mean(current[:split]),
+                                               rtol=1e-9, atol=1e-9)
+                    np.testing.assert_allclose(window.older.stats.std, np.std(current[:split]),
+                                               rtol=1e-7, atol=1e-9)
+                np.testing.assert_allclose(window.newer.stats.mean, np.mean(current[split:]),
+                                           rtol=1e-9, atol=1e-9)
+
+
+class TestAdwin:
+    def test_stationary_stream_is_quiet(self):
+        rng = np.random.RandomState(2)
+        adwin = Adwin(delta=0.001, min_window=8)
+        for x in rng.normal(size=3000):
+            adwin.add(x)
+        assert not adwin.detect_change()
+        assert adwin.width == 3000
+        # Exponential histogram: O(log n) buckets
+        assert adwin.n_buckets <= 5 * (int(np.log2(3000)) + 1)
+
+    def test_mean_shift_is_detected_and_window_shrinks(self):
+        rng = np.random.RandomState(3)
+        adwin = Adwin(delta=0.001, min_window=8)
+        for x in rng.normal(size=2000):
+            adwin.add(x)
+        for x in rng.normal(loc=3.0, size=200):
+            adwin.add(x)
+        assert adwin.detect_change()
+        assert adwin.width < 2200
+        assert not adwin.detect_change()
+
+    def test_window_stats_match_numpy_under_max_width(self):
+        rng = np.random.RandomState(4)
+        values = rng.normal(loc=10, scale=2, size=5000)
+        adwin = Adwin(max_width=1000)
+        for x in values:
+            adwin.add(x)
+        tail = values[-adwin.width:]
+        assert 500 < adwin.width <= 1000
+        np.testing.assert_allclose(adwin.mean, np.mean(tail), rtol=1e-9)
+        np.testing.assert_allclose(adwin.m2 / adwin.width, np.var(tail), rtol=1e-6)
+
+
+class TestDriftDetector:
+    def test_residual_shift_is_flagged(self, tmp_path):
+        detector = _detector(tmp_path / "drift_state.npz", max_window=200)
+        rng = np.random.RandomState(5)
+        for r in rng.normal(scale=5, size=150):
+            detector.record_residual(r, 0.0)
+        assert detector.check_drift()["status"] == "stable"
+        for r in rng.normal(loc=60, scale=5, size=50):
+            detector.record_residual(r, 0.0)
+        result = detector.check_drift()
+        assert result["residual_drift"] and result["drift_detected"]
+
+    def test_state_roundtrip(self, tmp_path):
+        path = tmp_path / "drift_state.npz"
+        detector = _detector(path)
+        for i in range(80):
+            detector.record_residual(float(i), 0.0)
+            detector.record_features({"rainfall": i * 0.5, "label": "x"})
+        assert detector.save_state()
+
+        restored = _detector(path)
+        assert list(restored.residuals) == list(detector.residuals)
+        assert list(restored.feature_history["rainfall"]) == list(detector.feature_history["rainfall"])
+        np.testing.assert_allclose(restored.residuals.older.stats.mean,
+                                   detector.residuals.older.stats.mean, rtol=1e-12)
+        # Atomic rename leaves no temp files behind
+        assert sorted(os.listdir(tmp_path)) == ["drift_state.npz", "drift_state.npz.lock"]
+
+    def test_check_drift_does_not_write(self, tmp_path):
+        path = tmp_path / "drift_state.npz"
+        detector = _detector(path)
+        for r in range(40):
+            detector.record_residual(float(r % 3), 0.0)
+        detector.check_drift()
+        assert not path.exists()
+        assert detector.save_state()
+        assert not detector.save_state()  # nothing new to merge
+
+    def test_workers_merge_instead_of_clobbering(self, tmp_path):
+        path = tmp_path / "drift_state.npz"
+        worker_a, worker_b = _detector(path, max_window=10), _detector(path, max_window=10)
+        for i in range(4):
+            worker_a.record_residual(1.0 + i, 0.0)
+            worker_b.record_residual(100.0 + i, 0.0)
+        worker_b.record_features({"rainfall": 7.0})
+        worker_a.save_state()
+        worker_b.save_state()
+
+        state = read_drift_state(str(path))
+        assert state["residuals"] == [1.0, 2.0, 3.0, 4.0, 100.0, 101.0, 102.0, 103.0]
+        assert state["feature_history"] == {"rainfall": [7.0]}
+
+        for i in range(5):
+            worker_a.record_residual(200.0 + i, 0.0)
+        worker_a.save_state()
+        assert len(read_drift_state(str(path))["residuals"]) == 10
+
+    def test_concurrent_saves_in_one_process_both_land(self, tmp_path, monkeypatch):
+        import core.drift_detector as dd
+        path = tmp_path / "drift_state.npz"
+        detector = _detector(path)
+        writing, write = threading.Event(), dd.write_drift_state
+
+        def slow_write(p, state):
+            if not writing.is_set():
+                writing.set()
+                time.sleep(0.2)  # the second save arrives mid-write
+            write(p, state)
+
+        monkeypatch.setattr(dd, "write_drift_state", slow_write)
+        detector.record_residual(1.0, 0.0)
+        first = threading.Thread(target=detector.save_state)  # e.g. the write-behind thread
+        first.start()
+        assert writing.wait(5)
+        detector.record_residual(2.0, 0.0)
+        detector.save_state()  # e.g. atexit
+        first.join(5)
+
+        assert read_drift_state(str(path))["residuals"] == [1.0, 2.0]
+
+    def test_imports_legacy_json(self, tmp_path):
+        legacy = tmp_path / "drift_state.json"
+        legacy.write_text(json.dumps({
+            "residuals": [1.0, 2.0, 3.0],
+            "feature_history": {"rainfall": [0.5, 0.6]},
+            "drift_events": [{"time": 1.0, "drift_score": 0.7, "details": []}],
+            "last_drift_time": 1.0,
+        }))
+        path = tmp_path / "drift_state.npz"
+        detector = DriftDetector(state_path=str(path), legacy_state_path=str(legacy), flush_seconds=None)
+        assert list(detector.residuals) == [1.0, 2.0, 3.0]
+
+        assert detector.save_state()
+        state = read_drift_state(str(path))
+        assert state["residuals"] == [1.0, 2.0, 3.0]
+        assert state["drift_events"][0]["drift_score"] == 0.7
+
+    def test_write_behind_thread_flushes(self, tmp_path):
+        path = tmp_path / "drift_state.npz"
+        detector = _detector(path, flush_seconds=0.05)
+        for r in range(40):
+            detector.record_residual(float(r % 3), 0.0)
+        detector.check_drift()
+        deadline = time.time() + 5
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.02)
+        assert len(read_drift_state(str(path))["residuals"]) == 40
@@ -0,0 +1,130 @@
+"""
+Tests for core/feature_cache.py — SQLite-backed signal and weekly weather cache.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from core.feature_cache import FeatureCache
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return FeatureCache(str(tmp_path / "features.sqlite3"), legacy_json_paths=())
+
+
+def _write_keys(path, worker, n):
+    cache = FeatureCache(path, legacy_json_paths=())
+    for i in range(n):
+        cache.put("news", f"w{worker}_{i}", {"i": i})
+
+
+class TestSignals:
+    def test_round_trip(self, cache):
+        assert cache.get("news", "Kerala") is None
+        cache.put("news", "Kerala", {"article_count": 3})
+        data, updated_at = cache.get("news", "Kerala")
+        assert data == {"article_count": 3}
+        assert time.time() - updated_at < 5
+
+    def test_put_replaces_single_key(self, cache):
+        cache.put("nowcast", "Kerala", {"temperature": 28.0})
+        cache.put("nowcast", "Kerala", {"temperature": 30.0})
+        cache.put("nowcast", "Delhi", {"temperature": 35.0})
+        assert cache.get("nowcast", "Kerala")[0] == {"temperature": 30.0}
+        assert cache.stats()["signals"] == {"nowcast": 2}
+
+    def test_concurrent_threads(self, cache):
+        threads = [
+            threading.Thread(target=lambda w=w: [cache.put("news", f"{w}_{i}", i) for i in range(50)])
+            for w in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert cache.stats()["signals"]["news"] == 200
+
+    def test_concurrent_processes(self, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_write_keys, args=(path, w, 50)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=30)
+            assert p.exitcode == 0
+        assert FeatureCache(path, legacy_json_paths=()).stats()["signals"]["news"] == 200
+
+
+class TestWeeklyWeather:
+    def test_overlapping_fetches_share_weeks(self, cache):
+        cache.put_weekly_weather("Kerala", [
+            {"week_start": "2025-01-06T00:00:00", "temp_c_mean": 27.0, "humidity_mean": 80.0, "precip_mm_sum": 4.0},
+            {"week_start": "2025-01-13T00:00:00", "temp_c_mean": 28.0, "humidity_mean": 78.0, "precip_mm_sum": 0.0},
+        ])
+        cache.put_weekly_weather("Kerala", [
+            {"week_start": "2025-01-13T00:00:00", "temp_c_mean": 29.0, "humidity_mean": 75.0, "precip_mm_sum": 1.0},
+        ])
+
+        rows = cache.get_weekly_weather("Kerala", "2025-01-01T00:00:00", "2025-01-31T00:00:00")
+        assert [r["week_start"] for r in rows] == ["2025-01-06T00:00:00", "2025-01-13T00:00:00"]
+        assert rows[1]["temp_c_mean"] == 29.0
+        assert cache.get_weekly_weather("Delhi", "2025-01-01", "2025-12-31") == []
+
+
+class TestMaintenance:
+    def test_evict_expired(self, cache):
+        cache.put("news", "old", 1, updated_at=time.time() - 3600)
+        cache.put("news", "new", 2)
+        cache.put_weekly_weather("Kerala", [{"week_start": "2025-01-06T00:00:00"}],
+                                 updated_at=time.time() - 3600)
+
+        assert cache.evict_expired(max_age_seconds=60) == 2
+        assert cache.get("news", "old") is None
+        assert cache.get("news", "new") is not None
+
+    def test_compact_shrinks_file(self, cache):
+        for i in range(2000):
+            cache.put("news", f"k{i}", {"headlines": ["x" * 200]}, updated_at=1.0)
+        cache.compact()
+        assert cache.stats()["signals"] == {}
+        assert os.path.getsize(cache.path) < 64 * 1024
+
+    def test_long_lived_process_compacts_periodically(self, cache, monkeypatch):
+        from core import feature_cache as fc
+
+        monkeypatch.setattr(fc, "FEATURE_CACHE_COMPACT_CHECK_WRITES", 10)
+        monkeypatch.setattr(fc, "FEATURE_CACHE_COMPACT_INTERVAL_HOURS", 0)
+        cache.put("news", "stale", 1, updated_at=1.0)   # first write opens + stamps the db
+        for i in range(8):
+            cache.put("news", f"k{i}", i)
+        assert cache.get("news", "stale") is not None
+        cache.put("news", "k8", 8)                      # 10th write: compaction is due
+        assert cache.get("news", "stale") is None
+        assert cache.stats()["signals"] == {"news": 9}
+
+    def test_legacy_json_is_imported_once(self, tmp_path):
+        weather = tmp_path / "weather_cache.json"
+        news = tmp_path / "news_cache.json"
+        weather.write_text(json.dumps({
+            "nowcast_Kerala": {"data": {"temperature": 31.0}, "timestamp": time.time()},
+            "Kerala_2025-01-01_2025-03-01": {"data": [], "timestamp": time.time()},
+        }))
+        news.write_text(json.dumps({
+            "news_Kerala": {"data": {"article_count": 9}, "timestamp": time.time()},
+        }))
+        path = str(tmp_path / "features.sqlite3")
+
+        cache = FeatureCache(path, legacy_json_paths=(str(weather), str(news)))
+        assert cache.get("nowcast", "Kerala")[0] == {"temperature": 31.0}
+        assert cache.get("news", "Kerala")[0] == {"article_count": 9}
+
+        cache.put("news", "Kerala", {"article_count": 1})
+        reopened = FeatureCache(path, legacy_json_paths=(str(weather), str(news)))
+        assert reopened.get("news", "Kerala")[0] == {"article_count": 1}
@@ -0,0 +1,160 @@
+"""
+Tests for core/feature_store.py — live signal fetching against a local
+stub HTTP server (no external network).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from core import feature_store
+from core.feature_cache import FeatureCache
+
+RSS = (
+    "<rss><channel>"
+    + "".join(f"<item><title>Dengue cases rise {i}</title></item>" for i in range(7))
+    + "</channel></rss>"
+).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        url = urlparse(self.path)
+        server.requests.append((url.path, parse_qs(url.query), self.client_address[1]))
+        time.sleep(server.delay)
+
+        if server.fail:
+            body, status, ctype = b"error", 500, "text/plain"
+        elif url.path == "/forecast":
+            current = {"temperature_2m": 30.0, "relative_humidity_2m": 80.0, "precipitation": 2.5}
+            body, status, ctype = json.dumps({"current": current}).encode(), 200, "application/json"
+        elif url.path == "/archive":
+            query = parse_qs(url.query)
+            days = pd.date_range(query["start_date"][0], query["end_date"][0], freq="D")
+            daily = {
+                "time": [d.strftime("%Y-%m-%d") for d in days],
+                "temperature_2m_mean": [25.0 + d.day % 5 for d in days],
+                "relative_humidity_2m_mean": [70.0] * len(days),
+                "precipitation_sum": [1.0] * len(days),
+            }
+            body, status, ctype = json.dumps({"daily": daily}).encode(), 200, "application/json"
+        elif url.path == "/rss":
+            body, status, ctype = RSS, 200, "application/rss+xml"
+        else:
+            body, status, ctype = b"not found", 404, "text/plain"
+
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_api(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.requests, server.delay, server.fail = [], 0.0, False
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(feature_store, "OPEN_METEO_FORECAST_URL", f"{base}/forecast")
+    monkeypatch.setattr(feature_store, "OPEN_METEO_ARCHIVE_URL", f"{base}/archive")
+    monkeypatch.setattr(feature_store, "GOOGLE_NEWS_RSS_URL", f"{base}/rss")
+    monkeypatch.setattr(feature_store, "feature_cache",
+                        FeatureCache(str(tmp_path / "features.sqlite3"), legacy_json_paths=()))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestLiveSignals:
+    def test_current_weather_from_api(self, stub_api):
+        weather = feature_store.fetch_current_weather("Kerala")
+        assert weather["temperature"] == 30.0 and weather["fresh"] is True
+        assert weather["risk_multiplier"] == pytest.approx(1.7)
+
+        path, params, _ = stub_api.requests[0]
+        assert path == "/forecast"
+        assert params["latitude"] == [str(feature_store.REGION_COORDS["Kerala"]["lat"])]
+
+    def test_news_signal_from_rss(self, stub_api):
+        news = feature_store.fetch_news_signal("Kerala")
+        assert news["article_count"] == 7
+        assert news["news_risk_score"] == 1.3
+        assert news["headlines"] == ["Dengue cases rise 0", "Dengue cases rise 1", "Dengue cases rise 2"]
+        assert stub_api.requests[0][1]["q"] == ["Kerala (dengue OR malaria OR outbreak OR virus)"]
+
+    def test_second_lookup_is_served_from_cache(self, stub_api):
+        feature_store.fetch_current_weather("Kerala")
+        feature_store.fetch_current_weather("Kerala")
+        assert len(stub_api.requests) == 1
+
+    def test_api_failure_falls_back_to_stale_cache(self, stub_api, monkeypatch):
+        feature_store.fetch_current_weather("Kerala")
+        monkeypatch.setattr(feature_store, "WEATHER_CACHE_TTL_HOURS", 0)
+        stub_api.fail = True
+
+        weather = feature_store.fetch_current_weather("Kerala")
+        assert weather["temperature"] == 30.0 and weather["fresh"] is False
+
+    def test_archive_weeks_are_shared_across_ranges(self, stub_api):
+        weeks, fresh = feature_store.fetch_weather_for_region("Kerala", "2025-01-06", "2025-02-02")
+        assert fresh and len(weeks) == 4
+        assert weeks[0]["week_start"] == "2025-01-06T00:00:00"
+
+        # Served from the cache without another request
+        assert feature_store.fetch_weather_for_region("Kerala", "2025-01-06", "2025-02-02")[0] == weeks
+        assert len(stub_api.requests) == 1
+
+        # An overlapping range upserts the same weeks rather than duplicating them
+        feature_store.fetch_weather_for_region("Kerala", "2025-01-20", "2025-02-16")
+        assert feature_store.feature_cache.stats()["weekly_weather_rows"] == 6
+
+        stub_api.fail = True
+        stale, fresh = feature_store.fetch_weather_for_region("Kerala", "2025-01-01", "2025-01-19")
+        assert not fresh and [w["week_start"][:10] for w in stale] == ["2025-01-06", "2025-01-13"]
+
+    def test_session_reuses_connections(self, stub_api):
+        for region in ["Kerala", "Delhi", "Bihar", "Assam"]:
+            feature_store.fetch_current_weather(region)
+        client_ports = {port for _, _, port in stub_api.requests}
+        assert len(stub_api.requests) == 4
+        assert len(client_ports) == 1
+
+
+class TestConcurrentFetch:
+    def test_exogenous_fetches_weather_and_news_together(self, stub_api):
+        stub_api.delay = 0.3
+        start = time.perf_counter()
+        weather, news = feature_store.fetch_exogenous("Kerala")
+        elapsed = time.perf_counter() - start
+
+        assert weather["temperature"] == 30.0 and news["article_count"] == 7
+        assert elapsed < 0.55
+
+    def test_bulk_fetch_is_parallel_and_ordered(self, stub_api):
+        regions = ["Kerala", "Delhi", "Bihar", "Assam"]
+        stub_api.delay = 0.2
+        start = time.perf_counter()
+        weather_list, news_list = feature_store.fetch_exogenous_bulk(regions)
+        elapsed = time.perf_counter() - start
+
+        assert len(weather_list) == len(news_list) == 4
+        assert all(w["fresh"] for w in weather_list)
+        assert len(stub_api.requests) == 8
+        assert elapsed < 8 * 0.2 / 2
+
+        assert all(feature_store.feature_cache.get("nowcast", r) for r in regions)
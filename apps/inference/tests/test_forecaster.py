@@ -0,0 +1,65 @@
+"""
+Tests for core/forecaster.py — lockstep multi-region rollouts.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from core.forecaster import rollout_ensemble, rollout_legacy
+
+WEATHER = {"temperature": 29.0, "humidity": 72.0, "precipitation": 0.5, "risk_multiplier": 1.4, "fresh": True}
+NEWS = {"article_count": 3, "news_risk_score": 1.1, "headlines": [], "fresh": True}
+
+
+def _windows():
+    rng = np.random.RandomState(0)
+    return [rng.randint(50, 900, size=20) for _ in range(3)]
+
+
+class TestRolloutEnsemble:
+    @patch("core.forecaster.np.random.normal", return_value=0.0)
+    def test_lockstep_matches_per_region(self, _noise, small_ensemble):
+        regions = ["Kerala", "Delhi", "Bihar"]
+        windows = _windows()
+        last_dates = [datetime(2025, 1, 5), datetime(2025, 1, 12), datetime(2025, 1, 5)]
+
+        together = rollout_ensemble(small_ensemble, regions, windows, last_dates,
+                                    [WEATHER] * 3, [NEWS] * 3, horizon_weeks=6)
+        separately = [
+            rollout_ensemble(small_ensemble, [r], [w], [d], [WEATHER], [NEWS], horizon_weeks=6)[0]
+            for r, w, d in zip(regions, windows, last_dates, strict=True)
+        ]
+
+        assert [r["predictions"] for r in together] == [r["predictions"] for r in separately]
+        assert together[1]["predictions"][0]["week"] == "2025-01-19"
+
+    def test_first_step_is_kept_for_explainability(self, small_ensemble):
+        rollout = rollout_ensemble(small_ensemble, ["Kerala"], _windows()[:1], [datetime(2025, 1, 5)],
+                                   [WEATHER], [NEWS], horizon_weeks=3)[0]
+        assert rollout["first_features"]["region_id"] >= 0
+        assert rollout["first_result"]["point"] == rollout["predictions"][0]["point"]
+
+
+class TestRolloutLegacy:
+    def test_matches_row_at_a_time_loop(self):
+        rng = np.random.RandomState(1)
+        X = np.log1p(rng.randint(10, 2000, size=(300, 8)))
+        model = HistGradientBoostingRegressor(max_iter=30, random_state=0).fit(X, X[:, -1])
+        windows = _windows()
+        last_date = datetime(2025, 1, 5)
+
+        rollouts = rollout_legacy(model, windows, [last_date] * 3, horizon_weeks=5)
+
+        for window, rollout in zip(windows, rollouts, strict=True):
+            current = deque(window[-8:], maxlen=8)
+            expected = []
+            for i in range(5):
+                pred = max(0, int(np.expm1(model.predict(np.log1p(np.array([current])))[0])))
+                current.append(pred)
+                expected.append({"week": (last_date + timedelta(weeks=i + 1)).strftime("%Y-%m-%d"),
+                                 "cases": pred})
+            assert rollout == expected
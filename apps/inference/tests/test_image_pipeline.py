@@ -0,0 +1,104 @@
+"""
+Tests for core/image_pipeline.py — the single-decode, in-memory views must
+match the old temp-file path (Keras ``load_img`` at each size, then
+``cv2.imread`` for the grayscale validator).
+
+conftest mocks cv2 globally, so these tests load the real module and skip
+when OpenCV isn't installed.
+"""
+
+import importlib
+import io
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from core.image_pipeline import decode_image, preprocess_image
+
+
+def _cv2_entries():
+    return {name: mod for name, mod in sys.modules.items() if name == "cv2" or name.startswith("cv2.")}
+
+
+@pytest.fixture(scope="module")
+def _real_cv2_modules():
+    """Import the real OpenCV once, with the mocked cv2 entries set aside."""
+    mocked = _cv2_entries()
+    for name in mocked:
+        del sys.modules[name]
+    try:
+        importlib.import_module("cv2")
+        real = _cv2_entries()
+    except ImportError:
+        real = None
+    finally:
+        for name in _cv2_entries():
+            del sys.modules[name]
+        sys.modules.update(mocked)
+    if real is None:
+        pytest.skip("OpenCV not installed")
+    return real
+
+
+@pytest.fixture()
+def real_cv2(monkeypatch, _real_cv2_modules):
+    for name, module in _real_cv2_modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return _real_cv2_modules["cv2"]
+
+
+def _encode(array, fmt, **save_kwargs):
+    buf = io.BytesIO()
+    Image.fromarray(array).save(buf, format=fmt, **save_kwargs)
+    return buf.getvalue()
+
+
+def _keras_load_img_array(file_bytes, size):
+    """What ``img_to_array(load_img(path, target_size=size)) / 255.0`` produces."""
+    img = Image.open(io.BytesIO(file_bytes)).convert("RGB")
+    img = img.resize(size, Image.NEAREST)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def _smear(height, width, channels=3, seed=0):
+    rng = np.random.RandomState(seed)
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    return rng.randint(0, 256, size=shape, dtype=np.uint8)
+
+
+class TestPreprocessParity:
+    @pytest.mark.parametrize("shape", [(300, 400), (128, 128), (97, 61), (40, 50)])
+    @pytest.mark.parametrize("fmt", ["PNG", "BMP", "TIFF"])
+    def test_lossless_views_match_temp_file_path(self, real_cv2, tmp_path, shape, fmt):
+        file_bytes = _encode(_smear(*shape), fmt)
+        views = preprocess_image(file_bytes)
+
+        assert views.cnn.dtype == np.float32 and views.cnn.shape == (128, 128, 3)
+        assert views.gatekeeper.shape == (64, 64, 3)
+        np.testing.assert_array_equal(views.cnn, _keras_load_img_array(file_bytes, (128, 128)))
+        np.testing.assert_array_equal(views.gatekeeper, _keras_load_img_array(file_bytes, (64, 64)))
+
+        path = tmp_path / f"upload.{fmt.lower()}"
+        path.write_bytes(file_bytes)
+        expected_gray = real_cv2.cvtColor(real_cv2.imread(str(path)), real_cv2.COLOR_BGR2GRAY)
+        np.testing.assert_array_equal(views.gray, expected_gray)
+
+    def test_grayscale_and_rgba_inputs(self, real_cv2):
+        for array in (_smear(80, 90, channels=1), _smear(80, 90, channels=4)):
+            file_bytes = _encode(array, "PNG")
+            views = preprocess_image(file_bytes)
+            np.testing.assert_array_equal(views.cnn, _keras_load_img_array(file_bytes, (128, 128)))
+
+    def test_jpeg_within_decoder_tolerance(self, real_cv2):
+        file_bytes = _encode(_smear(240, 320, seed=3), "JPEG", quality=90)
+        views = preprocess_image(file_bytes)
+        # libjpeg builds may round the IDCT differently by a level or two
+        np.testing.assert_allclose(views.cnn, _keras_load_img_array(file_bytes, (128, 128)),
+                                   atol=3 / 255.0)
+
+    def test_undecodable_bytes_raise(self, real_cv2):
+        assert decode_image(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64) is None
+        with pytest.raises(ValueError):
+            preprocess_image(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
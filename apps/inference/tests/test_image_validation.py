@@ -0,0 +1,76 @@
+"""
+Tests for core/image_validation.py — stage ordering, early exit and the
+per-stage counters.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.image_validation import StagedValidator, ValidationStage
+
+REJECT = {"label": "Invalid Image"}
+
+
+def _stage(name, calls, reject=False, prior=0.01, **kwargs):
+    def check(views, models):
+        calls.append(name)
+        return REJECT if reject else None
+    return ValidationStage(name, check, prior_seconds=prior, **kwargs)
+
+
+class TestStagedValidator:
+    def test_auto_order_runs_cheapest_first_and_exits_early(self):
+        calls = []
+        validator = StagedValidator([
+            _stage("model", calls, prior=0.05, uses_model=True),
+            _stage("cheap", calls, reject=True, prior=0.001),
+        ], order="auto")
+
+        started = []
+        stage, rejection = validator.run(None, None, before_model_stage=lambda: started.append(1))
+
+        assert (stage, rejection) == ("cheap", REJECT)
+        assert calls == ["cheap"]
+        assert not started  # rejected before any model stage
+        stats = validator.stats()
+        assert stats["stages"]["cheap"]["rejections"] == 1
+        assert stats["stages"]["model"]["calls"] == 0
+
+    def test_order_adapts_to_rejection_rate(self):
+        calls = []
+        slow_but_decisive = _stage("decisive", calls, reject=True, prior=0.004)
+        fast_but_lenient = _stage("lenient", calls, prior=0.001)
+        slow_but_decisive.calls, slow_but_decisive.rejections = 100, 95
+        fast_but_lenient.calls = 100
+        fast_but_lenient.total_seconds, slow_but_decisive.total_seconds = 0.1, 0.4
+
+        validator = StagedValidator([fast_but_lenient, slow_but_decisive], order="auto")
+        assert [s.name for s in validator.ordered()] == ["decisive", "lenient"]
+
+    def test_fixed_order_and_model_hook(self):
+        calls, started = [], []
+        validator = StagedValidator([
+            _stage("a", calls),
+            _stage("m1", calls, uses_model=True),
+            _stage("m2", calls, uses_model=True),
+        ], order="m1, a, m2")
+
+        def hook():
+            started.append(list(calls))
+
+        assert validator.run(None, None, before_model_stage=hook) == (None, None)
+        assert calls == ["m1", "a", "m2"]
+        assert started == [[]]  # called once, before the first model stage
+
+    def test_inapplicable_stages_are_skipped(self):
+        calls = []
+        validator = StagedValidator([
+            _stage("gatekeeper", calls, reject=True, applies=lambda models: models.gatekeeper_model),
+        ])
+        assert validator.run(None, SimpleNamespace(gatekeeper_model=None)) == (None, None)
+        assert calls == []
+
+    def test_unknown_stage_in_order(self):
+        with pytest.raises(ValueError, match="bogus"):
+            StagedValidator([_stage("a", [])], order="a,bogus")
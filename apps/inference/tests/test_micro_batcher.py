@@ -0,0 +1,186 @@
+"""
+Tests for core/micro_batcher.py — concurrent single-sample calls are
+coalesced into batched predict calls and each caller gets its own row.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.micro_batcher import MicroBatcher
+
+
+class _RecordingModel:
+    """Stand-in Keras model: doubles its input and records batch sizes."""
+
+    def __init__(self, gate=None):
+        self.batch_sizes = []
+        self.gate = gate
+
+    def predict(self, X, verbose=0):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batch_sizes.append(len(X))
+        return X * 2.0
+
+
+def _submit_concurrently(batcher, model, samples):
+    results = [None] * len(samples)
+
+    def _call(i):
+        results[i] = batcher.predict(model, samples[i], timeout=10)
+
+    threads = [threading.Thread(target=_call, args=(i,)) for i in range(len(samples))]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+class TestMicroBatcher:
+    def test_results_fan_back_to_callers(self):
+        batcher = MicroBatcher("test", max_batch_size=8, max_wait_ms=50)
+        model = _RecordingModel()
+        samples = [np.full((4, 4, 3), i, dtype=np.float32) for i in range(20)]
+
+        threads, results = _submit_concurrently(batcher, model, samples)
+        for t in threads:
+            t.join()
+
+        for i, out in enumerate(results):
+            np.testing.assert_array_equal(out, samples[i] * 2.0)
+        assert sum(model.batch_sizes) == 20
+        assert max(model.batch_sizes) <= 8
+        assert len(model.batch_sizes) < 20  # some requests shared a call
+
+    def test_burst_fills_batches(self):
+        # Hold the first call so the rest of the burst queues up behind it
+        gate = threading.Event()
+        batcher = MicroBatcher("test", max_batch_size=4, max_wait_ms=1)
+        model = _RecordingModel(gate=gate)
+        samples = [np.ones(3) * i for i in range(9)]
+
+        threads, _ = _submit_concurrently(batcher, model, samples)
+        while batcher._queue.qsize() < 8 - 3:  # first batch is in flight
+            time.sleep(0.01)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert sum(model.batch_sizes) == 9
+        assert model.batch_sizes.count(4) >= 1
+
+    def test_errors_propagate_to_every_caller(self):
+        class _Broken:
+            def predict(self, X, verbose=0):
+                raise RuntimeError("boom")
+
+        batcher = MicroBatcher("test", max_batch_size=4, max_wait_ms=20)
+        errors = []
+
+        def _call():
+            try:
+                batcher.predict(_Broken(), np.zeros(2), timeout=10)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=_call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == ["boom"] * 3
+
+    def test_wrong_row_count_fails_every_caller(self):
+        class _Short:
+            def predict(self, X, verbose=0):
+                return X[:-1]
+
+        batcher, model = MicroBatcher("test", max_batch_size=4, max_wait_ms=50), _Short()
+        errors = []
+
+        def _call():
+            try:
+                batcher.predict(model, np.zeros(2), timeout=10)
+            except ValueError:
+                errors.append("short")
+
+        threads = [threading.Thread(target=_call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == ["short"] * 3
+
+    def test_stalled_batch_times_out_and_drops_sample(self):
+        gate = threading.Event()
+        batcher = MicroBatcher("test", max_batch_size=4, max_wait_ms=1, timeout=0.05)
+        model = _RecordingModel(gate=gate)
+
+        first = batcher.submit(model, np.ones(2))  # holds the worker until released
+        while not first.running():
+            time.sleep(0.001)
+        with pytest.raises(TimeoutError):
+            batcher.predict(model, np.zeros(2))
+        gate.set()
+        np.testing.assert_array_equal(first.result(timeout=10), [2.0, 2.0])
+        assert batcher.stats()["samples"] == 1
+
+    def test_failure_outside_the_model_call_resolves_batch(self, monkeypatch):
+        batcher = MicroBatcher("test", max_batch_size=4, max_wait_ms=20)
+        model = _RecordingModel()
+        run_group = batcher._run_group
+
+        def _broken(items):
+            monkeypatch.setattr(batcher, "_run_group", run_group)  # fail once
+            raise RuntimeError("grouping bug")
+
+        monkeypatch.setattr(batcher, "_run_group", _broken)
+        with pytest.raises(RuntimeError, match="grouping bug"):
+            batcher.predict(model, np.ones(2), timeout=10)
+        np.testing.assert_array_equal(batcher.predict(model, np.ones(2), timeout=10), [2.0, 2.0])
+        assert batcher._thread.is_alive()
+
+    def test_batch_size_one_runs_inline(self):
+        batcher = MicroBatcher("test", max_batch_size=1)
+        model = _RecordingModel()
+        out = batcher.predict(model, np.array([1.0, 2.0]))
+        np.testing.assert_array_equal(out, [2.0, 4.0])
+        assert batcher._thread is None
+        assert batcher.stats()["samples"] == 1
+
+    def test_different_models_are_not_mixed(self):
+        batcher = MicroBatcher("test", max_batch_size=8, max_wait_ms=50)
+        old, new = _RecordingModel(), _RecordingModel()
+        threads = [
+            threading.Thread(target=batcher.predict, args=(m, np.ones(2)), kwargs={"timeout": 10})
+            for m in (old, new, old, new)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(old.batch_sizes) == 2 and sum(new.batch_sizes) == 2
+
+    @pytest.mark.parametrize("wait_ms", [0, 2])
+    def test_single_request_does_not_stall(self, wait_ms):
+        batcher = MicroBatcher("test", max_batch_size=16, max_wait_ms=wait_ms)
+        out = batcher.predict(_RecordingModel(), np.array([3.0]), timeout=5)
+        np.testing.assert_array_equal(out, [6.0])
+
+    def test_cancelled_samples_are_dropped(self):
+        gate = threading.Event()
+        batcher = MicroBatcher("test", max_batch_size=4, max_wait_ms=1)
+        model = _RecordingModel(gate=gate)
+        first = batcher.submit(model, np.ones(2))
+        while batcher._queue.qsize():  # first batch is in flight
+            time.sleep(0.01)
+        dropped = batcher.submit(model, np.ones(2))
+        kept = batcher.submit(model, np.ones(2))
+        assert dropped.cancel()
+        gate.set()
+
+        np.testing.assert_array_equal(kept.result(timeout=5), [2.0, 2.0])
+        first.result(timeout=5)
+        assert model.batch_sizes == [1, 1]
@@ -0,0 +1,206 @@
+"""
+Tests for core/ml_loader.py — lazy loading, readiness tracking and hot
+reloads. Fake per-model loaders stand in for the real artifacts.
+"""
+
+import threading
+import time
+
+import pytest
+
+import core.ml_loader as ml_loader
+
+
+@pytest.fixture()
+def loaders(monkeypatch):
+    """Fresh readiness state; returns a dict of per-model call counts."""
+    monkeypatch.setattr(ml_loader, "_status", {
+        name: {"state": "unloaded", "version": 0, "artifact": None, "load_seconds": None,
+               "loaded_at": None, "error": None}
+        for name in ml_loader.ALL_MODELS
+    })
+    monkeypatch.setattr(ml_loader, "_fingerprints", {})
+    monkeypatch.setattr(ml_loader, "_read_metadata", lambda: {})
+    saved = {a: v for a, v in vars(ml_loader).items() if a in ml_loader._LAZY_DEFAULTS}
+    calls = {name: 0 for name in ml_loader.ALL_MODELS}
+
+    def fake(name, value, delay=0.0):
+        def load(metadata):
+            calls[name] += 1
+            time.sleep(delay)
+            return {ml_loader.MODEL_ATTRS[name][0]: value}
+        monkeypatch.setitem(ml_loader._LOADERS, name, load)
+
+    calls["fake"] = fake
+    yield calls
+    for attr in ml_loader._LAZY_DEFAULTS:
+        vars(ml_loader).pop(attr, None)
+    vars(ml_loader).update(saved)
+
+
+class TestLazyLoading:
+    def test_loads_on_first_access_only(self, loaders):
+        loaders["fake"]("forecaster", "model-v1")
+        ml_loader.defer_models(("forecaster",))
+
+        assert loaders["forecaster"] == 0
+        assert ml_loader.model_status()["forecaster"]["state"] == "pending"
+        assert ml_loader.malaria_forecast_model == "model-v1"
+        assert ml_loader.malaria_forecast_model == "model-v1"
+        assert loaders["forecaster"] == 1
+
+        status = ml_loader.model_status()["forecaster"]
+        assert status["state"] == "ready"
+        assert status["load_seconds"] >= 0
+
+    def test_concurrent_first_access_loads_once(self, loaders):
+        loaders["fake"]("dhs_risk", {"model": 1}, delay=0.05)
+        ml_loader.defer_models(("dhs_risk",))
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(ml_loader.symptoms_model))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert loaders["dhs_risk"] == 1
+        assert results == [{"model": 1}] * 8
+
+    def test_unscheduled_model_reads_default_without_loading(self, loaders):
+        loaders["fake"]("cnn", "cnn")
+        assert ml_loader.malaria_model is None
+        assert loaders["cnn"] == 0
+        assert not ml_loader.is_ready("cnn")
+
+    def test_background_warm_up(self, loaders):
+        loaders["fake"]("ensemble", {"version": "v2"})
+        ml_loader.defer_models(("ensemble",), warm=True)
+
+        deadline = time.time() + 5
+        while not ml_loader.is_ready("ensemble") and time.time() < deadline:
+            time.sleep(0.01)
+        assert ml_loader.is_ready("ensemble")
+        assert loaders["ensemble"] == 1
+
+    def test_failed_load_is_reported(self, loaders, monkeypatch):
+        def broken(metadata):
+            raise OSError("corrupt artifact")
+
+        monkeypatch.setitem(ml_loader._LOADERS, "gatekeeper", broken)
+        ml_loader.defer_models(("gatekeeper",))
+
+        assert ml_loader.gatekeeper_model is None
+        assert ml_loader.gatekeeper_threshold == 0.05
+        status = ml_loader.model_status()["gatekeeper"]
+        assert status["state"] == "error"
+        assert "corrupt" in status["error"]
+
+
+class TestEagerLoading:
+    def test_loads_only_named_models(self, loaders):
+        for name in ml_loader.ALL_MODELS:
+            loaders["fake"](name, name)
+        ml_loader.load_models(ml_loader.TABULAR_MODELS)
+
+        assert all(ml_loader.is_ready(n) for n in ml_loader.TABULAR_MODELS)
+        assert not any(ml_loader.is_ready(n) for n in ml_loader.IMAGE_MODELS)
+        assert loaders["cnn"] == 0
+
+    def test_reload_replaces_model(self, loaders):
+        loaders["fake"]("forecaster", "model-v1")
+        ml_loader.load_models(("forecaster",))
+        loaders["fake"]("forecaster", "model-v2")
+        ml_loader.load_models(("forecaster",))
+
+        assert ml_loader.malaria_forecast_model == "model-v2"
+        assert loaders["forecaster"] == 2
+
+
+class TestHotReload:
+    @pytest.fixture()
+    def artifact(self, tmp_path, monkeypatch):
+        path = tmp_path / "adaptive_ensemble.pkl"
+        path.write_bytes(b"v1")
+        monkeypatch.setitem(ml_loader._ARTIFACTS, "ensemble", (str(path),))
+        return path
+
+    def test_swaps_only_when_artifact_changes(self, loaders, artifact):
+        loaders["fake"]("ensemble", {"version": "v1"})
+        ml_loader.load_models(("ensemble",))
+        loaders["fake"]("ensemble", {"version": "v2"})
+
+        assert ml_loader.reload_model("ensemble") is False
+        artifact.write_bytes(b"version 2")
+        assert ml_loader.reload_model("ensemble") is True
+
+        assert ml_loader.adaptive_ensemble == {"version": "v2"}
+        assert ml_loader.model_status()["ensemble"]["version"] == 2
+        assert ml_loader.check_for_updates(("ensemble",)) == []
+
+    def test_artifact_version_follows_published_file(self, loaders, artifact, monkeypatch):
+        loaders["fake"]("ensemble", {"version": "v1"})
+        assert ml_loader.artifact_version("ensemble") is None
+        ml_loader.load_models(("ensemble",))
+        first = ml_loader.artifact_version("ensemble")
+        assert first
+
+        def broken(metadata):
+            raise EOFError("truncated pickle")
+
+        monkeypatch.setitem(ml_loader._LOADERS, "ensemble", broken)
+        artifact.write_bytes(b"partial")
+        assert ml_loader.reload_model("ensemble") is False
+        assert ml_loader.artifact_version("ensemble") == first  # still serving v1
+
+        loaders["fake"]("ensemble", {"version": "v2"})
+        artifact.write_bytes(b"version 2")
+        assert ml_loader.reload_model("ensemble") is True
+        assert ml_loader.artifact_version("ensemble") not in (None, first)
+
+    def test_old_version_serves_while_new_one_loads(self, loaders, artifact, monkeypatch):
+        loaders["fake"]("ensemble", {"version": "v1"})
+        ml_loader.load_models(("ensemble",))
+
+        started, release = threading.Event(), threading.Event()
+
+        def slow(metadata):
+            started.set()
+            release.wait(5)
+            return {"adaptive_ensemble": {"version": "v2"}}
+
+        monkeypatch.setitem(ml_loader._LOADERS, "ensemble", slow)
+        reload = threading.Thread(target=ml_loader.reload_model, args=("ensemble",), kwargs={"force": True})
+        reload.start()
+        assert started.wait(5)
+
+        assert ml_loader.adaptive_ensemble == {"version": "v1"}
+        assert ml_loader.is_ready("ensemble")
+        release.set()
+        reload.join(5)
+        assert ml_loader.adaptive_ensemble == {"version": "v2"}
+
+    def test_failed_reload_keeps_current_version(self, loaders, artifact, monkeypatch):
+        loaders["fake"]("ensemble", {"version": "v1"})
+        ml_loader.load_models(("ensemble",))
+
+        def broken(metadata):
+            raise EOFError("truncated pickle")
+
+        monkeypatch.setitem(ml_loader._LOADERS, "ensemble", broken)
+        artifact.write_bytes(b"partial")
+
+        assert ml_loader.reload_model("ensemble") is False
+        assert ml_loader.adaptive_ensemble == {"version": "v1"}
+        status = ml_loader.model_status()["ensemble"]
+        assert status["state"] == "ready"
+        assert status["version"] == 1
+        assert "truncated" in status["error"]
+
+    def test_pending_model_is_left_to_first_use(self, loaders, artifact):
+        loaders["fake"]("ensemble", {"version": "v1"})
+        ml_loader.defer_models(("ensemble",))
+
+        assert ml_loader.reload_model("ensemble", force=True) is False
+        assert loaders["ensemble"] == 0
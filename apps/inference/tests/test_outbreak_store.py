@@ -0,0 +1,65 @@
+"""
+Tests for core/outbreak_store.py — in-memory outbreak series index.
+"""
+
+import os
+
+import numpy as np
+
+from core.outbreak_store import OutbreakSeriesStore
+
+
+def _write_csv(path, rows):
+    lines = ["Date,Region,Disease,New_Cases"]
+    lines += [f"{date},{region},Aggregate,{cases}" for date, region, cases in rows]
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestOutbreakSeriesStore:
+    def test_series_sorted_by_date(self, tmp_path):
+        csv_path = tmp_path / "outbreaks.csv"
+        _write_csv(csv_path, [
+            ("2024-01-21", "Kerala", 30),
+            ("2024-01-07", "Kerala", 10),
+            ("2024-01-14", "Kerala", 20),
+            ("2024-01-07", "Delhi", 5),
+        ])
+        store = OutbreakSeriesStore(str(csv_path))
+
+        series = store.get("Kerala")
+        assert series.cases.tolist() == [10, 20, 30]
+        assert series.cases.flags["C_CONTIGUOUS"]
+        assert str(series.last_date.date()) == "2024-01-21"
+        assert series.window(2).tolist() == [20, 30]
+        assert store.regions() == ["Delhi", "Kerala"]
+
+    def test_unknown_region(self, tmp_path):
+        csv_path = tmp_path / "outbreaks.csv"
+        _write_csv(csv_path, [("2024-01-07", "Kerala", 10)])
+        store = OutbreakSeriesStore(str(csv_path))
+        assert store.get("Atlantis") is None
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        csv_path = tmp_path / "outbreaks.csv"
+        _write_csv(csv_path, [("2024-01-07", "Kerala", 10)])
+        store = OutbreakSeriesStore(str(csv_path))
+        assert store.regions() == ["Kerala"]
+
+        _write_csv(csv_path, [("2024-01-07", "Kerala", 10), ("2024-01-07", "Goa", 4)])
+        stat = os.stat(csv_path)
+        os.utime(csv_path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert store.regions() == ["Goa", "Kerala"]
+        np.testing.assert_array_equal(store.get("Goa").cases, [4])
+
+    def test_does_not_reparse_unchanged_file(self, tmp_path, monkeypatch):
+        csv_path = tmp_path / "outbreaks.csv"
+        _write_csv(csv_path, [("2024-01-07", "Kerala", 10)])
+        store = OutbreakSeriesStore(str(csv_path))
+        store.regions()
+
+        calls = []
+        monkeypatch.setattr(store, "_load", lambda mtime: calls.append(mtime))
+        store.get("Kerala")
+        store.regions()
+        assert calls == []
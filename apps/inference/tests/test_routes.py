@@ -229,6 +229,7 @@ class TestDiagnosisRoutes:
         )
         assert resp.status_code == 200
         assert isinstance(resp.get_json(), list)
+        mock_get_user.assert_called_once_with("user_test123")
 
 
 class TestForecastRoutes:
@@ -259,6 +260,8 @@ class TestForecastRoutes:
             },
         )
         assert resp.status_code == 201
+        # require_auth and the route share one user lookup
+        mock_get_user.assert_called_once_with("user_test123")
 
     @patch("flask_app.get_user_by_clerk_id")
     @patch("core.auth.get_clerk_public_key", return_value=None)
@@ -374,6 +377,75 @@ class TestPredictImage:
         )
         assert resp.status_code == 500  # model is None → first check
 
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_gatekeeper_snapshot_survives_hot_swap(self, _pk, app, client):
+        import flask_app
+
+        seen = []
+
+        def _validate(views, models, before_model_stage=None):
+            # A reload lands mid-request: this request keeps the old pair
+            flask_app.gatekeeper_model, flask_app.gatekeeper_threshold = "new-ae", 0.9
+            seen.append((models.gatekeeper_model, models.gatekeeper_threshold))
+            return "gatekeeper", {"error": "rejected"}
+
+        flask_app.malaria_model = MagicMock()
+        flask_app.gatekeeper_model, flask_app.gatekeeper_threshold = "old-ae", 0.1
+        try:
+            with patch("routes.predictions.preprocess_image", return_value=MagicMock()), \
+                 patch("routes.predictions.image_validator.run", side_effect=_validate):
+                resp = client.post(
+                    "/predict/image",
+                    headers={"Authorization": f"Bearer {_make_token()}"},
+                    data={"file": (io.BytesIO(b"\x89PNG\r\n\x1a\nrest"), "cell.png")},
+                    content_type="multipart/form-data",
+                )
+        finally:
+            vars(flask_app).pop("gatekeeper_threshold", None)  # back to delegating
+        assert resp.status_code == 400
+        assert seen == [("old-ae", 0.1)]
+
+    def _post_image(self, client):
+        return client.post(
+            "/predict/image",
+            headers={"Authorization": f"Bearer {_make_token()}"},
+            data={"file": (io.BytesIO(b"\x89PNG\r\n\x1a\nrest"), "cell.png")},
+            content_type="multipart/form-data",
+        )
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_unbatched_cnn_waits_for_validation(self, _pk, app, client):
+        import flask_app
+        from core.micro_batcher import cnn_batcher
+
+        hooks = []
+
+        def _validate(views, models, before_model_stage=None):
+            hooks.append(before_model_stage)
+            return "gatekeeper", {"error": "rejected"}
+
+        flask_app.malaria_model = MagicMock()
+        with patch.object(cnn_batcher, "max_batch_size", 1), \
+             patch("routes.predictions.preprocess_image", return_value=MagicMock()), \
+             patch("routes.predictions.image_validator.run", side_effect=_validate):
+            resp = self._post_image(client)
+        assert resp.status_code == 400
+        assert hooks == [None]  # not pre-submitted: it would have run inline
+        flask_app.malaria_model.predict.assert_not_called()
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_model_timeout_returns_503(self, _pk, app, client):
+        import flask_app
+        from core.micro_batcher import cnn_batcher
+
+        flask_app.malaria_model = MagicMock()
+        with patch("routes.predictions.preprocess_image", return_value=MagicMock()), \
+             patch("routes.predictions.image_validator.run", return_value=(None, None)), \
+             patch.object(cnn_batcher, "submit", return_value=MagicMock()), \
+             patch.object(cnn_batcher, "result", side_effect=TimeoutError):
+            resp = self._post_image(client)
+        assert resp.status_code == 503
+
 
 class TestForecastRegion:
     """POST /forecast/region — model is None."""
@@ -404,6 +476,184 @@ class TestForecastRegion:
         assert resp.status_code == 500
 
 
+class TestForecastRegionAdaptive:
+    """POST /forecast/region — adaptive ensemble path with offline signals."""
+
+    @patch("core.feature_store.fetch_news_signal")
+    @patch("core.feature_store.fetch_current_weather")
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_adaptive_forecast(self, _pk, mock_weather, mock_news, app, client, small_ensemble):
+        import flask_app as fa
+
+        mock_weather.return_value = {"temperature": 29.0, "humidity": 75.0, "precipitation": 1.0,
+                                     "risk_multiplier": 1.7, "fresh": True}
+        mock_news.return_value = {"article_count": 4, "news_risk_score": 1.1,
+                                  "headlines": [], "fresh": True}
+        fa.adaptive_ensemble = small_ensemble
+
+        token = _make_token()
+        resp = client.post(
+            "/forecast/region",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"region": "Kerala", "horizon_weeks": 6},
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["model_version"] == "v2_test"
+        assert len(data["predictions"]) == 6
+        assert len(data["historical"]) == 12
+        first = data["predictions"][0]
+        assert first["p10"] <= first["p50"] <= first["p90"]
+        assert data["explanation"]["model_agreement"] == first["model_agreement"]
+
+
+class TestForecastRegionCache:
+    """Response caching for POST /forecast/region."""
+
+    WEATHER = {"temperature": 29.0, "humidity": 75.0, "precipitation": 1.0,
+               "risk_multiplier": 1.7, "fresh": True}
+    NEWS = {"article_count": 4, "news_risk_score": 1.1, "headlines": [], "fresh": True}
+
+    def _forecast(self, client, weather=None):
+        token = _make_token()
+        with patch("core.feature_store.fetch_current_weather", return_value=weather or self.WEATHER), \
+                patch("core.feature_store.fetch_news_signal", return_value=self.NEWS):
+            return client.post(
+                "/forecast/region",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"region": "Kerala", "horizon_weeks": 6},
+            )
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_repeat_request_is_served_from_cache(self, _pk, app, client, small_ensemble):
+        import flask_app as fa
+        fa.adaptive_ensemble = small_ensemble
+
+        first = self._forecast(client)
+        with patch("core.forecaster.predict_ensemble_batch") as scorer:
+            second = self._forecast(client)
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        scorer.assert_not_called()
+        assert second.get_json() == first.get_json()
+        assert "drift_status" in second.get_json()
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_recompute_matches_cached_response(self, _pk, app, client, small_ensemble):
+        import flask_app as fa
+        from core.forecast_cache import forecast_cache
+        fa.adaptive_ensemble = small_ensemble
+
+        first = self._forecast(client).get_json()
+        forecast_cache.clear()
+        second = self._forecast(client)
+
+        assert second.headers["X-Cache"] == "MISS"
+        assert second.get_json()["predictions"] == first["predictions"]
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_changed_weather_misses(self, _pk, app, client, small_ensemble):
+        import flask_app as fa
+        fa.adaptive_ensemble = small_ensemble
+
+        self._forecast(client)
+        resp = self._forecast(client, weather={**self.WEATHER, "temperature": 31.0})
+        assert resp.headers["X-Cache"] == "MISS"
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_model_reload_invalidates(self, _pk, app, client, small_ensemble):
+        import flask_app as fa
+        from core.ml_loader import load_models
+        fa.adaptive_ensemble = small_ensemble
+
+        self._forecast(client)
+        with patch("core.ml_loader.os.path.exists", return_value=False):
+            load_models()
+        fa.adaptive_ensemble = small_ensemble
+        assert self._forecast(client).headers["X-Cache"] == "MISS"
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_legacy_forecasts_keyed_on_loaded_artifact(self, _pk, app, client):
+        import flask_app as fa
+
+        class _Persistence:
+            def predict(self, X):
+                return X[:, -1]
+
+        fa.malaria_forecast_model = _Persistence()
+        with patch("routes.predictions.artifact_version", return_value="aaa"):
+            assert self._forecast(client).headers["X-Cache"] == "MISS"
+            assert self._forecast(client).headers["X-Cache"] == "HIT"
+        # A worker still serving another file never shares entries with this one
+        with patch("routes.predictions.artifact_version", return_value="bbb"):
+            assert self._forecast(client).headers["X-Cache"] == "MISS"
+        with patch("routes.predictions.artifact_version", return_value=None):
+            self._forecast(client)
+            assert self._forecast(client).headers["X-Cache"] == "MISS"
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_disabled_cache_always_recomputes(self, _pk, app, client, small_ensemble):
+        import flask_app as fa
+        fa.adaptive_ensemble = small_ensemble
+
+        with patch("core.forecast_cache.FORECAST_CACHE_ENABLED", False):
+            self._forecast(client)
+            assert self._forecast(client).headers["X-Cache"] == "MISS"
+
+    def test_health_reports_cache_stats(self, client):
+        data = client.get("/health").get_json()
+        assert {"hits", "misses", "size"} <= set(data["forecast_cache"]["local"])
+
+
+class TestForecastAllRegions:
+    """POST /forecast/all — every region in one lockstep rollout."""
+
+    def test_no_auth_returns_401(self, client):
+        resp = client.post("/forecast/all", json={})
+        assert resp.status_code == 401
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_no_model_loaded(self, _pk, client):
+        token = _make_token()
+        with patch("core.feature_store.fetch_current_weather", return_value={}), \
+                patch("core.feature_store.fetch_news_signal", return_value={}):
+            resp = client.post("/forecast/all", headers={"Authorization": f"Bearer {token}"}, json={})
+        assert resp.status_code == 500
+
+    @patch("core.feature_store.fetch_news_signal")
+    @patch("core.feature_store.fetch_current_weather")
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_forecasts_every_region(self, _pk, mock_weather, mock_news, app, client, small_ensemble):
+        import flask_app as fa
+        from core.adaptive_config import REGION_COORDS
+
+        mock_weather.return_value = {"temperature": 29.0, "humidity": 75.0, "precipitation": 1.0,
+                                     "risk_multiplier": 1.7, "fresh": True}
+        mock_news.return_value = {"article_count": 4, "news_risk_score": 1.1,
+                                  "headlines": [], "fresh": True}
+        fa.adaptive_ensemble = small_ensemble
+
+        from core import forecaster
+
+        token = _make_token()
+        with patch("core.forecaster.predict_ensemble_batch",
+                   wraps=forecaster.predict_ensemble_batch) as spy:
+            resp = client.post(
+                "/forecast/all",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"horizon_weeks": 4},
+            )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert [r["region"] for r in data["regions"]] == list(REGION_COORDS)
+        assert all(len(r["predictions"]) == 4 for r in data["regions"])
+        assert all("risk_fusion" in r and len(r["hotspots"]) == 3 for r in data["regions"])
+        # One batched scoring call per horizon step, each covering every region
+        assert spy.call_count == 4
+        assert spy.call_args[0][1].shape[0] == len(REGION_COORDS)
+
+
 class TestForecastRegionsGet:
     """GET /forecast/regions — reads CSV."""
 
@@ -411,29 +661,39 @@ class TestForecastRegionsGet:
         resp = client.get("/forecast/regions")
         assert resp.status_code == 401
 
-    @patch("routes.predictions.pd.read_csv")
     @patch("core.auth.get_clerk_public_key", return_value=None)
-    def test_returns_regions(self, _pk, mock_csv, client):
-        import pandas as pd
-        mock_csv.return_value = pd.DataFrame({"Region": ["Kerala", "Goa", "Kerala"]})
-        token = _make_token()
-        resp = client.get(
-            "/forecast/regions",
-            headers={"Authorization": f"Bearer {token}"},
+    def test_returns_regions(self, _pk, client, tmp_path):
+        from core.outbreak_store import OutbreakSeriesStore
+
+        csv_path = tmp_path / "outbreaks.csv"
+        csv_path.write_text(
+            "Date,Region,Disease,New_Cases\n"
+            "2024-01-07,Kerala,X,5\n"
+            "2024-01-07,Goa,X,3\n"
+            "2024-01-14,Kerala,X,7\n"
         )
+        token = _make_token()
+        with patch("routes.predictions.outbreak_store", OutbreakSeriesStore(str(csv_path))):
+            resp = client.get(
+                "/forecast/regions",
+                headers={"Authorization": f"Bearer {token}"},
+            )
         assert resp.status_code == 200
         data = resp.get_json()
         assert "regions" in data
-        assert "Kerala" in data["regions"]
+        assert data["regions"] == ["Goa", "Kerala"]
 
-    @patch("routes.predictions.pd.read_csv", side_effect=FileNotFoundError("CSV not found"))
     @patch("core.auth.get_clerk_public_key", return_value=None)
-    def test_csv_missing(self, _pk, mock_csv, client):
+    def test_csv_missing(self, _pk, client, tmp_path):
+        from core.outbreak_store import OutbreakSeriesStore
+
         token = _make_token()
-        resp = client.get(
-            "/forecast/regions",
-            headers={"Authorization": f"Bearer {token}"},
-        )
+        missing = OutbreakSeriesStore(str(tmp_path / "missing.csv"))
+        with patch("routes.predictions.outbreak_store", missing):
+            resp = client.get(
+                "/forecast/regions",
+                headers={"Authorization": f"Bearer {token}"},
+            )
         assert resp.status_code == 500
 
 
@@ -480,6 +740,34 @@ class TestGenerateReport:
         assert resp.status_code in (400, 500)
 
 
+class TestPredictSymptomsBatch:
+    """POST /predict/symptoms/batch — rule-based fallback (model not loaded)."""
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_scores_in_order(self, _pk, client):
+        resp = client.post(
+            "/predict/symptoms/batch",
+            headers={"Authorization": f"Bearer {_make_token()}"},
+            json={"records": [{"fever": False}, {"fever": True, "anemia_level": 1}, "junk"]},
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["count"] == 3
+        assert data["results"][0]["label"] == "Low Risk"
+        assert data["results"][1]["label"] == "High Risk"
+        assert "error" in data["results"][2]
+
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_rejects_missing_and_oversized_batches(self, _pk, client):
+        headers = {"Authorization": f"Bearer {_make_token()}"}
+        assert client.post("/predict/symptoms/batch", headers=headers,
+                           json={"records": []}).status_code == 400
+        with patch("routes.predictions.SYMPTOM_BATCH_MAX_RECORDS", 2):
+            resp = client.post("/predict/symptoms/batch", headers=headers,
+                               json={"records": [{}, {}, {}]})
+        assert resp.status_code == 413
+
+
 class TestAdminRoutes:
     """Admin endpoints require role=admin."""
 
@@ -497,3 +785,29 @@ class TestAdminRoutes:
                 headers={"Authorization": f"Bearer {token}"},
             )
         assert resp.status_code == 403
+
+    @patch("flask_app.get_user_by_clerk_id")
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_model_reload_forbidden_for_patient(self, _pk, mock_get_user, client):
+        mock_get_user.return_value = {"id": "u1", "clerkId": "user_test123"}
+        with patch("core.auth.get_caller_role", return_value=("patient", "ok")):
+            resp = client.post("/admin/models/reload",
+                               headers={"Authorization": f"Bearer {_make_token()}"})
+        assert resp.status_code == 403
+
+    @patch("flask_app.get_user_by_clerk_id")
+    @patch("core.auth.get_clerk_public_key", return_value=None)
+    def test_model_reload(self, _pk, mock_get_user, client):
+        mock_get_user.return_value = {"id": "u1", "clerkId": "user_test123"}
+        headers = {"Authorization": f"Bearer {_make_token()}"}
+        with patch("core.auth.get_caller_role", return_value=("admin", "ok")), \
+             patch("routes.admin.get_caller_role", return_value=("admin", "ok")), \
+             patch("core.ml_loader.check_for_updates", return_value=["ensemble"]) as check:
+            resp = client.post("/admin/models/reload", headers=headers,
+                               json={"models": ["ensemble"], "force": True})
+            bad = client.post("/admin/models/reload", headers=headers, json={"models": ["nope"]})
+
+        assert resp.status_code == 200
+        assert resp.get_json()["reloaded"] == ["ensemble"]
+        check.assert_called_once_with(["ensemble"], force=True)
+        assert bad.status_code == 400
@@ -0,0 +1,145 @@
+"""
+Tests for core/signal_refresher.py and the feature store's refresh path
+(single-flight refresh, stale-while-revalidate).
+"""
+
+import threading
+import time
+
+import pytest
+
+from core import feature_store
+from core.signal_refresher import SignalRefresher
+
+NOWCAST = {"temperature": 30.0, "humidity": 80.0, "precipitation": 2.5, "risk_multiplier": 1.7}
+NEWS = {"article_count": 7, "news_risk_score": 1.3, "headlines": []}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def live(monkeypatch):
+    """Replace the live API calls with counters that can be made to fail."""
+    state = {"calls": [], "fail": False, "delay": 0.0}
+
+    def _fetch(kind, payload):
+        def fetch(region):
+            state["calls"].append((kind, region))
+            time.sleep(state["delay"])
+            return None if state["fail"] else dict(payload)
+        return fetch
+
+    monkeypatch.setattr(feature_store, "_fetch_nowcast_live", _fetch("nowcast", NOWCAST))
+    monkeypatch.setattr(feature_store, "_fetch_news_live", _fetch("news", NEWS))
+    return state
+
+
+@pytest.fixture()
+def refresher(tmp_path):
+    return SignalRefresher(regions=["Kerala", "Delhi"], lock_path=str(tmp_path / "r.lock"),
+                           clock=_Clock())
+
+
+class TestScheduling:
+    def test_missing_signals_are_due(self, refresher):
+        assert sorted(refresher.due_keys()) == [
+            ("news", "Delhi"), ("news", "Kerala"), ("nowcast", "Delhi"), ("nowcast", "Kerala"),
+        ]
+
+    def test_refreshes_ahead_of_expiry(self, refresher, live):
+        assert refresher.refresh_due() == 4
+        assert refresher.due_keys() == []
+
+        # Past the refresh-ahead point (80% of TTL + jitter) but before expiry
+        refresher._clock.now += 0.86 * feature_store.signal_ttl_hours("news") * 3600
+        assert sorted(refresher.due_keys()) == [("news", "Delhi"), ("news", "Kerala")]
+
+    def test_failures_back_off(self, refresher, live):
+        live["fail"] = True
+        assert refresher.refresh_due() == 0
+        assert refresher.status()["backing_off"] == 4
+        assert refresher.due_keys() == []
+
+        refresher._clock.now += 61
+        live["fail"] = False
+        assert refresher.refresh_due() == 4
+        assert refresher.status()["backing_off"] == 0
+
+    def test_backoff_grows_and_is_capped(self, refresher):
+        assert 30 <= refresher._backoff_seconds(1) <= 60
+        assert 120 <= refresher._backoff_seconds(3) <= 240
+        assert refresher._backoff_seconds(20) <= 1800
+
+
+class TestRefresherThread:
+    def test_only_one_refresher_per_lock(self, tmp_path, live):
+        lock_path = str(tmp_path / "r.lock")
+        first = SignalRefresher(regions=["Kerala"], lock_path=lock_path, tick_seconds=0.05)
+        second = SignalRefresher(regions=["Kerala"], lock_path=lock_path, tick_seconds=0.05)
+        first.start()
+        try:
+            deadline = time.time() + 5
+            while not first.status()["refreshed"] and time.time() < deadline:
+                time.sleep(0.02)
+            second.start()
+            time.sleep(0.2)
+            assert first.status()["active"] and first.status()["refreshed"] == 2
+            assert not second.status()["active"]
+        finally:
+            first.stop()
+            second.stop()
+        assert feature_store.feature_cache.get("nowcast", "Kerala")[0] == NOWCAST
+
+
+class TestRefreshSignal:
+    def test_single_flight(self, live):
+        live["delay"] = 0.2
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(feature_store.refresh_signal("news", "Kerala")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [True] * 5
+        assert live["calls"] == [("news", "Kerala")]
+
+    def test_non_waiting_caller_skips_in_flight_refresh(self, live):
+        live["delay"] = 0.2
+        worker = threading.Thread(target=feature_store.refresh_signal, args=("news", "Kerala"))
+        worker.start()
+        time.sleep(0.05)
+        assert feature_store.refresh_signal("news", "Kerala", wait=False) is None
+        worker.join()
+
+    def test_stale_value_is_served_then_revalidated(self, live):
+        stale_at = time.time() - 1.5 * feature_store.signal_ttl_hours("news") * 3600
+        feature_store.feature_cache.put("news", "Kerala", {**NEWS, "article_count": 2}, updated_at=stale_at)
+
+        news = feature_store.fetch_news_signal("Kerala")
+        assert news["article_count"] == 2 and news["fresh"] is False
+
+        deadline = time.time() + 5
+        while feature_store.feature_cache.get("news", "Kerala")[1] == stale_at and time.time() < deadline:
+            time.sleep(0.02)
+        assert feature_store.fetch_news_signal("Kerala") == {**NEWS, "fresh": True}
+
+    def test_too_stale_value_is_refetched_inline(self, live):
+        very_old = time.time() - 2 * feature_store.SIGNAL_MAX_STALE_HOURS * 3600
+        feature_store.feature_cache.put("nowcast", "Kerala", {**NOWCAST, "temperature": 20.0},
+                                        updated_at=very_old)
+        assert feature_store.fetch_current_weather("Kerala") == {**NOWCAST, "fresh": True}
+
+    def test_cold_miss_with_failing_api_uses_defaults(self, live):
+        live["fail"] = True
+        assert feature_store.fetch_news_signal("Kerala") == {
+            "article_count": 0, "news_risk_score": 1.0, "headlines": [], "fresh": False,
+        }
@@ -0,0 +1,210 @@
+"""
+Tests for core/symptom_scorer.py — the vectorized batch path must score
+exactly like the original one-row pandas preprocessing.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import LabelEncoder
+
+from core.symptom_scorer import SymptomScorer, rule_based_risk, scorer_for
+
+FEATURES = ["fever", "age_months", "state", "residence_type",
+            "slept_under_net", "anemia_level", "interview_month"]
+IMPUTED = ["fever", "age_months", "slept_under_net", "anemia_level", "interview_month"]
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    """A small bundle shaped like scripts/train_risk_index_model.py's output."""
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        "fever": rng.integers(0, 2, n).astype(float),
+        "age_months": rng.integers(0, 60, n).astype(float),
+        "state": rng.choice(["Bihar", "Kerala", "Odisha"], n),
+        "residence_type": rng.choice(["Rural", "Urban"], n),
+        "slept_under_net": rng.integers(0, 2, n).astype(float),
+        "anemia_level": rng.integers(1, 5, n).astype(float),
+        "interview_month": rng.integers(1, 13, n).astype(float),
+    })
+    df.loc[rng.random(n) < 0.1, "age_months"] = np.nan
+    y = (df["fever"].to_numpy() + (df["anemia_level"].to_numpy() <= 2)).astype(int)
+
+    imputer = SimpleImputer(strategy="constant", fill_value=-1)
+    df[IMPUTED] = imputer.fit_transform(df[IMPUTED])
+    le_state, le_res = LabelEncoder(), LabelEncoder()
+    df["state"] = le_state.fit_transform(df["state"])
+    df["residence_type"] = le_res.fit_transform(df["residence_type"])
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(df[FEATURES].values, y)
+
+    return {"model": model, "imputer": imputer, "le_state": le_state, "le_res": le_res,
+            "features": FEATURES, "cols_to_impute": IMPUTED}
+
+
+def _pandas_proba(bundle, data):
+    """The original per-request preprocessing from routes/predictions.py."""
+    fever = data.get("fever")
+    fever = (1 if fever else 0) if isinstance(fever, bool) else (-1 if fever is None else fever)
+    net = data.get("slept_under_net")
+    net = (1 if net else 0) if isinstance(net, bool) else (-1 if net is None else net)
+    df = pd.DataFrame({
+        "fever": [fever],
+        "age_months": [data.get("age_months", -1)],
+        "state": [data.get("state", "Unknown")],
+        "residence_type": [data.get("residence_type", "Rural")],
+        "slept_under_net": [net],
+        "anemia_level": [data.get("anemia_level", -1)],
+        "interview_month": [data.get("interview_month", 6)],
+    })
+    for col, le in (("state", bundle["le_state"]), ("residence_type", bundle["le_res"])):
+        valid = df[col].isin(le.classes_)
+        df.loc[~valid, col] = le.classes_[0]
+        df[col] = le.transform(df[col])
+    for col in IMPUTED:
+        df[col] = df[col].astype(float)
+    df[IMPUTED] = bundle["imputer"].transform(df[IMPUTED])
+    return bundle["model"].predict_proba(df[FEATURES].values)[0]
+
+
+RECORDS = [
+    {"fever": True, "age_months": 14, "state": "Bihar", "residence_type": "Urban",
+     "slept_under_net": False, "anemia_level": 1, "interview_month": 6},
+    {"fever": False, "state": "Kerala", "interview_month": 6},
+    {"fever": None, "age_months": None, "state": "Atlantis", "residence_type": "Floating",
+     "slept_under_net": None, "anemia_level": 3, "interview_month": 6},
+    {"fever": 1, "age_months": "30", "anemia_level": 2, "interview_month": 6},
+]
+
+
+class TestSymptomScorer:
+    def test_matches_pandas_path(self, bundle):
+        X, errors = SymptomScorer(bundle).build_matrix(RECORDS)
+        assert errors == [None] * len(RECORDS)
+        batch = bundle["model"].predict_proba(X)
+        for record, row in zip(RECORDS, batch, strict=True):
+            np.testing.assert_array_equal(row, _pandas_proba(bundle, record))
+
+    def test_score_schema(self, bundle):
+        results = SymptomScorer(bundle).score(RECORDS)
+        assert len(results) == len(RECORDS)
+        for result, record in zip(results, RECORDS, strict=True):
+            proba = _pandas_proba(bundle, record)
+            assert result["label"] == {0: "Low Risk", 1: "Medium Risk", 2: "High Risk"}[int(proba.argmax())]
+            assert result["risk_score"] == round(float(proba.max()), 2)
+            assert result["method"] == "DHS-based ML Risk Model"
+
+    def test_bad_records_are_flagged_not_fatal(self, bundle):
+        results = SymptomScorer(bundle).score([RECORDS[0], "not a dict", {"age_months": "abc"}])
+        assert "label" in results[0]
+        assert "error" in results[1]
+        assert "error" in results[2]
+
+    def test_columns_match_records(self, bundle):
+        """The file-scoring path (scripts/score_symptoms.py) encodes like requests."""
+        scorer = SymptomScorer(bundle)
+        frame = pd.DataFrame(RECORDS)
+        columns = {name: frame[name].to_numpy() for name in frame.columns}
+        X_columns, errors = scorer.build_columns(columns, len(frame))
+        X_records, _ = scorer.build_matrix(RECORDS)
+        assert errors == [None] * len(RECORDS)
+        np.testing.assert_array_equal(X_columns, X_records)
+
+    def test_scorer_cached_on_bundle(self, bundle):
+        own = dict(bundle)
+        assert scorer_for(own) is scorer_for(own)
+
+
+class TestBulkScoring:
+    """scripts/score_symptoms.py: chunked, pooled scoring of survey files."""
+
+    @staticmethod
+    def _survey(n=40, seed=1):
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            "household": [f"hh{i:03d}" for i in range(n)],
+            "fever": rng.integers(0, 2, n),
+            "age_months": rng.integers(0, 60, n).astype(float),
+            "state": rng.choice(["Bihar", "Kerala", "Odisha"], n),
+            "residence_type": rng.choice(["Rural", "Urban"], n),
+            "slept_under_net": rng.integers(0, 2, n),
+            "anemia_level": rng.integers(1, 5, n),
+            "interview_month": rng.integers(1, 13, n),
+        })
+
+    @pytest.fixture()
+    def model_path(self, bundle, tmp_path):
+        import joblib
+        path = tmp_path / "model.pkl"
+        joblib.dump(bundle, path)
+        return str(path)
+
+    @staticmethod
+    def _expected(bundle, survey):
+        results = SymptomScorer(bundle).score(survey.to_dict("records"))
+        return [r.get("label", "") for r in results]
+
+    def test_csv_output_in_input_order(self, bundle, model_path, tmp_path):
+        from scripts.score_symptoms import run
+
+        survey = self._survey()
+        survey["age_months"] = survey["age_months"].astype(object)
+        survey.loc[5, "age_months"] = "abc"
+        survey.to_csv(tmp_path / "in.csv", index=False)
+
+        rows, unscored = run(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), model_path,
+                             workers=2, chunk_size=3, quiet=True)
+
+        out = pd.read_csv(tmp_path / "out.csv", keep_default_na=False)
+        assert (rows, unscored) == (len(survey), 1)
+        assert out["household"].tolist() == survey["household"].tolist()
+        assert out.loc[5, "risk_label"] == "" and out.loc[5, "age_months"] == "abc"
+        expected = self._expected(bundle, survey.drop(index=5))
+        assert out.drop(index=5)["risk_label"].tolist() == expected
+
+    def test_parquet_output_from_sparse_csv(self, bundle, model_path, tmp_path):
+        pytest.importorskip("pyarrow")
+        from scripts.score_symptoms import run
+
+        survey = self._survey(n=10)
+        survey["state"] = survey["state"].astype(object)
+        survey.loc[:2, "state"] = None          # first chunk's state column is all blank
+        survey.loc[4, "fever"] = None
+        survey.to_csv(tmp_path / "in.csv", index=False)
+
+        rows, unscored = run(str(tmp_path / "in.csv"), str(tmp_path / "out.parquet"), model_path,
+                             workers=1, chunk_size=3, quiet=True)
+
+        out = pd.read_parquet(tmp_path / "out.parquet")
+        assert (rows, unscored) == (10, 0)
+        assert out["state"].tolist()[3:] == survey["state"].tolist()[3:]
+        assert out["state"].isna().tolist()[:3] == [True] * 3
+        assert out["household"].tolist() == survey["household"].tolist()
+        assert out["risk_label"].tolist() == self._expected(bundle, survey.astype({"fever": object}).where(
+            survey.notna(), None))
+
+    def test_parquet_round_trip(self, bundle, model_path, tmp_path):
+        pytest.importorskip("pyarrow")
+        from scripts.score_symptoms import run
+
+        survey = self._survey(n=25)
+        survey.to_parquet(tmp_path / "in.parquet", index=False)
+
+        rows, unscored = run(str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"), model_path,
+                             workers=2, chunk_size=4, quiet=True)
+
+        out = pd.read_parquet(tmp_path / "out.parquet")
+        assert (rows, unscored) == (25, 0)
+        pd.testing.assert_frame_equal(out[survey.columns], survey)
+        assert out["risk_label"].tolist() == self._expected(bundle, survey)
+        assert out["risk_score"].between(0, 1).all()
+
+
+class TestRuleBasedRisk:
+    def test_levels(self):
+        assert rule_based_risk({"fever": False})["label"] == "Low Risk"
+        assert rule_based_risk({"fever": True, "anemia_level": 1})["label"] == "High Risk"
+        assert rule_based_risk({"fever": True, "anemia_level": 4})["label"] == "Medium Risk"
@@ -0,0 +1,124 @@
+"""
+Tests for core/tflite_runtime.py and the TFLite-or-Keras choice in
+core/ml_loader.py. A fake interpreter stands in for LiteRT.
+"""
+
+import numpy as np
+import pytest
+
+import core.ml_loader as ml_loader
+from core.tflite_runtime import TFLiteModel
+
+
+class _FakeInterpreter:
+    """Mimics the LiteRT Interpreter API for a model computing y = 2x + 1."""
+
+    instances = []
+
+    def __init__(self, model_path, num_threads=None, in_dtype=np.float32, out_quant=(0.0, 0)):
+        self.shape = [1, 4, 4, 3]
+        self.in_dtype = in_dtype
+        self.out_quant = out_quant
+        self.allocations = 0
+        self.tensors = {}
+        _FakeInterpreter.instances.append(self)
+
+    def allocate_tensors(self):
+        self.allocations += 1
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array(self.shape), "dtype": self.in_dtype,
+                 "quantization": (0.5, 3) if self.in_dtype != np.float32 else (0.0, 0)}]
+
+    def get_output_details(self):
+        dtype = np.int8 if self.out_quant[0] else np.float32
+        return [{"index": 1, "shape": np.array(self.shape), "dtype": dtype, "quantization": self.out_quant}]
+
+    def resize_tensor_input(self, index, shape, strict=False):
+        self.shape = list(shape)
+
+    def set_tensor(self, index, value):
+        assert list(value.shape) == self.shape and value.dtype == self.in_dtype
+        self.tensors[index] = value
+
+    def invoke(self):
+        x = self.tensors[0].astype(np.float32)
+        if self.in_dtype != np.float32:
+            x = (x - 3) * 0.5
+        y = 2 * x + 1
+        if self.out_quant[0]:
+            scale, zero_point = self.out_quant
+            y = np.round(y / scale + zero_point).astype(np.int8)
+        self.tensors[1] = y
+
+    def get_tensor(self, index):
+        return self.tensors[index].copy()
+
+
+class TestTFLiteModel:
+    def test_predict_resizes_only_when_batch_changes(self):
+        model = TFLiteModel("m.tflite", interpreter_class=_FakeInterpreter)
+        interp = _FakeInterpreter.instances[-1]
+        X = np.random.RandomState(0).rand(5, 4, 4, 3)
+
+        np.testing.assert_allclose(model.predict(X, verbose=0), 2 * X + 1, rtol=1e-6)
+        allocations = interp.allocations
+        model.predict(X[:5])
+        assert interp.allocations == allocations
+        np.testing.assert_allclose(model.predict(X[:1]), 2 * X[:1] + 1, rtol=1e-6)
+        assert model.input_shape == (4, 4, 3)
+
+    def test_quantized_io(self):
+        def factory(model_path, num_threads=None):
+            return _FakeInterpreter(model_path, in_dtype=np.int8, out_quant=(0.25, -2))
+
+        model = TFLiteModel("m.tflite", interpreter_class=factory)
+        interp = _FakeInterpreter.instances[-1]
+        # Multiples of the input scale (0.5), so quantizing the input is exact
+        X = np.random.RandomState(0).randint(0, 7, size=interp.shape).astype(np.float32) * 0.5
+        np.testing.assert_allclose(model.predict(X), 2 * X + 1, atol=0.25)
+        assert interp.tensors[0].dtype == np.int8
+
+    def test_out_of_range_input_saturates(self):
+        def factory(model_path, num_threads=None):
+            return _FakeInterpreter(model_path, in_dtype=np.int8)
+
+        model = TFLiteModel("m.tflite", interpreter_class=factory)
+        interp = _FakeInterpreter.instances[-1]
+        X = np.zeros(interp.shape, dtype=np.float32)
+        X[0, 0, 0] = [1000.0, -1000.0, 0.0]  # 2003 / -1997 quantized: beyond int8
+
+        model.predict(X)
+        np.testing.assert_array_equal(interp.tensors[0][0, 0, 0], [127, -128, 3])
+
+
+class TestImageModelLoader:
+    @pytest.fixture()
+    def files(self, monkeypatch):
+        present = set()
+        monkeypatch.setattr(ml_loader.os.path, "exists", lambda p: p in present)
+        monkeypatch.setattr(ml_loader, "_keras_loader", lambda: lambda path, **kw: ("keras", path))
+        return present
+
+    def test_prefers_tflite(self, files, monkeypatch):
+        files.update({"m.tflite", "m.h5"})
+        monkeypatch.setattr("core.tflite_runtime.TFLiteModel", lambda path: ("tflite", path))
+        assert ml_loader._load_image_model("m.tflite", "m.h5") == (("tflite", "m.tflite"), "tflite")
+
+    def test_falls_back_to_keras_when_interpreter_fails(self, files, monkeypatch):
+        files.update({"m.tflite", "m.h5"})
+
+        def broken(path):
+            raise ImportError("no interpreter")
+
+        monkeypatch.setattr("core.tflite_runtime.TFLiteModel", broken)
+        assert ml_loader._load_image_model("m.tflite", "m.h5") == (("keras", "m.h5"), "keras")
+
+    def test_keras_runtime_ignores_tflite(self, files, monkeypatch):
+        files.update({"m.tflite", "m.h5"})
+        monkeypatch.setattr(ml_loader, "MODEL_RUNTIME", "keras")
+        assert ml_loader._load_image_model("m.tflite", "m.h5")[1] == "keras"
+
+    def test_nothing_to_load(self, files):
+        assert ml_loader._load_image_model("m.tflite", "m.h5") == (None, None)
+
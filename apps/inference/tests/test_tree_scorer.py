@@ -0,0 +1,102 @@
+"""
+Tests for core/tree_scorer.py — parity of the packed-node scorer with
+sklearn's HistGradientBoostingRegressor.predict.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from core.adaptive_trainer import format_ensemble_predictions, predict_ensemble_batch
+from core.tree_scorer import CompiledTreeEnsemble, compile_ensemble
+
+
+def _training_data(n=600, n_features=6, seed=0, with_nans=False):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n, n_features))
+    y = 3 * X[:, 0] - 2 * X[:, 1] ** 2 + np.sin(X[:, 2]) + rng.normal(scale=0.3, size=n)
+    if with_nans:
+        X[rng.rand(n, n_features) < 0.1] = np.nan
+    return X, y
+
+
+class TestCompiledTreeEnsemble:
+    @pytest.mark.parametrize("params", [
+        {},
+        {"loss": "quantile", "quantile": 0.1},
+        {"loss": "quantile", "quantile": 0.9},
+        {"loss": "absolute_error"},
+        {"max_depth": None, "max_leaf_nodes": 63},
+        {"l2_regularization": 0.5, "learning_rate": 0.05},
+    ])
+    def test_matches_sklearn_predict(self, params):
+        X, y = _training_data()
+        model = HistGradientBoostingRegressor(max_iter=40, random_state=0, **params).fit(X, y)
+        compiled = CompiledTreeEnsemble({"m": model})
+
+        X_test, _ = _training_data(n=200, seed=1)
+        np.testing.assert_allclose(compiled.predict_raw(X_test)["m"], model.predict(X_test),
+                                   rtol=1e-12, atol=1e-12)
+
+    def test_missing_values_follow_training_direction(self):
+        X, y = _training_data(with_nans=True)
+        model = HistGradientBoostingRegressor(max_iter=40, random_state=0).fit(X, y)
+        compiled = CompiledTreeEnsemble({"m": model})
+
+        X_test, _ = _training_data(n=300, seed=2, with_nans=True)
+        np.testing.assert_allclose(compiled.predict_raw(X_test)["m"], model.predict(X_test),
+                                   rtol=1e-12, atol=1e-12)
+
+    def test_values_on_split_thresholds(self):
+        X, y = _training_data()
+        model = HistGradientBoostingRegressor(max_iter=20, random_state=0).fit(X, y)
+        compiled = CompiledTreeEnsemble({"m": model})
+
+        # Rows sitting exactly on learned thresholds exercise the <= branch
+        nodes = model._predictors[0][0].nodes
+        splits = nodes[~nodes["is_leaf"].astype(bool)]
+        X_edge = np.zeros((len(splits), X.shape[1]))
+        X_edge[np.arange(len(splits)), splits["feature_idx"]] = splits["num_threshold"]
+        np.testing.assert_allclose(compiled.predict_raw(X_edge)["m"], model.predict(X_edge),
+                                   rtol=1e-12, atol=1e-12)
+
+    def test_scores_all_models_in_one_pass(self, small_ensemble):
+        compiled = compile_ensemble(small_ensemble)
+        assert compiled.model_names == ["primary", "alt", "q10", "q50", "q90"]
+
+        X = np.random.RandomState(3).normal(size=(40, len(small_ensemble["feature_names"])))
+        raw = compiled.predict_raw(X)
+        np.testing.assert_allclose(raw["primary"], small_ensemble["primary"].predict(X), rtol=1e-12)
+        np.testing.assert_allclose(raw["alt"], small_ensemble["alt"].predict(X), rtol=1e-12)
+        for name, model in small_ensemble["quantile"].items():
+            np.testing.assert_allclose(raw[name], model.predict(X), rtol=1e-12)
+
+    def test_single_row(self, small_ensemble):
+        compiled = compile_ensemble(small_ensemble)
+        row = np.full(len(small_ensemble["feature_names"]), 0.5)
+        raw = compiled.predict_raw(row)
+        assert raw["primary"].shape == (1,)
+        np.testing.assert_allclose(raw["primary"], small_ensemble["primary"].predict(row.reshape(1, -1)))
+
+    def test_rejects_wrong_feature_count(self, small_ensemble):
+        compiled = compile_ensemble(small_ensemble)
+        with pytest.raises(ValueError):
+            compiled.predict_raw(np.zeros((1, 3)))
+
+
+class TestCompileEnsemble:
+    def test_batch_inference_parity(self, small_ensemble):
+        compiled_ensemble = {**small_ensemble, "compiled": compile_ensemble(small_ensemble)}
+        X = np.random.RandomState(4).normal(size=(30, len(small_ensemble["feature_names"])))
+
+        expected = format_ensemble_predictions(predict_ensemble_batch(small_ensemble, X))
+        actual = format_ensemble_predictions(predict_ensemble_batch(compiled_ensemble, X))
+        assert actual == expected
+
+    def test_unsupported_loss_falls_back(self, small_ensemble):
+        X, y = _training_data()
+        poisson = HistGradientBoostingRegressor(loss="poisson", max_iter=5).fit(X, np.abs(y))
+        assert compile_ensemble({**small_ensemble, "alt": poisson}) is None
+
+    def test_non_histgbr_member_falls_back(self, small_ensemble):
+        assert compile_ensemble({**small_ensemble, "primary": object()}) is None
@@ -0,0 +1,84 @@
+"""
+Tests for core/user_cache.py — request memo + process-level user cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from core import user_cache as uc
+
+USER = {"id": "u1", "clerkId": "user_1", "email": "a@b.com"}
+
+
+@pytest.fixture()
+def lookup():
+    with patch("flask_app.get_user_by_clerk_id", return_value=dict(USER)) as mock:
+        yield mock
+
+
+@pytest.fixture()
+def ctx_app():
+    return Flask(__name__)
+
+
+class TestGetUser:
+    def test_request_memo_single_lookup(self, ctx_app, lookup):
+        with patch.object(uc.user_cache, "ttl", 0), ctx_app.test_request_context():
+            assert uc.get_user("user_1") == USER
+            assert uc.get_user("user_1") == USER
+        assert lookup.call_count == 1
+
+    def test_process_cache_shared_across_requests(self, ctx_app, lookup):
+        with ctx_app.test_request_context():
+            uc.get_user("user_1")
+        with ctx_app.test_request_context():
+            assert uc.get_user("user_1") == USER
+        assert lookup.call_count == 1
+
+    def test_ttl_zero_disables_process_cache(self, ctx_app, lookup):
+        with patch.object(uc.user_cache, "ttl", 0):
+            for _ in range(2):
+                with ctx_app.test_request_context():
+                    uc.get_user("user_1")
+        assert lookup.call_count == 2
+        assert len(uc.user_cache) == 0
+
+    def test_missing_user_only_memoised_for_request(self, ctx_app, lookup):
+        lookup.return_value = None
+        with ctx_app.test_request_context():
+            assert uc.get_user("user_1") is None
+            assert uc.get_user("user_1") is None
+        assert lookup.call_count == 1
+
+        lookup.return_value = dict(USER)
+        with ctx_app.test_request_context():
+            assert uc.get_user("user_1") == USER
+        assert lookup.call_count == 2
+
+    def test_errors_propagate_and_are_not_cached(self, ctx_app, lookup):
+        lookup.side_effect = RuntimeError("db down")
+        with ctx_app.test_request_context(), pytest.raises(RuntimeError):
+            uc.get_user("user_1")
+        lookup.side_effect = None
+        with ctx_app.test_request_context():
+            assert uc.get_user("user_1") == USER
+
+    def test_callers_get_a_copy(self, ctx_app, lookup):
+        with ctx_app.test_request_context():
+            uc.get_user("user_1")["email"] = "changed"
+            assert uc.get_user("user_1")["email"] == "a@b.com"
+
+    def test_invalidate_drops_both_tiers(self, ctx_app, lookup):
+        with ctx_app.test_request_context():
+            uc.get_user("user_1")
+            lookup.return_value = {**USER, "email": "new@b.com"}
+            uc.invalidate_user("user_1")
+            assert uc.get_user("user_1")["email"] == "new@b.com"
+        assert lookup.call_count == 2
+
+    def test_works_outside_request(self, lookup):
+        assert uc.get_user("user_1") == USER
+        assert uc.get_user("user_1") == USER
+        assert lookup.call_count == 1
@@ -7,6 +7,7 @@ These are pure-function tests (no Flask client needed).
 
 import base64
 import json
+import os
 from datetime import datetime, timedelta
 
 import pytest
@@ -172,6 +173,116 @@ class TestSafeFloat:
         assert fa._safe_float("abc", default=-1) == -1
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  replace_atomically
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestReplaceAtomically:
+    def test_writes_through_temp_file_with_same_extension(self, tmp_path):
+        from core.utils import replace_atomically
+        path = tmp_path / "model.h5"
+        seen = []
+
+        def _write(tmp):
+            seen.append(tmp)
+            with open(tmp, "w") as f:
+                f.write("new")
+
+        replace_atomically(str(path), _write)
+        assert path.read_text() == "new"
+        assert seen[0].endswith(".h5") and os.path.dirname(seen[0]) == str(tmp_path)
+        assert os.listdir(tmp_path) == ["model.h5"]
+        assert os.stat(path).st_mode & 0o777 == 0o644
+
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        from core.utils import replace_atomically
+        path = tmp_path / "model.pkl"
+        path.write_text("old")
+
+        def _write(tmp):
+            with open(tmp, "w") as f:
+                f.write("partial")
+            raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError):
+            replace_atomically(str(path), _write)
+        assert path.read_text() == "old"
+        assert os.listdir(tmp_path) == ["model.pkl"]
+
+    def test_memory_mapped_readers_keep_old_arrays(self, tmp_path):
+        import joblib
+        import numpy as np
+
+        from core.utils import replace_atomically
+        path = str(tmp_path / "model.pkl")
+        joblib.dump({"w": np.arange(100_000.0)}, path)
+        old = joblib.load(path, mmap_mode="r")
+
+        replace_atomically(path, lambda tmp: joblib.dump({"w": np.zeros(10)}, tmp))
+
+        assert float(old["w"][-1]) == 99_999.0  # in-place truncation would SIGBUS here
+        assert joblib.load(path)["w"].shape == (10,)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  FileLock
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _try_lock_in_child(path, queue):
+    from core.utils import FileLock
+    queue.put(FileLock(path).acquire(blocking=False))
+
+
+class TestFileLock:
+    def _acquired_in_other_process(self, path):
+        import multiprocessing
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_try_lock_in_child, args=(path, queue))
+        proc.start()
+        proc.join(timeout=10)
+        return queue.get(timeout=1)
+
+    def test_excludes_other_processes(self, tmp_path):
+        from core.utils import FileLock
+        path = str(tmp_path / "locks" / "refresher.lock")
+
+        lock = FileLock(path)
+        assert lock.acquire(blocking=False)
+        assert lock.held
+        assert self._acquired_in_other_process(path) is False
+
+        lock.release()
+        assert not lock.held
+        assert self._acquired_in_other_process(path) is True
+
+    def test_context_manager(self, tmp_path):
+        from core.utils import FileLock
+        with FileLock(str(tmp_path / "x.lock")) as lock:
+            assert lock.held
+        assert not lock.held
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  process_memory
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestProcessMemory:
+    @pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="needs /proc smaps_rollup")
+    def test_reads_own_process(self):
+        from core.utils import process_memory
+        mem = process_memory()
+        assert set(mem) == {"rss_mb", "pss_mb", "uss_mb"}
+        assert 0 < mem["uss_mb"] <= mem["rss_mb"]
+
+    def test_missing_process(self):
+        from core.utils import process_memory
+        assert process_memory(pid=2**31) is None
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  _decode_jwt_payload
 # ═══════════════════════════════════════════════════════════════════════════════